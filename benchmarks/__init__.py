@@ -0,0 +1,5 @@
+"""
+Offline benchmarks for parsing, indexing and trade submission
+
+Run with `python -m benchmarks.run` from the repository root.
+"""
@@ -0,0 +1,143 @@
+"""
+Benchmark cases
+
+Each case takes the fixtures and options and returns the number of events
+processed, the per-operation latencies (ns) and the measured wall time (s).
+"""
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from Four_sdk.constants import CONTRACTS
+from Four_sdk.stream.curve.parser import parse_curve_event
+from Four_sdk.stream.dex.parser import parse_swap_event
+from Four_sdk.stream.types import EventType
+
+from .fixtures import BUY_TOPIC, SELL_TOPIC, to_web3_log
+from .mock_rpc import MockRPC
+
+CaseResult = Tuple[int, List[int], float]
+
+# Well-known test key (hardhat account #0), never funded on BSC
+BENCH_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+_CURVE_NAMES = {BUY_TOPIC: EventType.MANAGER_2_BUY.name, SELL_TOPIC: EventType.MANAGER_2_SELL.name}
+
+
+def _time_each(items: List[Any], call: Callable[[Any], Any], repeat: int) -> CaseResult:
+    latencies = []
+    clock = time.perf_counter_ns
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            t0 = clock()
+            call(item)
+            latencies.append(clock() - t0)
+    return len(latencies), latencies, time.perf_counter() - started
+
+
+async def parse_curve(fixtures: Dict[str, Any], options: Dict[str, Any]) -> CaseResult:
+    """parse_curve_event over the recorded TokenPurchase/TokenSale logs"""
+    items = [
+        (to_web3_log(raw), _CURVE_NAMES[raw["topics"][0]])
+        for raw in fixtures["curve"]
+        if raw["topics"][0] in _CURVE_NAMES
+    ]
+    as_record = options.get("as_record", False)
+    _time_each(items[:1000], lambda item: parse_curve_event(item[0], item[1], as_record), 1)
+    return _time_each(items, lambda item: parse_curve_event(item[0], item[1], as_record), options["repeat"])
+
+
+async def parse_swap(fixtures: Dict[str, Any], options: Dict[str, Any]) -> CaseResult:
+    """parse_swap_event over the recorded PancakeSwap pair Swap logs"""
+    logs = [to_web3_log(raw) for raw in fixtures["swap"]]
+    as_record = options.get("as_record", False)
+    _time_each(logs[:1000], lambda log: parse_swap_event(log, as_record), 1)
+    return _time_each(logs, lambda log: parse_swap_event(log, as_record), options["repeat"])
+
+
+async def fetch_events(fixtures: Dict[str, Any], options: Dict[str, Any]) -> CaseResult:
+    """CurveIndexer.fetch_events over the fixture range against the mock RPC
+
+    Latencies are per fetch_events call over the whole range.
+    """
+    from Four_sdk.stream.curve.indexer import CurveIndexer
+
+    async with MockRPC(fixtures["curve"], latency=options["latency"]) as rpc:
+        indexer = CurveIndexer(rpc.url)
+        kwargs = {
+            "concurrency": options["concurrency"],
+            "decode_workers": options["decode_workers"]
+        }
+        await indexer.fetch_events(fixtures["from_block"], fixtures["from_block"] + 100, **kwargs)
+
+        count = 0
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(options["repeat"]):
+            t0 = time.perf_counter_ns()
+            events = await indexer.fetch_events(fixtures["from_block"], fixtures["to_block"], **kwargs)
+            latencies.append(time.perf_counter_ns() - t0)
+            count += len(events)
+        return count, latencies, time.perf_counter() - started
+
+
+async def _trade(options: Dict[str, Any], side: str, router: str) -> CaseResult:
+    from Four_sdk.trade import Trade
+    from Four_sdk.types import BuyParams
+
+    async with MockRPC([], latency=options["latency"]) as rpc:
+        trade = Trade(rpc.url, BENCH_PRIVATE_KEY)
+        send = trade.buy if side == "buy" else trade.sell
+
+        def params(i: int) -> BuyParams:
+            return BuyParams(
+                token="0x" + (i % 512 + 1).to_bytes(20, "big").hex(),
+                amount_in=10 ** 16 + i,
+                amount_out_min=0,
+                to=trade.address,
+                gas=250_000,
+                gas_price=100_000_000,
+                deadline=1_900_000_000
+            )
+
+        for i in range(10):
+            await send(params(i), router)
+
+        latencies = []
+        started = time.perf_counter()
+        for i in range(options["trades"]):
+            t0 = time.perf_counter_ns()
+            await send(params(i), router)
+            latencies.append(time.perf_counter_ns() - t0)
+        return len(latencies), latencies, time.perf_counter() - started
+
+
+async def trade_buy_curve(fixtures: Dict[str, Any], options: Dict[str, Any]) -> CaseResult:
+    """Trade.buy through tokenManager2: encode, sign and send to the mock RPC"""
+    return await _trade(options, "buy", CONTRACTS["tokenManager2"])
+
+
+async def trade_sell_curve(fixtures: Dict[str, Any], options: Dict[str, Any]) -> CaseResult:
+    """Trade.sell through tokenManager2"""
+    return await _trade(options, "sell", CONTRACTS["tokenManager2"])
+
+
+async def trade_buy_dex(fixtures: Dict[str, Any], options: Dict[str, Any]) -> CaseResult:
+    """Trade.buy through the PancakeSwap router"""
+    return await _trade(options, "buy", CONTRACTS["pancakeRouter"])
+
+
+async def trade_sell_dex(fixtures: Dict[str, Any], options: Dict[str, Any]) -> CaseResult:
+    """Trade.sell through the PancakeSwap router"""
+    return await _trade(options, "sell", CONTRACTS["pancakeRouter"])
+
+
+CASES = {
+    "parse_curve": parse_curve,
+    "parse_swap": parse_swap,
+    "fetch_events": fetch_events,
+    "trade_buy_curve": trade_buy_curve,
+    "trade_sell_curve": trade_sell_curve,
+    "trade_buy_dex": trade_buy_dex,
+    "trade_sell_dex": trade_sell_dex
+}
@@ -0,0 +1,224 @@
+"""
+Log fixtures for the benchmarks
+
+Fixtures are stored as raw JSON-RPC logs (hex strings), exactly as eth_getLogs
+returns them, so the mock RPC can serve them unchanged. They can be recorded
+from a real node or generated deterministically:
+
+    python -m benchmarks.fixtures record --rpc https://bsc-dataseed.bnbchain.org \
+        --from-block 45000000 --blocks 2000 --pair 0x... --out fixtures.json
+    python -m benchmarks.fixtures generate --blocks 5000 --out fixtures.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import AsyncWeb3, AsyncHTTPProvider
+
+from Four_sdk.constants import CONTRACTS
+from Four_sdk.stream.types import EventType
+
+BUY_TOPIC = "0x" + keccak(text=EventType.MANAGER_2_BUY.value).hex()
+SELL_TOPIC = "0x" + keccak(text=EventType.MANAGER_2_SELL.value).hex()
+CREATE_TOPIC = "0x" + keccak(text=EventType.MANAGER_2_CREATE.value).hex()
+SWAP_TOPIC = "0x" + keccak(text=EventType.v2_SWAP.value).hex()
+
+DEFAULT_START_BLOCK = 45_000_000
+
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+
+def _address_word(address: bytes) -> bytes:
+    return b"\x00" * 12 + address
+
+
+def _string_words(text: str) -> bytes:
+    raw = text.encode()
+    padded = raw + b"\x00" * (-len(raw) % 32)
+    return _word(len(raw)) + padded
+
+
+def _raw_log(address: str, topics: Sequence[str], data: bytes, block: int, index: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "address": address.lower(),
+        "topics": list(topics),
+        "data": "0x" + data.hex(),
+        "blockNumber": hex(block),
+        "blockHash": "0x" + rng.randbytes(32).hex(),
+        "transactionHash": "0x" + rng.randbytes(32).hex(),
+        "transactionIndex": hex(index),
+        "logIndex": hex(index),
+        "removed": False
+    }
+
+
+def generate(
+    blocks: int = 5000,
+    start_block: int = DEFAULT_START_BLOCK,
+    curve_per_block: float = 4.0,
+    swaps_per_block: float = 6.0,
+    tokens: int = 200,
+    seed: int = 1
+) -> Dict[str, Any]:
+    """Deterministic tokenManager2 and PancakeSwap pair logs
+
+    About 2% of the curve logs are TokenCreate, the rest TokenPurchase and
+    TokenSale with realistic magnitudes.
+
+    Returns:
+        {"curve": [...], "swap": [...], "from_block": ..., "to_block": ...}
+    """
+    rng = random.Random(seed)
+    token_list = [rng.randbytes(20) for _ in range(tokens)]
+    pair_list = [rng.randbytes(20) for _ in range(tokens)]
+    manager = CONTRACTS["tokenManager2"]
+
+    curve: List[Dict[str, Any]] = []
+    swaps: List[Dict[str, Any]] = []
+    for block in range(start_block, start_block + blocks):
+        index = 0
+        for _ in range(int(rng.expovariate(1 / curve_per_block))):
+            if rng.random() < 0.02:
+                data = (
+                    _address_word(rng.randbytes(20))
+                    + _address_word(rng.choice(token_list))
+                    + _word(rng.getrandbits(64))
+                    + _word(0x100)
+                    + _word(0x140)
+                    + _word(10 ** 27)
+                    + _word(1_700_000_000 + block)
+                    + _word(10 ** 16)
+                    + _string_words("Bench Token")
+                    + _string_words("BENCH")
+                )
+                curve.append(_raw_log(manager, [CREATE_TOPIC], data, block, index, rng))
+            else:
+                amount = rng.randint(10 ** 18, 10 ** 25)
+                cost = rng.randint(10 ** 14, 10 ** 19)
+                data = (
+                    _address_word(rng.choice(token_list))
+                    + _address_word(rng.randbytes(20))
+                    + _word(rng.randint(10 ** 6, 10 ** 12))
+                    + _word(amount)
+                    + _word(cost)
+                    + _word(cost // 100)
+                    + _word(rng.randint(10 ** 26, 8 * 10 ** 26))
+                    + _word(rng.randint(10 ** 18, 2 * 10 ** 19))
+                )
+                topic = BUY_TOPIC if rng.random() < 0.55 else SELL_TOPIC
+                curve.append(_raw_log(manager, [topic], data, block, index, rng))
+            index += 1
+
+        for _ in range(int(rng.expovariate(1 / swaps_per_block))):
+            amount_in = rng.randint(10 ** 15, 10 ** 20)
+            amount_out = rng.randint(10 ** 18, 10 ** 26)
+            if rng.random() < 0.5:
+                words = (0, amount_in, amount_out, 0)  # BNB -> token
+            else:
+                words = (amount_out, 0, 0, amount_in)  # token -> BNB
+            data = b"".join(_word(value) for value in words)
+            topics = [SWAP_TOPIC, "0x" + _address_word(rng.randbytes(20)).hex(), "0x" + _address_word(rng.randbytes(20)).hex()]
+            swaps.append(_raw_log("0x" + rng.choice(pair_list).hex(), topics, data, block, index, rng))
+            index += 1
+
+    return {
+        "from_block": start_block,
+        "to_block": start_block + blocks - 1,
+        "curve": curve,
+        "swap": swaps
+    }
+
+
+async def record(
+    rpc_url: str,
+    from_block: int,
+    blocks: int,
+    pairs: Sequence[str] = (),
+    chunk_size: int = 500
+) -> Dict[str, Any]:
+    """Record tokenManager2 logs (and Swap logs of `pairs`) from a node"""
+    w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
+    to_block = from_block + blocks - 1
+    curve: List[Dict[str, Any]] = []
+    swaps: List[Dict[str, Any]] = []
+    for start in range(from_block, to_block + 1, chunk_size):
+        end = min(start + chunk_size - 1, to_block)
+        window = {"fromBlock": hex(start), "toBlock": hex(end)}
+        curve.extend((await w3.provider.make_request("eth_getLogs", [{
+            **window,
+            "address": CONTRACTS["tokenManager2"],
+            "topics": [[BUY_TOPIC, SELL_TOPIC, CREATE_TOPIC]]
+        }]))["result"])
+        if pairs:
+            swaps.extend((await w3.provider.make_request("eth_getLogs", [{
+                **window,
+                "address": list(pairs),
+                "topics": [SWAP_TOPIC]
+            }]))["result"])
+    return {"from_block": from_block, "to_block": to_block, "curve": curve, "swap": swaps}
+
+
+def save(fixtures: Dict[str, Any], path: str):
+    with open(path, "w") as f:
+        json.dump(fixtures, f)
+
+
+def load(path: Optional[str] = None, **generate_options) -> Dict[str, Any]:
+    """Load a fixture file, or generate fixtures when no path is given"""
+    if path:
+        with open(path, "r") as f:
+            return json.load(f)
+    return generate(**generate_options)
+
+
+def to_web3_log(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Raw JSON-RPC log -> the formatted log AsyncWeb3 hands to the parsers"""
+    return {
+        "address": AsyncWeb3.to_checksum_address(raw["address"]),
+        "topics": [HexBytes(topic) for topic in raw["topics"]],
+        "data": HexBytes(raw["data"]),
+        "blockNumber": int(raw["blockNumber"], 16),
+        "blockHash": HexBytes(raw["blockHash"]),
+        "transactionHash": HexBytes(raw["transactionHash"]),
+        "transactionIndex": int(raw["transactionIndex"], 16),
+        "logIndex": int(raw["logIndex"], 16),
+        "removed": raw.get("removed", False)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="write deterministic synthetic fixtures")
+    gen.add_argument("--blocks", type=int, default=5000)
+    gen.add_argument("--seed", type=int, default=1)
+    gen.add_argument("--out", required=True)
+
+    rec = commands.add_parser("record", help="record logs from an RPC node")
+    rec.add_argument("--rpc", required=True)
+    rec.add_argument("--from-block", type=int, required=True)
+    rec.add_argument("--blocks", type=int, default=2000)
+    rec.add_argument("--pair", action="append", default=[], help="PancakeSwap pair whose Swap logs are recorded")
+    rec.add_argument("--out", required=True)
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        fixtures = generate(blocks=args.blocks, seed=args.seed)
+    else:
+        fixtures = asyncio.run(record(args.rpc, args.from_block, args.blocks, args.pair))
+    directory = os.path.dirname(os.path.abspath(args.out))
+    os.makedirs(directory, exist_ok=True)
+    save(fixtures, args.out)
+    print(f"{len(fixtures['curve'])} curve logs, {len(fixtures['swap'])} swap logs -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
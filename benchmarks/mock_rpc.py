@@ -0,0 +1,369 @@
+"""
+Local JSON-RPC server serving fixture logs with configurable latency
+"""
+import asyncio
+import bisect
+import itertools
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import rlp
+from aiohttp import WSMsgType, web
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import function_signature_to_4byte_selector, keccak
+
+AGGREGATE3_SEL = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+GET_RESERVES_SEL = function_signature_to_4byte_selector("getReserves()")
+
+
+def _int(value: Any, default: int) -> int:
+    if value is None or value in ("latest", "pending", "safe", "finalized"):
+        return default
+    if value == "earliest":
+        return 0
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def _as_list(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    values = value if isinstance(value, list) else [value]
+    return [item.lower() for item in values]
+
+
+def _position(log: Dict[str, Any]) -> Tuple[int, int]:
+    return int(log["blockNumber"], 16), int(log["logIndex"], 16)
+
+
+def _topics(filter_params: Dict[str, Any]) -> List[Optional[List[str]]]:
+    return [_as_list(topic) for topic in filter_params.get("topics") or []]
+
+
+class MockRPC:
+    """Minimal BSC node for the benchmarks
+
+    Serves eth_getLogs from fixture logs (address and topic filters, block
+    ranges) and answers what Trade needs to sign and send a transaction.
+    Every request waits `latency` seconds, and eth_getLogs rejects ranges
+    with more than `max_logs` results like public providers do.
+
+    With `mempool=True` sent (legacy) transactions are kept: the pending
+    count follows them, a resent transaction is "already known" and a used
+    nonce is "nonce too low". They get a receipt while `mine` is True. It
+    is off for the benchmarks, recovering the sender costs as much as
+    signing. Tests can queue failures with `fail_next` (error response) and
+    `lose_next` (the request is handled but the HTTP response fails).
+
+    eth_call only answers Multicall3 aggregate3 of getReserves(), for the
+    pairs in `reserves` (any other call succeeds with no data).
+
+    `ws_url` serves the same methods over WebSocket plus eth_subscribe
+    "logs"; `emit` adds logs and pushes them to matching subscriptions and
+    `disconnect` drops every WebSocket client.
+
+    Example:
+        async with MockRPC(logs, latency=0.005) as rpc:
+            indexer = CurveIndexer(rpc.url)
+    """
+
+    def __init__(
+        self,
+        logs: List[Dict[str, Any]],
+        latency: float = 0.0,
+        chain_id: int = 56,
+        max_logs: int = 10_000,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        mempool: bool = False
+    ):
+        self.logs = sorted(logs, key=_position)
+        self._blocks = [int(log["blockNumber"], 16) for log in self.logs]
+        self.head = self._blocks[-1] if self._blocks else 0
+        self.latency = latency
+        self.chain_id = chain_id
+        self.max_logs = max_logs
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.calls: Dict[str, int] = {}  # method -> requests
+        self.mempool = mempool
+        self.reserves: Dict[str, Tuple[int, int]] = {}  # lowercase pair -> (reserve0, reserve1)
+        self.mine = True
+        self.transactions: Dict[str, Dict[str, Any]] = {}  # hash -> transaction
+        self._nonces: Dict[str, int] = {}  # confirmed count before the mempool
+        self._pool: Dict[str, Set[int]] = {}
+        self._failures: Dict[str, List[str]] = {}
+        self._lost: Dict[str, int] = {}
+        self._sockets: Set[web.WebSocketResponse] = set()
+        self._subscriptions: Dict[str, Tuple[web.WebSocketResponse, Dict[str, Any]]] = {}
+        self._subscription_ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    @property
+    def subscription_count(self) -> int:
+        return len(self._subscriptions)
+
+    async def start(self) -> "MockRPC":
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        app.router.add_get("/", self._handle_ws)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        await self.disconnect()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockRPC":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def fail_next(self, method: str, message: str, times: int = 1):
+        """Answer the next `times` calls of `method` with an error, without handling them"""
+        self._failures.setdefault(method, []).extend([message] * times)
+
+    def lose_next(self, method: str, times: int = 1):
+        """Handle the next `times` calls of `method` but fail their HTTP response"""
+        self._lost[method] = self._lost.get(method, 0) + times
+
+    def add_logs(self, logs: List[Dict[str, Any]]):
+        """Add logs to the chain (the head moves to the newest block)"""
+        self.logs = sorted(self.logs + list(logs), key=_position)
+        self._blocks = [int(log["blockNumber"], 16) for log in self.logs]
+        if self._blocks:
+            self.head = max(self.head, self._blocks[-1])
+
+    async def emit(self, logs: List[Dict[str, Any]], store: bool = True):
+        """Push logs to the matching subscriptions (and add them to the chain)"""
+        if store:
+            self.add_logs(logs)
+        for log in logs:
+            for subscription_id, (ws, filter_params) in list(self._subscriptions.items()):
+                if self._matches(log, _as_list(filter_params.get("address")), _topics(filter_params)):
+                    await ws.send_str(json.dumps({
+                        "jsonrpc": "2.0",
+                        "method": "eth_subscription",
+                        "params": {"subscription": subscription_id, "result": log}
+                    }))
+
+    async def disconnect(self):
+        """Close every WebSocket connection"""
+        for ws in list(self._sockets):
+            await ws.close()
+
+    def drop(self, tx_hash: str):
+        """Remove a transaction from the mempool, as if the node evicted it"""
+        tx = self.transactions.pop("0x" + tx_hash.lower().removeprefix("0x"), None)
+        if tx is not None:
+            self._pool[tx["from"].lower()].discard(int(tx["nonce"], 16))
+
+    # ─────────────────────────────────────
+    # Request handling
+    # ─────────────────────────────────────
+    async def _handle(self, request: web.Request) -> web.Response:
+        payload = json.loads(await request.read())
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if isinstance(payload, list):
+            body = [self._call(item) for item in payload]
+        else:
+            method = payload.get("method")
+            lost = self._lost.get(method, 0) > 0
+            if lost:
+                # Lost calls are handled before any queued failure
+                self._lost[method] -= 1
+            body = self._call(payload, lost)
+            if lost:
+                return web.Response(status=504, text="gateway timeout")
+        return web.Response(body=json.dumps(body).encode(), content_type="application/json")
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        try:
+            async for message in ws:
+                if message.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+                    continue
+                payload = json.loads(message.data)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if isinstance(payload, list):
+                    body = [self._ws_call(ws, item) for item in payload]
+                else:
+                    body = self._ws_call(ws, payload)
+                await ws.send_str(json.dumps(body))
+        finally:
+            self._sockets.discard(ws)
+            for subscription_id, (socket, _) in list(self._subscriptions.items()):
+                if socket is ws:
+                    del self._subscriptions[subscription_id]
+        return ws
+
+    def _ws_call(self, ws: web.WebSocketResponse, payload: Dict[str, Any]) -> Dict[str, Any]:
+        method = payload.get("method")
+        params = payload.get("params", [])
+        if method == "eth_subscribe":
+            self.calls[method] = self.calls.get(method, 0) + 1
+            subscription_id = hex(next(self._subscription_ids))
+            self._subscriptions[subscription_id] = (ws, params[1] if len(params) > 1 else {})
+            return {"jsonrpc": "2.0", "id": payload.get("id"), "result": subscription_id}
+        if method == "eth_unsubscribe":
+            self.calls[method] = self.calls.get(method, 0) + 1
+            removed = self._subscriptions.pop(params[0], None) is not None
+            return {"jsonrpc": "2.0", "id": payload.get("id"), "result": removed}
+        return self._call(payload)
+
+    def _call(self, payload: Dict[str, Any], handle: bool = False) -> Dict[str, Any]:
+        self.requests += 1
+        method = payload.get("method")
+        self.calls[method] = self.calls.get(method, 0) + 1
+        handler = getattr(self, f"_{method}", None)
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": payload.get("id")}
+        if handler is None:
+            response["error"] = {"code": -32601, "message": f"method {method} not supported"}
+            return response
+        if self._failures.get(method) and not handle:
+            response["error"] = {"code": -32000, "message": self._failures[method].pop(0)}
+            return response
+        try:
+            response["result"] = handler(*payload.get("params", []))
+        except ValueError as e:
+            response["error"] = {"code": -32005, "message": str(e)}
+        return response
+
+    def _eth_chainId(self) -> str:
+        return hex(self.chain_id)
+
+    def _eth_blockNumber(self) -> str:
+        return hex(self.head)
+
+    def _eth_gasPrice(self) -> str:
+        return hex(100_000_000)
+
+    def _eth_estimateGas(self, tx: Dict[str, Any], *_) -> str:
+        return hex(150_000)
+
+    def _eth_getTransactionCount(self, address: str, *_) -> str:
+        return hex(self._pending_count(address.lower()))
+
+    def _pending_count(self, sender: str) -> int:
+        nonce = self._nonces.get(sender, 0)
+        pool = self._pool.get(sender, ())
+        while nonce in pool:
+            nonce += 1
+        return nonce
+
+    def _eth_sendRawTransaction(self, raw: str) -> str:
+        tx_hash = "0x" + keccak(hexstr=raw).hex()
+        if not self.mempool:
+            return tx_hash
+        if tx_hash in self.transactions:
+            raise ValueError("already known")
+        nonce, gas_price, gas, to, value, data, v, r, s = rlp.decode(bytes.fromhex(raw[2:]))
+        sender = Account.recover_transaction(raw)
+        nonce = int.from_bytes(nonce, "big")
+        pool = self._pool.setdefault(sender.lower(), set())
+        if nonce < self._nonces.get(sender.lower(), 0) or nonce in pool:
+            raise ValueError("nonce too low")
+        pool.add(nonce)
+        self.transactions[tx_hash] = {
+            "hash": tx_hash,
+            "nonce": hex(nonce),
+            "from": sender,
+            "to": "0x" + to.hex() if to else None,
+            "value": hex(int.from_bytes(value, "big")),
+            "gas": hex(int.from_bytes(gas, "big")),
+            "gasPrice": hex(int.from_bytes(gas_price, "big")),
+            "input": "0x" + data.hex(),
+            "v": hex(int.from_bytes(v, "big")),
+            "r": "0x" + r.hex(),
+            "s": "0x" + s.hex(),
+            "type": "0x0",
+            "blockHash": None,
+            "blockNumber": None,
+            "transactionIndex": None,
+        }
+        return tx_hash
+
+    def _eth_getTransactionByHash(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        return self.transactions.get(tx_hash.lower())
+
+    def _eth_getTransactionReceipt(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        tx = self.transactions.get(tx_hash.lower())
+        if tx is None or not self.mine:
+            return None
+        return {
+            "transactionHash": tx["hash"],
+            "transactionIndex": "0x0",
+            "blockHash": "0x" + keccak(text=tx["hash"]).hex(),
+            "blockNumber": hex(self.head + 1),
+            "from": tx["from"],
+            "to": tx["to"],
+            "cumulativeGasUsed": hex(120_000),
+            "gasUsed": hex(120_000),
+            "effectiveGasPrice": tx["gasPrice"],
+            "contractAddress": None,
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "type": "0x0",
+        }
+
+    def _eth_call(self, tx: Dict[str, Any], *_) -> str:
+        data = bytes.fromhex((tx.get("data") or tx.get("input") or "0x")[2:])
+        if data[:4] != AGGREGATE3_SEL:
+            raise ValueError("execution reverted")
+        (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+        results = []
+        for target, _, call_data in calls:
+            reserves = self.reserves.get(target.lower())
+            if reserves is not None and call_data[:4] == GET_RESERVES_SEL:
+                results.append((True, encode(["uint112", "uint112", "uint32"], [*reserves, 0])))
+            else:
+                results.append((True, b""))
+        return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+
+    def _eth_getLogs(self, filter_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        start = _int(filter_params.get("fromBlock"), self.head)
+        end = _int(filter_params.get("toBlock"), self.head)
+        addresses = _as_list(filter_params.get("address"))
+        topics = _topics(filter_params)
+
+        result = []
+        lo = bisect.bisect_left(self._blocks, start)
+        hi = bisect.bisect_right(self._blocks, end)
+        for log in self.logs[lo:hi]:
+            if not self._matches(log, addresses, topics):
+                continue
+            result.append(log)
+            if len(result) > self.max_logs:
+                raise ValueError(f"query returned more than {self.max_logs} results")
+        return result
+
+    @staticmethod
+    def _matches(log: Dict[str, Any], addresses: Optional[List[str]], topics: List[Optional[List[str]]]) -> bool:
+        if addresses is not None and log["address"].lower() not in addresses:
+            return False
+        log_topics = log["topics"]
+        return not any(
+            wanted is not None and (i >= len(log_topics) or log_topics[i].lower() not in wanted)
+            for i, wanted in enumerate(topics)
+        )
@@ -0,0 +1,194 @@
+"""
+Run the offline benchmarks and report JSON
+
+Every case runs in its own process so peak RSS is per case. Results are
+events/s, p50/p99 latency and peak RSS; with --baseline the run fails (exit
+code 1) when a case got slower than the baseline by more than --tolerance.
+
+    python -m benchmarks.run --out results.json
+    python -m benchmarks.run --baseline results.json --tolerance 0.15
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from importlib import metadata
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .cases import CASES
+from . import fixtures as fixture_data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentile(sorted_values: List[int], percentile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(count: int, latencies: List[int], seconds: float) -> Dict[str, Any]:
+    """Throughput and latency percentiles (µs) of one case"""
+    ordered = sorted(latencies)
+    return {
+        "events": count,
+        "operations": len(ordered),
+        "seconds": round(seconds, 4),
+        "events_per_s": round(count / seconds, 1) if seconds > 0 else 0.0,
+        "p50_us": round(_percentile(ordered, 50) / 1000, 2),
+        "p99_us": round(_percentile(ordered, 99) / 1000, 2)
+    }
+
+
+def _options(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "fixtures": args.fixtures,
+        "blocks": args.blocks,
+        "repeat": args.repeat,
+        "trades": args.trades,
+        "latency": args.latency,
+        "concurrency": args.concurrency,
+        "decode_workers": args.decode_workers,
+        "as_record": args.as_record
+    }
+
+
+def run_case(name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one case in this process"""
+    data = fixture_data.load(options["fixtures"], blocks=options["blocks"])
+    rss_before = _peak_rss_mb()
+    count, latencies, seconds = asyncio.run(CASES[name](data, options))
+    result = summarize(count, latencies, seconds)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    if rss_before is not None:
+        result["peak_rss_growth_mb"] = round(result["peak_rss_mb"] - rss_before, 1)
+    return result
+
+
+def _run_isolated(name: str, argv: List[str]) -> Dict[str, Any]:
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--worker", name, *argv],
+        capture_output=True,
+        text=True,
+        cwd=ROOT
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"}
+    return json.loads(completed.stdout)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of `results` against `baseline` beyond `tolerance`"""
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        current = results["results"].get(name)
+        if current is None or "error" in base:
+            continue
+        if "error" in current:
+            regressions.append(f"{name}: {current['error']}")
+            continue
+        if current["events_per_s"] < base["events_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['events_per_s']} events/s < baseline {base['events_per_s']}"
+            )
+        if current["p99_us"] > base["p99_us"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {current['p99_us']}us > baseline {base['p99_us']}us")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated cases to run")
+    parser.add_argument("--fixtures", help="fixture file (default: generated logs)")
+    parser.add_argument("--blocks", type=int, default=5000, help="blocks of generated logs")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the fixtures")
+    parser.add_argument("--trades", type=int, default=500, help="transactions per trade case")
+    parser.add_argument("--latency", type=float, default=0.002, help="mock RPC latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=4, help="fetch_events block windows in flight")
+    parser.add_argument("--decode-workers", type=int, default=0, help="fetch_events decode processes")
+    parser.add_argument("--as-record", action="store_true", help="parse into slotted records")
+    parser.add_argument("--out", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed regression (0.10 = 10%%)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    options = _options(args)
+
+    if args.worker:
+        print(json.dumps(run_case(args.worker, options)))
+        return
+
+    names = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sdk_version": _version("Four-sdk"),
+            "web3_version": _version("web3"),
+            "options": options
+        },
+        "results": {}
+    }
+    for name in names:
+        result = _run_isolated(name, sys.argv[1:])
+        report["results"][name] = result
+        print(f"{name:<18} {_format(result)}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _format(result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return f"error: {result['error']}"
+    return (
+        f"{result['events_per_s']:>12,.0f} events/s  "
+        f"p50 {result['p50_us']:>10,.1f}us  p99 {result['p99_us']:>10,.1f}us  "
+        f"rss {result['peak_rss_mb']} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
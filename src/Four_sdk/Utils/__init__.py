@@ -1,7 +1,19 @@
-from .utils import load_abis,calculate_slippage,parseMon,get_amount_out
+from .utils import load_abi,load_abis,get_contract,calculate_slippage,parseMon,get_amount_out
+from .multicall import aggregate3
+from .rpc import get_rpc_client,configure_rpc_pool,close_rpc_pool
+from .pairs import get_pair_address,find_pairs,PairCache
 __all__ = [
+    'load_abi',
     'load_abis',
+    'get_contract',
     'calculate_slippage',
     "parseMon",
-    "get_amount_out"
-    ]
\ No newline at end of file
+    "get_amount_out",
+    "aggregate3",
+    "get_rpc_client",
+    "configure_rpc_pool",
+    "close_rpc_pool",
+    "get_pair_address",
+    "find_pairs",
+    "PairCache"
+    ]
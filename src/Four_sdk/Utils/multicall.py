@@ -0,0 +1,52 @@
+"""
+Multicall3 helpers for batching read-only contract calls
+"""
+import asyncio
+from typing import List, Sequence, Tuple
+
+from web3 import AsyncWeb3, Web3
+
+from ..constants import CONTRACTS, DEFAULT_MULTICALL_CHUNK_SIZE
+from .utils import get_contract
+
+
+async def aggregate3(
+    w3: AsyncWeb3,
+    calls: Sequence[Tuple[str, bytes]],
+    chunk_size: int = DEFAULT_MULTICALL_CHUNK_SIZE
+) -> List[Tuple[bool, bytes]]:
+    """Run many eth_calls through Multicall3 `aggregate3`
+
+    Calls are split into chunks of `chunk_size` and every chunk is sent as a
+    single eth_call, all chunks in parallel. Each call is made with
+    `allowFailure` set, so a revert only marks that call as failed. If a whole
+    chunk fails (e.g. node gas cap) its calls are reported as failed instead
+    of raising.
+
+    Args:
+        w3: AsyncWeb3 instance
+        calls: List of (target address, calldata) pairs
+        chunk_size: Maximum number of calls per aggregate3 request
+
+    Returns:
+        List of (success, returnData) aligned with `calls`
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if not calls:
+        return []
+
+    multicall = get_contract(w3, CONTRACTS["multicall3"], "multicall3")
+
+    async def _run_chunk(chunk: Sequence[Tuple[str, bytes]]) -> List[Tuple[bool, bytes]]:
+        try:
+            results = await multicall.functions.aggregate3(
+                [(Web3.to_checksum_address(target), True, calldata) for target, calldata in chunk]
+            ).call()
+            return [(bool(success), bytes(data)) for success, data in results]
+        except Exception:
+            return [(False, b"")] * len(chunk)
+
+    chunks = [calls[i:i + chunk_size] for i in range(0, len(calls), chunk_size)]
+    chunk_results = await asyncio.gather(*(_run_chunk(chunk) for chunk in chunks))
+    return [result for chunk in chunk_results for result in chunk]
@@ -0,0 +1,114 @@
+"""
+PancakeSwap V2 pair addresses derived offline (CREATE2) and a pair cache
+"""
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Sequence
+
+from eth_utils import function_signature_to_4byte_selector, keccak, to_checksum_address
+from web3 import AsyncWeb3
+
+from ..constants import CONTRACTS, DEFAULT_MULTICALL_CHUNK_SIZE, PANCAKE_V2_INIT_CODE_HASH, WBNB
+from .multicall import aggregate3
+
+GET_RESERVES_SEL = function_signature_to_4byte_selector("getReserves()")
+
+
+def _address_bytes(address: str) -> bytes:
+    return bytes.fromhex(address[2:] if address.startswith("0x") else address)
+
+
+@lru_cache(maxsize=65536)
+def get_pair_address(
+    token: str,
+    quote: str = WBNB,
+    factory: str = CONTRACTS["v2_factory"],
+    init_code_hash: str = PANCAKE_V2_INIT_CODE_HASH
+) -> str:
+    """Address of the token/quote pair as created by the V2 factory
+
+    The factory deploys pairs with CREATE2, salted with the sorted token
+    pair, so the address is known without any RPC call. It does not tell
+    whether the pair has been created yet (see `find_pairs`).
+    """
+    token0, token1 = sorted((_address_bytes(token), _address_bytes(quote)))
+    salt = keccak(token0 + token1)
+    digest = keccak(b"\xff" + _address_bytes(factory) + salt + _address_bytes(init_code_hash))
+    return to_checksum_address(digest[12:])
+
+
+async def find_pairs(
+    w3: AsyncWeb3,
+    tokens: Sequence[str],
+    quote: str = WBNB,
+    chunk_size: int = DEFAULT_MULTICALL_CHUNK_SIZE
+) -> Dict[str, Optional[str]]:
+    """Derive token/quote pairs and check which exist in one multicall
+
+    A pair exists when `getReserves()` on the derived address returns the
+    96-byte (uint112, uint112, uint32) tuple; calls to an empty address
+    succeed with no data.
+
+    Returns:
+        Dict of checksummed token -> pair address, None if not created yet
+    """
+    tokens = [to_checksum_address(token) for token in tokens]
+    if not tokens:
+        return {}
+    pairs = [get_pair_address(token, quote) for token in tokens]
+    results = await aggregate3(w3, [(pair, GET_RESERVES_SEL) for pair in pairs], chunk_size)
+    return {
+        token: pair if success and len(data) == 96 else None
+        for token, pair, (success, data) in zip(tokens, pairs, results)
+    }
+
+
+class PairCache:
+    """On-disk token -> pair address map (JSON)
+
+    Only pairs known to exist are stored: a pair can be created later, but
+    never moves once it exists.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pairs: Dict[str, str] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._pairs = {token.lower(): pair for token, pair in json.load(f).items()}
+            except (OSError, ValueError):
+                self._pairs = {}
+
+    def get(self, token: str) -> Optional[str]:
+        return self._pairs.get(token.lower())
+
+    def __contains__(self, token: str) -> bool:
+        return token.lower() in self._pairs
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def update(self, pairs: Dict[str, Optional[str]]):
+        """Store existing pairs (None values are skipped) and save the file"""
+        changed = False
+        for token, pair in pairs.items():
+            if pair and self._pairs.get(token.lower()) != pair:
+                self._pairs[token.lower()] = pair
+                changed = True
+        if changed:
+            self.save()
+
+    def remove(self, tokens: Iterable[str]):
+        for token in tokens:
+            self._pairs.pop(token.lower(), None)
+        self.save()
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._pairs, f)
+        os.replace(tmp_path, self.path)
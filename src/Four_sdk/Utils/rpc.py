@@ -0,0 +1,90 @@
+"""
+Shared keep-alive RPC clients for the module-level helpers
+"""
+import asyncio
+import weakref
+from typing import Any, Dict
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from web3 import AsyncHTTPProvider, AsyncWeb3
+
+
+# Connection settings for clients created after configure_rpc_pool()
+_POOL_CONFIG: Dict[str, Any] = {
+    "limit": 100,
+    "limit_per_host": 0,
+    "keepalive_timeout": 30.0,
+    "timeout": 30.0,
+}
+
+# One client per URL per event loop; sessions cannot be shared across loops
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncWeb3]]" = weakref.WeakKeyDictionary()
+_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def configure_rpc_pool(
+    limit: int = 100,
+    limit_per_host: int = 0,
+    keepalive_timeout: float = 30.0,
+    timeout: float = 30.0
+):
+    """Set connection limits for pooled RPC clients
+
+    Only clients created afterwards are affected; call `close_rpc_pool`
+    first to rebuild existing ones.
+
+    Args:
+        limit: Maximum number of open connections per client (0 = unlimited)
+        limit_per_host: Maximum number of open connections per host (0 = unlimited)
+        keepalive_timeout: Seconds an idle connection is kept open
+        timeout: Total timeout of one request in seconds
+    """
+    _POOL_CONFIG.update(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        timeout=timeout
+    )
+
+
+async def get_rpc_client(http_url: str) -> AsyncWeb3:
+    """Get the pooled AsyncWeb3 client for an HTTP RPC endpoint
+
+    The client keeps its connections alive between calls, so repeated
+    helper calls skip the TCP/TLS handshake.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _CLIENTS.get(loop)
+    if clients is None:
+        clients = _CLIENTS[loop] = {}
+    client = clients.get(http_url)
+    if client is not None:
+        return client
+
+    lock = _LOCKS.get(loop)
+    if lock is None:
+        lock = _LOCKS[loop] = asyncio.Lock()
+    async with lock:
+        client = clients.get(http_url)
+        if client is None:
+            session = ClientSession(
+                raise_for_status=True,
+                timeout=ClientTimeout(total=_POOL_CONFIG["timeout"]),
+                connector=TCPConnector(
+                    limit=_POOL_CONFIG["limit"],
+                    limit_per_host=_POOL_CONFIG["limit_per_host"],
+                    keepalive_timeout=_POOL_CONFIG["keepalive_timeout"],
+                    ttl_dns_cache=300
+                )
+            )
+            client = AsyncWeb3(AsyncHTTPProvider(http_url))
+            await client.provider.cache_async_session(session)
+            clients[http_url] = client
+    return client
+
+
+async def close_rpc_pool():
+    """Close the pooled clients of the running event loop"""
+    clients = _CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.provider.disconnect()
@@ -1,11 +1,15 @@
 
 import json
 import os
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 from dotenv import load_dotenv
-from web3 import AsyncHTTPProvider, AsyncWeb3,Web3
+from web3 import AsyncWeb3,Web3
 
 from ..types import QuoteResult
 from ..constants import CONTRACTS,WBNB
+from .rpc import get_rpc_client
 
 load_dotenv()
 
@@ -33,7 +37,8 @@ ABIS = {
     'v2_factory':'v2_factory.json',
     'v3_factory':'v3_factory.json',
     'pancakeRouter':"pancakeRouter.json",
-    'erc20Abi':'erc20Abi.json'
+    'erc20Abi':'erc20Abi.json',
+    'multicall3':'multicall3.json'
 }
 
 def load_path(path:str):
@@ -43,11 +48,30 @@ def load_path(path:str):
     with open(path, 'r',encoding='utf-8') as file:
         return  json.load(file)
 
+@lru_cache(maxsize=None)
+def load_abi(abi_name:str):
+    """Load one ABI by name, parsed once per process"""
+    if abi_name not in ABIS:
+        raise KeyError(f'Unknown ABI {abi_name}')
+    return load_path(os.path.join(DIR_NAME,ABIS[abi_name]))
+
 def load_abis():
-    abis = {}
-    for abi_name, abi_file in ABIS.items():
-        abis[abi_name] = load_path(os.path.join(DIR_NAME,abi_file))
-    return abis
+    return {abi_name: load_abi(abi_name) for abi_name in ABIS}
+
+
+# Contract objects per w3 instance, dropped with the instance
+_CONTRACT_CACHE: "weakref.WeakKeyDictionary[AsyncWeb3, Dict[Tuple[str, str], Any]]" = weakref.WeakKeyDictionary()
+
+def get_contract(w3:AsyncWeb3, address:str, abi_name:str):
+    """Get a cached contract object for (w3 instance, address, abi name)"""
+    contracts = _CONTRACT_CACHE.get(w3)
+    if contracts is None:
+        contracts = _CONTRACT_CACHE[w3] = {}
+    key = (address.lower(), abi_name)
+    contract = contracts.get(key)
+    if contract is None:
+        contract = contracts[key] = w3.eth.contract(address=_cs(address), abi=load_abi(abi_name))
+    return contract
 
 
 async def get_amount_out( http_url:str, token: str, amount_in: int, is_buy: bool) -> QuoteResult:
@@ -56,13 +80,10 @@ async def get_amount_out( http_url:str, token: str, amount_in: int, is_buy: bool
                 Check If the token has migrated or Not 
                 Then fetch the amount out for the token sale/buy
             """
-            connect = AsyncWeb3(AsyncHTTPProvider(http_url))
-            connected = await connect.is_connected()
-            if not connected:
-                return None
+            # Pooled keep-alive client shared by every call for this URL
+            connect = await get_rpc_client(http_url)
             
-            abis = load_abis()
-            tokenManagerHelper = connect.eth.contract(address=_cs(CONTRACTS['tokenManagerHelper']),abi=abis['tokenManagerHelper'])
+            tokenManagerHelper = get_contract(connect, CONTRACTS['tokenManagerHelper'], 'tokenManagerHelper')
             result_for_liquidity = await tokenManagerHelper.functions.getTokenInfo(
                     _cs(token)
                 ).call()
@@ -88,9 +109,7 @@ async def get_amount_out( http_url:str, token: str, amount_in: int, is_buy: bool
                     amount_out = result[2]
             else:
                 pancakeRouter_address =  CONTRACTS['pancakeRouter']
-                pancakeRouter = connect.eth.contract(
-                    address=_cs(pancakeRouter_address),
-                    abi=abis['pancakeRouter'])
+                pancakeRouter = get_contract(connect, pancakeRouter_address, 'pancakeRouter')
                 result = await pancakeRouter.functions.getAmountsOut(
                     int(amount_in),
                     [_cs(WBNB), _cs(token)]
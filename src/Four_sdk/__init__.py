@@ -3,34 +3,65 @@
 # Stream and Indexing
 from .stream import (
     CurveIndexer,
+    EventStore,
     EventType,
     CurveStream,
-    DexStream
+    DexStream,
+    StreamHub,
+    CurveTradeEvent,
+    TokenCreateEvent,
+    SwapEvent
 )
-from .Utils import load_abis,calculate_slippage,parseMon,get_amount_out
+from .Utils import load_abi,load_abis,get_contract,calculate_slippage,parseMon,get_amount_out,configure_rpc_pool,close_rpc_pool
 from .constants import CONTRACTS,WBNB,CHAIN_ID,FOUR_FEE_TIER
 from .types import (
     BuyParams,
     SellParams,
     TokenMetadata,
     QuoteResult,
-    CurveData
+    CurveData,
+    BasketOrder,
+    OrderResult,
+    PendingTx
 )
 
 
+from .nonce import NonceManager
+from .gas import GasProfileCache
+from .metrics import RpcMetrics,RpcSample,install_rpc_metrics,uninstall_rpc_metrics,get_rpc_metrics
+from .quoter import CurveQuoter,PairReserveMirror
 from .trade import Trade
+from .batch import BasketExecutor
+from .wallet_pool import WalletPool,WalletPolicy,RoundRobinPolicy,LeastLoadedPolicy,StickyPerTokenPolicy
 from .token import Token
 
 __all__ = [
     # index and curve
     "CurveIndexer",
+    "EventStore",
     "CurveStream",
     "DexStream",
+    "StreamHub",
     "EventType",
+    "CurveTradeEvent",
+    "TokenCreateEvent",
+    "SwapEvent",
 
     # Core class 
     "Trade",
+    "BasketExecutor",
+    "WalletPool",
+    "WalletPolicy",
+    "RoundRobinPolicy",
+    "LeastLoadedPolicy",
+    "StickyPerTokenPolicy",
     "Token",
+    "NonceManager",
+    "GasProfileCache",
+    "CurveQuoter",
+    "PairReserveMirror",
+    "RpcMetrics",
+    "RpcSample",
 
     # Types
     "BuyParams",
@@ -38,6 +69,9 @@ __all__ = [
     "TokenMetadata",
     "QuoteResult",
     "CurveData",
+    "BasketOrder",
+    "OrderResult",
+    "PendingTx",
 
     # Constants
     "CONTRACTS",
@@ -46,8 +80,15 @@ __all__ = [
     "WBNB",
 
     # Utils
+    "load_abi",
     "load_abis",
+    "get_contract",
     "calculate_slippage",
     "parseMon",
-    "get_amount_out"
+    "get_amount_out",
+    "configure_rpc_pool",
+    "close_rpc_pool",
+    "install_rpc_metrics",
+    "uninstall_rpc_metrics",
+    "get_rpc_metrics"
 ]
\ No newline at end of file
@@ -0,0 +1,289 @@
+"""
+Basket execution: many buys/sells signed in parallel and sent in one batch
+"""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from eth_account import Account
+from eth_utils import keccak, to_hex
+from hexbytes import HexBytes
+
+from .calldata import checksum
+from .constants import DEFAULT_GAS_PRICE
+from .gas import GasProfileCache
+from .nonce import BroadcastError, is_known_tx_error, is_nonce_error
+from .trade import Trade
+from .types import BasketOrder, OrderResult
+
+
+def _sign_transactions(private_key: bytes, txs: List[Dict[str, Any]]) -> List[Tuple[bool, str]]:
+    """Sign transactions; runs in a worker thread or process
+
+    Returns:
+        (True, raw transaction hex) or (False, error message) per transaction
+    """
+    account = Account.from_key(private_key)
+    signed_txs = []
+    for tx in txs:
+        try:
+            signed = account.sign_transaction(tx)
+            raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+            signed_txs.append((True, "0x" + bytes(raw).hex()))
+        except Exception as e:
+            signed_txs.append((False, f"Failed to sign transaction: {e}"))
+    return signed_txs
+
+
+class BasketExecutor:
+    """Send a basket of buys and sells in one round trip
+
+    Nonces for the whole basket are reserved in one sequence from the
+    Trade's NonceManager, gas limits come from the gas cache (missing ones
+    are estimated concurrently), transactions are signed in a thread or
+    process pool and all raw transactions go out in a single JSON-RPC batch
+    of eth_sendRawTransaction.
+
+    Every order gets its own OrderResult; one failed order does not fail the
+    basket. Nonces of orders the node rejected are released, so the next
+    transaction fills the gap; if the batch request itself failed the node
+    may hold the transactions, so the nonce manager resyncs instead.
+
+    Example:
+        executor = BasketExecutor(trade)
+        results = await executor.execute([
+            BasketOrder(BuyParams(token, amount_in, 0, trade.address), router)
+            for token, router in basket
+        ])
+        failed = [result for result in results if not result.ok]
+    """
+
+    def __init__(
+        self,
+        trade: Trade,
+        sign_workers: int = 4,
+        use_processes: bool = False,
+        executor: Optional[Executor] = None
+    ):
+        """Initialize executor
+
+        Args:
+            trade: Trade whose account, nonce manager and gas cache are used
+            sign_workers: Number of signing workers
+            use_processes: Sign in a process pool instead of a thread pool
+            executor: Existing executor to sign in (not shut down by `close`)
+        """
+        self.trade = trade
+        self.sign_workers = max(1, sign_workers)
+        self.use_processes = use_processes
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.sign_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.sign_workers)
+        return self._executor
+
+    def close(self):
+        """Shut down the signing pool created by the executor"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _build(self, order: BasketOrder) -> Tuple[Dict[str, Any], tuple]:
+        trade = self.trade
+        params = order.params
+        if order.is_buy:
+            call_data, is_dex = trade._buy_calldata(params, order.router)
+        else:
+            call_data, is_dex = trade._sell_calldata(params, order.router)
+        tx = {
+            "from": trade.address,
+            "to": checksum(order.router),
+            "data": "0x" + call_data.hex(),
+            "value": int(params.amount_in) if order.is_buy else 0,
+            "chainId": trade.chain_id,
+            "gasPrice": int(params.gas_price if params.gas_price is not None else DEFAULT_GAS_PRICE),
+        }
+        return tx, GasProfileCache.key(order.router, call_data[:4], is_dex)
+
+    async def _fill_gas(
+        self,
+        orders: Sequence[BasketOrder],
+        txs: Dict[int, Dict[str, Any]],
+        gas_keys: Dict[int, tuple],
+        results: List[OrderResult]
+    ):
+        """Set gas limits: explicit, cached, or estimated concurrently"""
+        trade = self.trade
+        to_estimate = []
+        for index, tx in txs.items():
+            gas = orders[index].params.gas
+            if gas is None:
+                gas = trade.gas_cache.get(gas_keys[index])
+            if gas is not None:
+                tx["gas"] = int(gas)
+            else:
+                to_estimate.append(index)
+        if not to_estimate:
+            return
+
+        # One estimate per gas key, like the cache Trade uses; if it fails the
+        # other orders of that key are estimated on their own
+        groups: Dict[tuple, List[int]] = {}
+        for index in to_estimate:
+            groups.setdefault(gas_keys[index], []).append(index)
+        retry = await self._estimate([group[0] for group in groups.values()], txs, gas_keys, results)
+        for key, group in groups.items():
+            if key in retry:
+                await self._estimate(group[1:], txs, gas_keys, results)
+            else:
+                for index in group[1:]:
+                    txs[index]["gas"] = trade.gas_cache.get(key)
+
+    async def _estimate(
+        self,
+        indexes: List[int],
+        txs: Dict[int, Dict[str, Any]],
+        gas_keys: Dict[int, tuple],
+        results: List[OrderResult]
+    ) -> set:
+        """Estimate gas for `indexes`; returns the gas keys whose estimate failed"""
+        trade = self.trade
+        estimates = await asyncio.gather(
+            *(trade.w3.eth.estimate_gas(txs[index]) for index in indexes),
+            return_exceptions=True
+        )
+        failed = set()
+        for index, estimate in zip(indexes, estimates):
+            if isinstance(estimate, BaseException):
+                results[index].error = f"Failed to estimate gas: {estimate}"
+                failed.add(gas_keys[index])
+                del txs[index]
+                continue
+            trade.gas_cache.record(gas_keys[index], estimate)
+            txs[index]["gas"] = int(estimate * 1.2)  # 20% buffer
+        return failed
+
+    async def _sign(self, txs: List[Dict[str, Any]]) -> List[Tuple[bool, str]]:
+        if not txs:
+            return []
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        private_key = bytes(self.trade.account.key)
+        size = -(-len(txs) // self.sign_workers)
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(executor, _sign_transactions, private_key, txs[i:i + size])
+            for i in range(0, len(txs), size)
+        ))
+        return [signed for chunk in chunks for signed in chunk]
+
+    async def _broadcast(self, raws: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Send raw transactions in one batch: (tx hash, error) per transaction
+
+        A transaction the node already knows counts as sent. Raises
+        BroadcastError when the batch as a whole failed.
+        """
+        try:
+            responses = await self.trade.w3.provider.make_batch_request(
+                [("eth_sendRawTransaction", [raw]) for raw in raws]
+            )
+        except Exception as e:
+            raise BroadcastError(f"Batch request failed: {e}") from e
+
+        if not isinstance(responses, list) or len(responses) != len(raws):
+            error = responses.get("error") if isinstance(responses, dict) else responses
+            raise BroadcastError(f"Batch request failed: {error}")
+
+        sent = []
+        for raw, response in zip(raws, responses):
+            if response.get("error"):
+                error = response["error"]
+                message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+                if is_known_tx_error(Exception(message)):
+                    sent.append((to_hex(keccak(hexstr=raw)), None))
+                else:
+                    sent.append((None, message))
+            else:
+                sent.append((to_hex(HexBytes(response.get("result"))), None))
+        return sent
+
+    async def execute(self, orders: Sequence[BasketOrder]) -> List[OrderResult]:
+        """Send every order of the basket
+
+        Args:
+            orders: Buys and sells; an order's params.nonce / gas / gas_price
+                override the managed values
+
+        Returns:
+            OrderResult per order, in the same order
+        """
+        trade = self.trade
+        results = [OrderResult(index) for index in range(len(orders))]
+
+        # Build transactions
+        txs: Dict[int, Dict[str, Any]] = {}
+        gas_keys: Dict[int, tuple] = {}
+        for index, order in enumerate(orders):
+            try:
+                txs[index], gas_keys[index] = self._build(order)
+            except Exception as e:
+                results[index].error = f"Failed to encode order: {e}"
+
+        await self._fill_gas(orders, txs, gas_keys, results)
+
+        # Nonces in one sequence, explicit nonces bypass the manager
+        managed = [index for index in txs if orders[index].params.nonce is None]
+        nonces = await trade.nonce_manager.reserve(len(managed)) if managed else []
+        for index, nonce in zip(managed, nonces):
+            txs[index]["nonce"] = nonce
+        for index in txs:
+            if orders[index].params.nonce is not None:
+                txs[index]["nonce"] = int(orders[index].params.nonce)
+            results[index].nonce = txs[index]["nonce"]
+
+        # Sign in parallel
+        indexes = list(txs)
+        signed = await self._sign([txs[index] for index in indexes])
+        to_send = []
+        for index, (ok, value) in zip(indexes, signed):
+            if ok:
+                to_send.append((index, value))
+            else:
+                results[index].error = value
+
+        # Broadcast in one batch
+        broadcast_failed = False
+        if to_send:
+            try:
+                sent = await self._broadcast([raw for _, raw in to_send])
+            except BroadcastError as e:
+                broadcast_failed = True
+                sent = [(None, str(e))] * len(to_send)
+            for (index, _), (tx_hash, error) in zip(to_send, sent):
+                if tx_hash is not None:
+                    results[index].tx_hash = tx_hash
+                    trade._track_gas_key(tx_hash, gas_keys[index])
+                else:
+                    results[index].error = f"Transaction failed: {error}"
+
+        # Give back managed nonces the node never took (highest first, so a
+        # failed tail moves the next nonce back). After a failed batch request
+        # the node may hold some of them: resync instead.
+        managed_set = set(managed)
+        nonce_error = broadcast_failed
+        unused = []
+        for result in results:
+            if result.tx_hash is None and result.index in managed_set:
+                if result.error and is_nonce_error(Exception(result.error)):
+                    nonce_error = True
+                unused.append(result.nonce)
+        if nonce_error:
+            await trade.nonce_manager.resync()
+        else:
+            for nonce in sorted(unused, reverse=True):
+                trade.nonce_manager.release(nonce)
+        return results
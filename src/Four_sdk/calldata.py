@@ -0,0 +1,112 @@
+"""
+Precompiled calldata builders for the buy/sell hot paths
+
+The four trade functions have a fixed ABI layout, so their calldata is
+assembled from 32-byte words directly instead of going through the generic
+`eth_abi.encode`. Address words and checksummed addresses are cached.
+
+Set `calldata.DEBUG = True` (or FOUR_SDK_DEBUG_CALLDATA=1) to check every
+built calldata against `eth_abi.encode`.
+"""
+import os
+from functools import lru_cache
+from typing import Sequence
+
+from eth_abi import encode
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+
+DEBUG = os.environ.get("FOUR_SDK_DEBUG_CALLDATA", "") not in ("", "0")
+
+BUY_TOKEN_AMAP_SEL = function_signature_to_4byte_selector("buyTokenAMAP(address,uint256,uint256)")
+SELL_TOKEN_SEL = function_signature_to_4byte_selector("sellToken(address,uint256)")
+SWAP_EXACT_ETH_FOR_TOKENS_SEL = function_signature_to_4byte_selector(
+    "swapExactETHForTokens(uint256,address[],address,uint256)"
+)
+SWAP_EXACT_TOKENS_FOR_ETH_SEL = function_signature_to_4byte_selector(
+    "swapExactTokensForETH(uint256,uint256,address[],address,uint256)"
+)
+
+# Offset of the address[] tail: 4 head words for swapExactETHForTokens, 5 for swapExactTokensForETH
+_OFFSET_4_WORDS = (4 * 32).to_bytes(32, "big")
+_OFFSET_5_WORDS = (5 * 32).to_bytes(32, "big")
+
+
+@lru_cache(maxsize=65536)
+def checksum(address: str) -> str:
+    """Cached checksum address"""
+    return to_checksum_address(address)
+
+
+@lru_cache(maxsize=65536)
+def address_word(address: str) -> bytes:
+    """Left-padded 32-byte ABI word of an address"""
+    raw = bytes.fromhex(address[2:] if address[:2] in ("0x", "0X") else address)
+    if len(raw) != 20:
+        raise ValueError(f"Invalid address {address}")
+    return b"\x00" * 12 + raw
+
+
+def _uint(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+
+def _path(path: Sequence[str]) -> bytes:
+    return _uint(len(path)) + b"".join(address_word(address) for address in path)
+
+
+def _check(calldata: bytes, selector: bytes, types: Sequence[str], values: Sequence) -> bytes:
+    expected = selector + encode(list(types), list(values))
+    if calldata != expected:
+        raise AssertionError(f"Calldata mismatch for 0x{selector.hex()}: {calldata.hex()} != {expected.hex()}")
+    return calldata
+
+
+def buy_token_amap(token: str, funds: int, min_amount: int) -> bytes:
+    """buyTokenAMAP(token, funds, minAmount) calldata"""
+    calldata = BUY_TOKEN_AMAP_SEL + address_word(token) + _uint(funds) + _uint(min_amount)
+    if DEBUG:
+        return _check(calldata, BUY_TOKEN_AMAP_SEL, ["address", "uint256", "uint256"],
+                      [checksum(token), funds, min_amount])
+    return calldata
+
+
+def sell_token(token: str, amount: int) -> bytes:
+    """sellToken(token, amount) calldata"""
+    calldata = SELL_TOKEN_SEL + address_word(token) + _uint(amount)
+    if DEBUG:
+        return _check(calldata, SELL_TOKEN_SEL, ["address", "uint256"], [checksum(token), amount])
+    return calldata
+
+
+def swap_exact_eth_for_tokens(amount_out_min: int, path: Sequence[str], to: str, deadline: int) -> bytes:
+    """swapExactETHForTokens(amountOutMin, path, to, deadline) calldata"""
+    calldata = (
+        SWAP_EXACT_ETH_FOR_TOKENS_SEL
+        + _uint(amount_out_min)
+        + _OFFSET_4_WORDS
+        + address_word(to)
+        + _uint(deadline)
+        + _path(path)
+    )
+    if DEBUG:
+        return _check(calldata, SWAP_EXACT_ETH_FOR_TOKENS_SEL, ["uint256", "address[]", "address", "uint256"],
+                      [amount_out_min, [checksum(address) for address in path], checksum(to), deadline])
+    return calldata
+
+
+def swap_exact_tokens_for_eth(amount_in: int, amount_out_min: int, path: Sequence[str], to: str, deadline: int) -> bytes:
+    """swapExactTokensForETH(amountIn, amountOutMin, path, to, deadline) calldata"""
+    calldata = (
+        SWAP_EXACT_TOKENS_FOR_ETH_SEL
+        + _uint(amount_in)
+        + _uint(amount_out_min)
+        + _OFFSET_5_WORDS
+        + address_word(to)
+        + _uint(deadline)
+        + _path(path)
+    )
+    if DEBUG:
+        return _check(calldata, SWAP_EXACT_TOKENS_FOR_ETH_SEL, ["uint256", "uint256", "address[]", "address", "uint256"],
+                      [amount_in, amount_out_min, [checksum(address) for address in path], checksum(to), deadline])
+    return calldata
+
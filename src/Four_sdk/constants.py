@@ -4,7 +4,8 @@ CONTRACTS = {
     'tokenManagerHelper':'0xF251F83e40a78868FcfA3FA4599Dad6494E46034',
     'v2_factory':'0xcA143Ce32Fe78f1f7019d7d551a6402fC5350c73',
     'v3_factory':'0x0BFbCF9fa4f9C56B0F40a671Ad40E0805A091865',
-    "pancakeRouter":"0x10ED43C718714eb63d5aA57B78B54704E256024E"
+    "pancakeRouter":"0x10ED43C718714eb63d5aA57B78B54704E256024E",
+    "multicall3":"0xcA11bde05977b3631167028862bE2a173976CA11"
 }
 
 # Bsc Chain Id
@@ -17,4 +18,13 @@ FOUR_FEE_TIER = 10000  # 1%
 # Default settings
 DEFAULT_DEADLINE_SECONDS = 300
 
-WBNB = "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c"
\ No newline at end of file
+# Gas price used when a trade does not set one (0.1 gwei)
+DEFAULT_GAS_PRICE = 100_000_000
+
+# Number of calls packed into a single Multicall3 aggregate3 request
+DEFAULT_MULTICALL_CHUNK_SIZE = 200
+
+WBNB = "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c"
+
+# keccak256 of the PancakeSwap V2 pair creation code (CREATE2 pair addresses)
+PANCAKE_V2_INIT_CODE_HASH = "0x00fb7f630766e6a796048ea87d01acd3068e8ff67d078148a3fa3f4a84f69bd5"
\ No newline at end of file
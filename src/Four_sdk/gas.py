@@ -0,0 +1,59 @@
+"""
+Gas limit cache for the trade hot path
+"""
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional
+
+
+class GasProfileCache:
+    """Learned gas limits keyed by (router, selector, is_dex)
+
+    Gas used by buyTokenAMAP, sellToken and the PancakeSwap swaps barely
+    changes between calls, so after the first estimate the limit is taken
+    from a high percentile of recent samples plus a safety margin. Samples
+    come from gas estimates and from receipts' gasUsed.
+    """
+
+    def __init__(self, percentile: float = 95, margin: float = 0.2, max_samples: int = 64):
+        """Initialize gas cache
+
+        Args:
+            percentile: Percentile of recent samples used as the base limit
+            margin: Safety margin added on top (0.2 = 20%)
+            max_samples: Number of recent samples kept per key
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.margin = margin
+        self.max_samples = max_samples
+        self._samples: Dict[Hashable, Deque[int]] = {}
+        self._limits: Dict[Hashable, int] = {}
+
+    @staticmethod
+    def key(router: str, selector: bytes, is_dex: bool) -> tuple:
+        return (router.lower(), bytes(selector), bool(is_dex))
+
+    def get(self, key: Hashable) -> Optional[int]:
+        """Cached gas limit for a key, None on a cache miss"""
+        return self._limits.get(key)
+
+    def record(self, key: Hashable, gas: int):
+        """Add a gas sample (estimate or receipt gasUsed) for a key"""
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.max_samples)
+        samples.append(int(gas))
+
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        self._limits[key] = int(ordered[index] * (1 + self.margin))
+
+    def invalidate(self, key: Hashable):
+        """Forget a key so the next transaction estimates gas again"""
+        self._samples.pop(key, None)
+        self._limits.pop(key, None)
+
+
+# Process-wide cache used by Trade unless another one is passed in
+GAS_PROFILES = GasProfileCache()
@@ -0,0 +1,378 @@
+"""
+Process-wide RPC metrics for every web3 provider
+"""
+import bisect
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from eth_utils import function_abi_to_4byte_selector
+from web3.providers.persistent import PersistentConnectionProvider
+from web3.providers.rpc import AsyncHTTPProvider
+
+from .Utils import load_abis
+
+# Latency histogram bucket bounds in seconds (Prometheus style)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RpcSample:
+    """One finished RPC request, as passed to metrics callbacks"""
+    method: str           # JSON-RPC method, "eth_call:<function>" for calls
+    seconds: float
+    error: bool
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+class MethodStats:
+    """Counters and latency histogram of one RPC method"""
+    __slots__ = ("calls", "errors", "bytes_sent", "bytes_received", "seconds", "buckets")
+
+    def __init__(self, bucket_count: int):
+        self.calls = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (bucket_count + 1)  # last one is +Inf
+
+    def to_dict(self, bounds: Sequence[float]) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "seconds": self.seconds,
+            "buckets": dict(zip([*map(str, bounds), "+Inf"], self.buckets))
+        }
+
+
+class RpcMetrics:
+    """Per-method call counts, errors, bytes and latency histograms
+
+    Filled by the provider hooks of `install_rpc_metrics`, so every request
+    made by Trade, Token, CurveIndexer, CurveStream, DexStream (and any other
+    AsyncWeb3 in the process) is recorded. eth_call is split by the called
+    function (`eth_call:getTokenInfo`, `eth_call:aggregate3`, ...).
+
+    Byte counts are exact for HTTP providers; WebSocket requests record
+    calls, errors and latency.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.enabled = True
+        self._stats: Dict[str, MethodStats] = {}
+        self._callbacks: List[Callable[[RpcSample], Any]] = []
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[RpcSample], Any]):
+        """Call `callback(sample)` after every request (keep it cheap)"""
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[RpcSample], Any]):
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def observe(
+        self,
+        method: str,
+        seconds: float,
+        error: bool = False,
+        bytes_sent: int = 0,
+        bytes_received: int = 0
+    ):
+        """Record one finished request"""
+        with self._lock:
+            stats = self._stats.get(method)
+            if stats is None:
+                stats = self._stats[method] = MethodStats(len(self.bounds))
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.seconds += seconds
+            stats.buckets[bisect.bisect_left(self.bounds, seconds)] += 1
+
+        if self._callbacks:
+            sample = RpcSample(method, seconds, error, bytes_sent, bytes_received)
+            for callback in self._callbacks:
+                try:
+                    callback(sample)
+                except Exception:
+                    pass
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Method -> counters and (non-cumulative) bucket counts"""
+        with self._lock:
+            return {method: stats.to_dict(self.bounds) for method, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self, prefix: str = "four_sdk_rpc") -> str:
+        """Snapshot in the Prometheus text exposition format"""
+        lines = [
+            f"# TYPE {prefix}_requests_total counter",
+            f"# TYPE {prefix}_errors_total counter",
+            f"# TYPE {prefix}_sent_bytes_total counter",
+            f"# TYPE {prefix}_received_bytes_total counter",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self._stats.items())
+            for method, stats in items:
+                label = f'method="{method}"'
+                lines.append(f"{prefix}_requests_total{{{label}}} {stats.calls}")
+                lines.append(f"{prefix}_errors_total{{{label}}} {stats.errors}")
+                lines.append(f"{prefix}_sent_bytes_total{{{label}}} {stats.bytes_sent}")
+                lines.append(f"{prefix}_received_bytes_total{{{label}}} {stats.bytes_received}")
+                cumulative = 0
+                for bound, count in zip([*map(str, self.bounds), "+Inf"], stats.buckets):
+                    cumulative += count
+                    lines.append(
+                        f'{prefix}_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"{prefix}_request_duration_seconds_sum{{{label}}} {stats.seconds}")
+                lines.append(f"{prefix}_request_duration_seconds_count{{{label}}} {stats.calls}")
+        return "\n".join(lines) + "\n"
+
+
+# ─────────────────────────────────────
+# eth_call labels
+# ─────────────────────────────────────
+_SELECTOR_NAMES: Optional[Dict[str, str]] = None
+
+
+def _selector_names() -> Dict[str, str]:
+    """'0x' + selector hex -> function name, from the bundled ABIs"""
+    global _SELECTOR_NAMES
+    if _SELECTOR_NAMES is None:
+        names = {}
+        for abi in load_abis().values():
+            for entry in abi:
+                if entry.get("type") == "function":
+                    names.setdefault("0x" + function_abi_to_4byte_selector(entry).hex(), entry["name"])
+        _SELECTOR_NAMES = names
+    return _SELECTOR_NAMES
+
+
+def _call_label(selector: str) -> str:
+    selector = selector.lower()
+    return "eth_call:" + _selector_names().get(selector, selector)
+
+
+def _label(method: str, params: Any) -> str:
+    """Metric label of a request given its (formatted) params"""
+    if method != "eth_call":
+        return method
+    try:
+        tx = params[0]
+        data = tx.get("data") or tx.get("input")
+        if isinstance(data, bytes):
+            data = "0x" + data[:4].hex()
+        return _call_label(data[:10]) if data else method
+    except (IndexError, AttributeError, TypeError):
+        return method
+
+
+def _label_from_request(method: str, request_data: bytes) -> str:
+    """Metric label of an encoded request without decoding it again"""
+    if method != "eth_call":
+        return method
+    for key in (b'"data"', b'"input"'):
+        index = request_data.find(key)
+        if index != -1:
+            start = request_data.find(b"0x", index)
+            if start != -1:
+                return _call_label(request_data[start:start + 10].decode())
+    return method
+
+
+# ─────────────────────────────────────
+# Provider hooks
+# ─────────────────────────────────────
+_METRICS: Optional[RpcMetrics] = None
+_ORIGINALS: Dict[Tuple[type, str], Callable] = {}
+_INSTALL_LOCK = threading.Lock()
+
+
+def _is_error(response: Any) -> bool:
+    if isinstance(response, dict):
+        return "error" in response
+    if isinstance(response, list):
+        return any(isinstance(item, dict) and "error" in item for item in response)
+    return False
+
+
+def _batch_label(requests: Sequence[Tuple[str, Any]]) -> str:
+    methods = sorted({str(method) for method, _ in requests})
+    return f"batch:{'+'.join(methods)}"
+
+
+def _http_make_request(original):
+    # _make_request(method, request_data) -> raw response bytes
+    async def _make_request(self, method, request_data):
+        metrics = _METRICS
+        if metrics is None or not metrics.enabled:
+            return await original(self, method, request_data)
+        start = time.perf_counter()
+        raw = None
+        try:
+            raw = await original(self, method, request_data)
+            return raw
+        finally:
+            metrics.observe(
+                _label_from_request(method, request_data),
+                time.perf_counter() - start,
+                raw is None or b'"error"' in raw,
+                len(request_data),
+                len(raw) if raw is not None else 0
+            )
+    return _make_request
+
+
+def _persistent_make_request(original):
+    async def make_request(self, method, params):
+        metrics = _METRICS
+        if metrics is None or not metrics.enabled:
+            return await original(self, method, params)
+        start = time.perf_counter()
+        error = True
+        try:
+            response = await original(self, method, params)
+            error = _is_error(response)
+            return response
+        finally:
+            metrics.observe(_label(method, params), time.perf_counter() - start, error)
+    return make_request
+
+
+# AsyncWeb3 sends socket requests as send_request + recv_for_request (and the
+# batch pair) rather than make_request; the send hook remembers the start
+# time and label by request id on the provider, the recv hook records them
+def _started(provider) -> Dict[Any, Tuple[float, str]]:
+    started = provider.__dict__.get("_rpc_metrics_started")
+    if started is None:
+        started = provider.__dict__["_rpc_metrics_started"] = {}
+    return started
+
+
+def _persistent_send(original, label):
+    async def send(self, *args):
+        metrics = _METRICS
+        if metrics is None or not metrics.enabled:
+            return await original(self, *args)
+        start = time.perf_counter()
+        try:
+            request = await original(self, *args)
+        except BaseException:
+            metrics.observe(label(*args), time.perf_counter() - start, True)
+            raise
+        key = request[0]["id"] if isinstance(request, list) and request else request["id"]
+        _started(self)[key] = (start, label(*args))
+        return request
+    return send
+
+
+def _persistent_recv(original):
+    async def recv(self, request):
+        key = request[0]["id"] if isinstance(request, list) and request else request["id"]
+        started = _started(self).pop(key, None)
+        metrics = _METRICS
+        if started is None or metrics is None:
+            return await original(self, request)
+        error = True
+        try:
+            response = await original(self, request)
+            error = _is_error(response)
+            return response
+        finally:
+            metrics.observe(started[1], time.perf_counter() - started[0], error)
+    return recv
+
+
+def _batch_request(original):
+    async def make_batch_request(self, requests):
+        metrics = _METRICS
+        if metrics is None or not metrics.enabled:
+            return await original(self, requests)
+        start = time.perf_counter()
+        error = True
+        try:
+            response = await original(self, requests)
+            error = _is_error(response)
+            return response
+        finally:
+            metrics.observe(_batch_label(requests), time.perf_counter() - start, error)
+    return make_batch_request
+
+
+_HOOKS = (
+    (AsyncHTTPProvider, "_make_request", _http_make_request),
+    (AsyncHTTPProvider, "make_batch_request", _batch_request),
+)
+
+if "send_request" in PersistentConnectionProvider.__dict__:
+    _HOOKS += (
+        (PersistentConnectionProvider, "send_request", lambda original: _persistent_send(original, _label)),
+        (PersistentConnectionProvider, "recv_for_request", _persistent_recv),
+        (PersistentConnectionProvider, "send_batch_request",
+         lambda original: _persistent_send(original, _batch_label)),
+        (PersistentConnectionProvider, "recv_for_batch_request", _persistent_recv),
+    )
+else:  # older web3: every socket request goes through make_request
+    _HOOKS += (
+        (PersistentConnectionProvider, "make_request", _persistent_make_request),
+        (PersistentConnectionProvider, "make_batch_request", _batch_request),
+    )
+
+
+def install_rpc_metrics(metrics: Optional[RpcMetrics] = None) -> RpcMetrics:
+    """Record every RPC request of the process into one RpcMetrics
+
+    The provider classes are patched once; later calls return the installed
+    metrics (or swap in `metrics` when given). Without an install no request
+    pays anything, and `metrics.enabled = False` reduces the hooks to one
+    attribute check.
+
+    Example:
+        metrics = install_rpc_metrics()
+        metrics.add_callback(lambda sample: print(sample.method, sample.seconds))
+        ...
+        print(metrics.to_prometheus())
+    """
+    global _METRICS
+    with _INSTALL_LOCK:
+        if metrics is not None:
+            _METRICS = metrics
+        elif _METRICS is None:
+            _METRICS = RpcMetrics()
+        for cls, name, hook in _HOOKS:
+            if (cls, name) not in _ORIGINALS:
+                original = cls.__dict__[name]
+                _ORIGINALS[(cls, name)] = original
+                setattr(cls, name, hook(original))
+        return _METRICS
+
+
+def uninstall_rpc_metrics():
+    """Restore the provider classes; the collected metrics are kept"""
+    global _METRICS
+    with _INSTALL_LOCK:
+        for (cls, name), original in _ORIGINALS.items():
+            setattr(cls, name, original)
+        _ORIGINALS.clear()
+        _METRICS = None
+
+
+def get_rpc_metrics() -> Optional[RpcMetrics]:
+    """The installed RpcMetrics, None when metrics are not installed"""
+    return _METRICS
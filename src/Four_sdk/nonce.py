@@ -0,0 +1,179 @@
+"""
+Local nonce manager shared by Trade and Token
+"""
+import asyncio
+import heapq
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+
+T = TypeVar("T")
+
+# Node error messages that mean our local nonce no longer matches the chain
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced",
+)
+
+# Node error messages that mean the node already has this exact transaction
+KNOWN_TX_ERRORS = (
+    "already known",
+    "known transaction",
+)
+
+
+def is_nonce_error(error: BaseException) -> bool:
+    """Check whether an exception was caused by a stale nonce"""
+    message = str(error).lower()
+    return any(text in message for text in NONCE_ERRORS)
+
+
+def is_known_tx_error(error: BaseException) -> bool:
+    """Check whether the node rejected a transaction because it already has it"""
+    message = str(error).lower()
+    return any(text in message for text in KNOWN_TX_ERRORS)
+
+
+class BroadcastError(Exception):
+    """Sending a raw transaction failed; the node may still have received it"""
+
+
+async def send_signed(w3: AsyncWeb3, signed: Any) -> HexBytes:
+    """Broadcast a signed transaction
+
+    A transaction the node already knows counts as sent and its own hash is
+    returned. Any other failure (except a nonce error) is raised as
+    BroadcastError, because the node may have the transaction even though
+    the request failed.
+
+    Args:
+        w3: AsyncWeb3 instance
+        signed: Signed transaction from `Account.sign_transaction`
+
+    Returns:
+        Transaction hash
+    """
+    raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+    try:
+        return await w3.eth.send_raw_transaction(raw)
+    except Exception as e:
+        if is_known_tx_error(e):
+            return HexBytes(signed.hash)
+        if is_nonce_error(e):
+            raise
+        raise BroadcastError(str(e)) from e
+
+
+class NonceManager:
+    """Hand out nonces for one account without asking the node every time
+
+    The first nonce is read from the pending transaction count, after that
+    nonces are assigned locally under an asyncio lock. Nonces given back with
+    `release` (transaction never broadcast or dropped) are reused first, so
+    gaps get filled. `resync` reloads the pending count from the chain.
+    """
+
+    def __init__(self, w3: AsyncWeb3, address: str):
+        """Initialize nonce manager
+
+        Args:
+            w3: AsyncWeb3 instance used to read the pending transaction count
+            address: Account address
+        """
+        self.w3 = w3
+        self.address = address
+        self._lock = asyncio.Lock()
+        self._next: Optional[int] = None
+        self._released: List[int] = []
+
+    async def _load(self) -> int:
+        return int(await self.w3.eth.get_transaction_count(self.address, "pending"))
+
+    async def next_nonce(self) -> int:
+        """Reserve the next nonce"""
+        async with self._lock:
+            if self._next is None:
+                self._next = await self._load()
+            if self._released:
+                return heapq.heappop(self._released)
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    async def reserve(self, count: int) -> List[int]:
+        """Reserve `count` nonces in one sequence"""
+        async with self._lock:
+            if self._next is None:
+                self._next = await self._load()
+            nonces = [
+                heapq.heappop(self._released)
+                for _ in range(min(count, len(self._released)))
+            ]
+            remaining = count - len(nonces)
+            nonces.extend(range(self._next, self._next + remaining))
+            self._next += remaining
+            return sorted(nonces)
+
+    def release(self, nonce: int):
+        """Give back a nonce whose transaction was never broadcast"""
+        if self._next is None or nonce >= self._next or nonce in self._released:
+            return
+        if nonce == self._next - 1:
+            self._next = nonce
+        else:
+            heapq.heappush(self._released, nonce)
+
+    async def resync(self):
+        """Reload the next nonce from the chain and forget released nonces"""
+        async with self._lock:
+            self._next = await self._load()
+            self._released = []
+
+    async def submit(self, send: Callable[[int], Awaitable[T]], retries: int = 1) -> T:
+        """Run `send` with a managed nonce
+
+        The nonce is released if `send` fails before broadcasting (gas
+        estimation, signing). If the broadcast itself failed (BroadcastError)
+        the node may hold the transaction, so the manager resyncs from the
+        pending count instead of reusing the nonce. On a nonce error it
+        resyncs and retries with a fresh nonce.
+
+        Args:
+            send: Coroutine function that signs and sends a transaction with
+                the given nonce, broadcasting through `send_signed`
+            retries: Number of retries after a nonce error
+
+        Returns:
+            Whatever `send` returns
+        """
+        for attempt in range(retries + 1):
+            nonce = await self.next_nonce()
+            try:
+                return await send(nonce)
+            except Exception as e:
+                if is_nonce_error(e):
+                    await self.resync()
+                    if attempt < retries:
+                        continue
+                elif isinstance(e, BroadcastError):
+                    await self.resync()
+                else:
+                    self.release(nonce)
+                raise
+
+
+_MANAGERS: Dict[Tuple[str, str], NonceManager] = {}
+
+
+def get_nonce_manager(w3: AsyncWeb3, address: str) -> NonceManager:
+    """Get the process-wide NonceManager for an account on an RPC endpoint"""
+    endpoint = getattr(w3.provider, "endpoint_uri", None) or str(id(w3.provider))
+    key = (str(endpoint), address.lower())
+    manager = _MANAGERS.get(key)
+    if manager is None:
+        manager = NonceManager(w3, address)
+        _MANAGERS[key] = manager
+    return manager
@@ -0,0 +1,400 @@
+"""
+Offline quote engines for bonding curve tokens and PancakeSwap V2 pairs
+"""
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from eth_abi import decode
+from eth_utils import function_signature_to_4byte_selector, keccak, to_checksum_address
+from web3 import AsyncWeb3
+
+from .constants import CONTRACTS, DEFAULT_MULTICALL_CHUNK_SIZE, WBNB
+from .stream.types import CurveTradeEvent, EventType
+from .types import CurveData, QuoteResult
+from .Utils import aggregate3, get_pair_address
+
+GET_PAIR_SEL = function_signature_to_4byte_selector("getPair(address,address)")
+GET_RESERVES_SEL = function_signature_to_4byte_selector("getReserves()")
+
+# Trading fee rates are expressed in basis points
+FEE_DENOMINATOR = 10_000
+
+# lastPrice is quote-token wei per 1e18 token units
+PRICE_SCALE = 10**18
+
+
+def _cs(addr: str) -> str:
+    return to_checksum_address(addr)
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+@dataclass
+class CurveState:
+    """Curve state of one token as used by the quote engine"""
+    token_manager: str
+    funds: int
+    max_funds: int
+    offers: int
+    max_offers: int
+    last_price: int
+    fee_rate: int
+    min_fee: int
+    liquidity_added: bool = False
+
+    def reserves(self) -> Optional[Tuple[int, int]]:
+        """Current (quote, token) reserves of the constant-product curve
+
+        The curve is (funds + a) * (offers + b) = K, with virtual reserves
+        a and b chosen so that all `max_offers` tokens are sold exactly when
+        `max_funds` is raised. `a` is solved from the current state, or from
+        the last price before the first trade.
+        """
+        if self.max_funds <= 0 or self.max_offers <= 0:
+            return None
+
+        sold = self.max_offers - self.offers
+        denominator = self.max_funds * sold - self.funds * self.max_offers
+        if self.funds > 0 and sold > 0 and denominator > 0:
+            virtual_funds = self.funds * self.offers * self.max_funds // denominator
+        else:
+            denominator = PRICE_SCALE * self.max_funds - self.last_price * self.max_offers
+            if self.last_price <= 0 or denominator <= 0:
+                return None
+            virtual_funds = self.last_price * self.max_offers * self.max_funds // denominator
+
+        virtual_offers = virtual_funds * self.max_offers // self.max_funds
+        return self.funds + virtual_funds, self.offers + virtual_offers
+
+    def _fee(self, amount: int) -> int:
+        return max(amount * self.fee_rate // FEE_DENOMINATOR, self.min_fee)
+
+    def buy_amount(self, funds: int) -> Optional[int]:
+        """Tokens received for `funds` quote wei, trading fee included in `funds`"""
+        reserves = self.reserves()
+        if reserves is None or self.liquidity_added:
+            return None
+        cost = min(funds - self._fee(funds), self.max_funds - self.funds)
+        if cost <= 0:
+            return 0
+        x, y = reserves
+        amount = y - _ceil_div(x * y, x + cost)
+        return max(0, min(amount, self.offers))
+
+    def sell_funds(self, amount: int) -> Optional[int]:
+        """Quote wei received for `amount` tokens, after the trading fee"""
+        reserves = self.reserves()
+        if reserves is None or self.liquidity_added:
+            return None
+        amount = min(amount, self.max_offers - self.offers)
+        if amount <= 0:
+            return 0
+        x, y = reserves
+        gross = min(x - _ceil_div(x * y, y + amount), self.funds)
+        return max(0, gross - self._fee(gross))
+
+
+class CurveQuoter:
+    """Local mirror of tokenManagerHelper.tryBuy/trySell
+
+    Seed it with `load` (one batched getTokenInfo round trip) or `update`,
+    then keep it current with TokenPurchase/TokenSale events via
+    `apply_event` or `follow`. Quotes are pure Python integer math.
+    `verify` compares local quotes with on-chain tryBuy/trySell results.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, CurveState] = {}
+
+    def __contains__(self, token: str) -> bool:
+        return token.lower() in self._states
+
+    def state(self, token: str) -> Optional[CurveState]:
+        return self._states.get(token.lower())
+
+    def update(self, token: str, curve: CurveData):
+        """Set the curve state of a token from getTokenInfo data"""
+        self._states[token.lower()] = CurveState(
+            token_manager=_cs(curve.token_manager),
+            funds=int(curve.reserve),
+            max_funds=int(curve.max_reserve),
+            offers=int(curve.offers),
+            max_offers=int(curve.max_offers),
+            last_price=int(curve.last_price),
+            fee_rate=int(curve.trading_fee_rate),
+            min_fee=int(curve.min_trading_fee),
+            liquidity_added=bool(curve.liquidity_added)
+        )
+
+    def remove(self, token: str):
+        self._states.pop(token.lower(), None)
+
+    async def load(
+        self,
+        trade,
+        tokens: Sequence[str],
+        chunk_size: int = DEFAULT_MULTICALL_CHUNK_SIZE
+    ) -> int:
+        """Seed curve states with batched getTokenInfo reads
+
+        Args:
+            trade: Trade instance used for the multicall reads
+            tokens: Token addresses
+            chunk_size: Maximum number of calls per multicall request
+
+        Returns:
+            Number of tokens loaded
+        """
+        curves = await trade.get_curves_many(tokens, chunk_size)
+        loaded = 0
+        for token, curve in curves.items():
+            if curve is not None:
+                self.update(token, curve)
+                loaded += 1
+        return loaded
+
+    def apply_event(self, event: Union[Dict[str, Any], CurveTradeEvent]) -> bool:
+        """Apply a parsed TokenPurchase/TokenSale event (dict or record) to the tracked state
+
+        Returns:
+            True if the event updated a tracked token
+        """
+        try:
+            if isinstance(event, dict):
+                token, offers, funds, price = event["token"], event["offers"], event["funds"], event["price"]
+            else:
+                token, offers, funds, price = event.token, event.offers, event.funds, event.price
+            state = self._states.get(token.lower())
+            if state is None:
+                return False
+            state.offers = int(offers)
+            state.funds = int(funds)
+            state.last_price = int(price)
+            if state.offers == 0 or state.funds >= state.max_funds:
+                state.liquidity_added = True
+            return True
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return False
+
+    async def follow(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """Apply every event from a stream, then pass it on
+
+        Example:
+            async for event in quoter.follow(stream.events()):
+                ...
+        """
+        async for event in events:
+            self.apply_event(event)
+            yield event
+
+    def get_amount_out(self, token: str, amount_in: int, is_buy: bool) -> Optional[QuoteResult]:
+        """Quote a curve trade locally, None if the token is not tracked or migrated"""
+        state = self._states.get(token.lower())
+        if state is None:
+            return None
+        if is_buy:
+            amount = state.buy_amount(int(amount_in))
+        else:
+            amount = state.sell_funds(int(amount_in))
+        if amount is None:
+            return None
+        return QuoteResult(router=state.token_manager, amount=amount)
+
+    async def verify(
+        self,
+        trade,
+        tokens: Sequence[str],
+        amount_in: int | Sequence[int],
+        is_buy: bool,
+        chunk_size: int = DEFAULT_MULTICALL_CHUNK_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Compare local quotes with on-chain tryBuy/trySell results
+
+        Args:
+            trade: Trade instance used for the on-chain quotes
+            tokens: Token addresses
+            amount_in: Input amount for every token, or one amount per token
+            is_buy: True to check buy quotes, False for sell quotes
+            chunk_size: Maximum number of calls per multicall request
+
+        Returns:
+            One dict per token with `token`, `local`, `onchain` and
+            `error` (relative difference, None if either side is missing)
+        """
+        amounts = [amount_in] * len(tokens) if isinstance(amount_in, int) else list(amount_in)
+        onchain = await trade.get_amounts_out_many(tokens, amounts, is_buy, chunk_size)
+
+        report = []
+        for token, amount, remote in zip(tokens, amounts, onchain):
+            local = self.get_amount_out(token, amount, is_buy)
+            local_amount = local.amount if local else None
+            remote_amount = remote.amount if remote else None
+            error = None
+            if local_amount is not None and remote_amount:
+                error = abs(local_amount - remote_amount) / remote_amount
+            report.append({
+                "token": _cs(token),
+                "local": local_amount,
+                "onchain": remote_amount,
+                "error": error
+            })
+        return report
+
+
+# PancakeSwap V2 charges 0.25% on the input amount
+PANCAKE_V2_FEE_NUMERATOR = 9975
+PANCAKE_V2_FEE_DENOMINATOR = 10_000
+
+SYNC_TOPIC = keccak(text=EventType.v2_SYNC.value)
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return bytes(value)
+
+
+def _to_address(value) -> str:
+    if isinstance(value, str):
+        return value.lower()
+    return "0x" + bytes(value).hex()
+
+
+@dataclass
+class PairReserves:
+    """Reserves of one PancakeSwap V2 pair"""
+    token0: str
+    token1: str
+    reserve0: int = 0
+    reserve1: int = 0
+
+
+class PairReserveMirror:
+    """Local PancakeSwap V2 reserve cache for token/WBNB pairs
+
+    Reserves are seeded with batched getPair/getReserves reads and kept
+    current from `Sync` logs (`apply_log`), which carry the absolute
+    reserves after every swap, mint and burn. Quotes use the constant
+    product formula with the 0.25% fee, like getAmountsOut.
+    """
+
+    def __init__(self):
+        self._pairs: Dict[str, PairReserves] = {}
+        self._token_pairs: Dict[str, str] = {}
+        self.router = _cs(CONTRACTS["pancakeRouter"])
+
+    def add_pair(self, token: str, pair: str, reserve0: int = 0, reserve1: int = 0):
+        """Track the token/WBNB pair of a token"""
+        token = token.lower()
+        wbnb = WBNB.lower()
+        token0, token1 = (token, wbnb) if token < wbnb else (wbnb, token)
+        self._pairs[pair.lower()] = PairReserves(token0, token1, int(reserve0), int(reserve1))
+        self._token_pairs[token] = pair.lower()
+
+    def pair_of(self, token: str) -> Optional[str]:
+        pair = self._token_pairs.get(token.lower())
+        return _cs(pair) if pair else None
+
+    def reserves(self, pair: str) -> Optional[PairReserves]:
+        return self._pairs.get(pair.lower())
+
+    @property
+    def pairs(self) -> List[str]:
+        return [_cs(pair) for pair in self._pairs]
+
+    async def load(
+        self,
+        w3: AsyncWeb3,
+        tokens: Sequence[str],
+        chunk_size: int = DEFAULT_MULTICALL_CHUNK_SIZE
+    ) -> int:
+        """Find the pairs of `tokens` and seed their reserves
+
+        Pair addresses are derived locally (CREATE2) and a single multicall
+        reads getReserves of every pair; pairs that do not exist yet return
+        no data and are skipped.
+
+        Returns:
+            Number of pairs loaded
+        """
+        tokens = list(dict.fromkeys(_cs(token) for token in tokens if token.lower() != WBNB.lower()))
+        found = [(token, get_pair_address(token)) for token in tokens]
+
+        results = await aggregate3(w3, [(pair, GET_RESERVES_SEL) for _, pair in found], chunk_size)
+        loaded = 0
+        for (token, pair), (success, data) in zip(found, results):
+            if not success or len(data) < 96:
+                continue
+            reserve0, reserve1, _ = decode(["uint112", "uint112", "uint32"], data)
+            self.add_pair(token, pair, reserve0, reserve1)
+            loaded += 1
+        return loaded
+
+    def apply_log(self, log: Dict[str, Any]) -> bool:
+        """Apply a raw `Sync` log
+
+        Returns:
+            True if the log updated a tracked pair
+        """
+        topics = log.get("topics") or []
+        if not topics or _to_bytes(topics[0]) != SYNC_TOPIC:
+            return False
+        reserves = self._pairs.get(_to_address(log.get("address")))
+        if reserves is None:
+            return False
+        data = _to_bytes(log.get("data"))
+        reserves.reserve0 = int.from_bytes(data[0:32], "big")
+        reserves.reserve1 = int.from_bytes(data[32:64], "big")
+        return True
+
+    def apply_swap(self, event: Dict[str, Any]) -> bool:
+        """Apply a parsed Swap event's deltas
+
+        Only for consumers without Sync logs; do not combine with `apply_log`
+        for the same pair, and note that fee-on-transfer tokens drift.
+        """
+        reserves = self._pairs.get(str(event.get("pool", "")).lower())
+        if reserves is None:
+            return False
+        reserves.reserve0 += int(event["amount0In"]) - int(event["amount0Out"])
+        reserves.reserve1 += int(event["amount1In"]) - int(event["amount1Out"])
+        return True
+
+    def get_amount_out(self, token: str, amount_in: int, is_buy: bool) -> Optional[QuoteResult]:
+        """Quote a WBNB -> token (buy) or token -> WBNB (sell) swap locally
+
+        Returns:
+            QuoteResult, or None when the pair is unknown or has no reserves
+            loaded yet (quote through RPC instead)
+        """
+        pair = self._token_pairs.get(token.lower())
+        if pair is None:
+            return None
+        reserves = self._pairs[pair]
+        token_is_0 = reserves.token0 == token.lower()
+        token_reserve, wbnb_reserve = (
+            (reserves.reserve0, reserves.reserve1) if token_is_0 else (reserves.reserve1, reserves.reserve0)
+        )
+        reserve_in, reserve_out = (wbnb_reserve, token_reserve) if is_buy else (token_reserve, wbnb_reserve)
+        if reserve_in <= 0 or reserve_out <= 0:
+            return None
+        if amount_in <= 0:
+            return QuoteResult(router=self.router, amount=0)
+
+        amount_in_with_fee = int(amount_in) * PANCAKE_V2_FEE_NUMERATOR
+        amount_out = (amount_in_with_fee * reserve_out) // (
+            reserve_in * PANCAKE_V2_FEE_DENOMINATOR + amount_in_with_fee
+        )
+        return QuoteResult(router=self.router, amount=amount_out)
+
+    def get_amounts_out_many(
+        self,
+        tokens: Sequence[str],
+        amount_in: int | Sequence[int],
+        is_buy: bool
+    ) -> List[Optional[QuoteResult]]:
+        """Quote a basket locally, aligned with `tokens` (None where `get_amount_out` gives None)"""
+        amounts = [amount_in] * len(tokens) if isinstance(amount_in, int) else list(amount_in)
+        return [self.get_amount_out(token, amount, is_buy) for token, amount in zip(tokens, amounts)]
@@ -1,12 +1,32 @@
-from .curve import CurveIndexer,CurveStream
+from .curve import CurveIndexer,CurveStream,EventStore
 from .dex import DexStream
-from .types import  EventType
+from .types import  EventType,CurveTradeEvent,TokenCreateEvent,SwapEvent,LiquidityAddedEvent
+from .subscription import LogSubscription
+from .hub import StreamHub,get_stream_hub
+from .resilient import ResilientLogStream
+from .buffer import EventBuffer,OverflowPolicy
+from .decoder import parse_log,decode_curve_logs,decode_create_logs,decode_swap_logs
 
 
 
 __all__ = [
     "CurveIndexer",
+    "EventStore",
     "EventType",
+    "CurveTradeEvent",
+    "TokenCreateEvent",
+    "SwapEvent",
+    "LiquidityAddedEvent",
     "CurveStream",
-    "DexStream"
+    "DexStream",
+    "parse_log",
+    "LogSubscription",
+    "StreamHub",
+    "get_stream_hub",
+    "ResilientLogStream",
+    "EventBuffer",
+    "OverflowPolicy",
+    "decode_curve_logs",
+    "decode_create_logs",
+    "decode_swap_logs"
 ]
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Bounded event buffer decoupling the socket reader from the consumer
+"""
+import asyncio
+import itertools
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Optional, Union
+
+
+class OverflowPolicy(Enum):
+    """What a full EventBuffer does with a new event"""
+    BLOCK = "block"              # wait for the consumer (backpressure)
+    DROP_OLDEST = "drop_oldest"  # discard the oldest buffered event
+    COALESCE = "coalesce"        # keep only the newest event per key
+
+
+def event_key(event: Any) -> Hashable:
+    """Default coalesce key: the token (curve events) or pool (swaps)"""
+    if isinstance(event, dict):
+        return event.get("token") or event.get("pool")
+    return getattr(event, "token", None) or getattr(event, "pool", None)
+
+
+class EventBuffer:
+    """Bounded FIFO of stream events with an overflow policy
+
+    A background task reads the stream into the buffer, so a slow consumer
+    never stalls the WebSocket read loop unless the BLOCK policy is chosen.
+    With COALESCE an event replaces the buffered event with the same key
+    (in its queue position), so the consumer always sees the latest state.
+
+    Example:
+        buffer = stream.buffered(maxsize=500, policy="coalesce")
+        async for event in buffer:
+            ...
+        buffer.stats()
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        key: Optional[Callable[[Any], Hashable]] = None
+    ):
+        """Initialize buffer
+
+        Args:
+            maxsize: Maximum number of buffered events
+            policy: OverflowPolicy or its value ("block", "drop_oldest", "coalesce")
+            key: Coalesce key of an event (default: token, or pool for swaps)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.policy = OverflowPolicy(policy)
+        self.key = key or event_key
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+        self._closed = False
+        self._pump: Optional[asyncio.Task] = None
+        self.error: Optional[BaseException] = None
+
+        # Counters
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of events waiting for the consumer"""
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced
+        }
+
+    async def put(self, event: Any):
+        """Add an event, applying the overflow policy when full"""
+        async with self._cond:
+            if self._closed:
+                raise RuntimeError("EventBuffer is closed")
+            self.received += 1
+
+            if self.policy is OverflowPolicy.COALESCE:
+                key = self.key(event)
+                if key is not None and key in self._items:
+                    self._items[key] = event
+                    self.coalesced += 1
+                    return
+                if key is None:
+                    key = ("seq", next(self._seq))
+            else:
+                key = next(self._seq)
+
+            if len(self._items) >= self.maxsize:
+                if self.policy is OverflowPolicy.BLOCK:
+                    await self._cond.wait_for(lambda: len(self._items) < self.maxsize or self._closed)
+                    if self._closed:
+                        return
+                else:
+                    self._items.popitem(last=False)
+                    self.dropped += 1
+
+            self._items[key] = event
+            if len(self._items) > self.max_depth:
+                self.max_depth = len(self._items)
+            self._cond.notify_all()
+
+    async def get(self) -> Any:
+        """Next event; raises StopAsyncIteration once closed and drained"""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._items or self._closed)
+            if not self._items:
+                if self.error is not None:
+                    error, self.error = self.error, None
+                    raise error
+                raise StopAsyncIteration
+            _, event = self._items.popitem(last=False)
+            self.delivered += 1
+            self._cond.notify_all()
+            return event
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self.get()
+
+    def feed(self, source: AsyncIterator[Any]) -> "EventBuffer":
+        """Read `source` into the buffer from a background task"""
+        if self._pump is not None:
+            raise RuntimeError("EventBuffer is already fed")
+        self._pump = asyncio.create_task(self._run(source))
+        return self
+
+    async def _run(self, source: AsyncIterator[Any]):
+        try:
+            async for event in source:
+                await self.put(event)
+                if self._closed:
+                    break
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            if hasattr(source, "aclose"):
+                try:
+                    await source.aclose()
+                except Exception:
+                    pass
+            await self._finish()
+
+    async def _finish(self):
+        async with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    async def aclose(self):
+        """Stop reading the source; buffered events are discarded"""
+        pump, self._pump = self._pump, None
+        if pump is not None and not pump.done():
+            pump.cancel()
+            try:
+                await pump
+            except asyncio.CancelledError:
+                pass
+        async with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._cond.notify_all()
@@ -1,7 +1,9 @@
 from .indexer import CurveIndexer
 from .stream import CurveStream
+from .store import EventStore
 
 __all__ = [
     "CurveIndexer",
-    "CurveStream"
+    "CurveStream",
+    "EventStore"
 ]
\ No newline at end of file
@@ -3,14 +3,34 @@ Historical event indexer for bonding curve events
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, AsyncIterator, Union, Tuple, Deque
 from datetime import datetime
 from web3 import AsyncWeb3, AsyncHTTPProvider
 from eth_abi import decode
 
 from ...constants import CONTRACTS
 from ..types import EventType
+from ..decoder import parse_log, log_row, decode_rows
+from ..scanner import LogScanner, DEFAULT_CHUNK_SIZE, MIN_CHUNK_SIZE, MAX_CHUNK_SIZE, log_position
+from .store import EventStore
 
+# Logs per job handed to a decode worker
+DECODE_CHUNK_SIZE = 2000
+
+# Events fetched when no event_types are given. Pinned so that new EventType
+# members (LiquidityAdded, Sync, ...) do not change default results or the
+# EventStore scope of existing callers
+CURVE_EVENT_TYPES: Tuple[EventType, ...] = (
+    EventType.MANAGER_1_CREATE,
+    EventType.MANAGER_2_CREATE,
+    EventType.MANAGER_1_BUY,
+    EventType.MANAGER_2_BUY,
+    EventType.MANAGER_1_SELL,
+    EventType.MANAGER_2_SELL,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,13 +41,24 @@ logging.basicConfig(
 class CurveIndexer:
     """Index historical bonding curve events"""
     
-    def __init__(self, rpc_url: str):
+    def __init__(
+        self,
+        rpc_url: str,
+        store: Optional[Union[EventStore, str]] = None,
+        confirmations: int = 15
+    ):
         """Initialize indexer with RPC endpoint
         
         Args:
             rpc_url: HTTP RPC endpoint URL
+            store: Optional EventStore (or SQLite path) used to persist events
+                and resume scans from the last completed block
+            confirmations: Blocks below the chain head that are considered
+                final and may be written to the store
         """
         self.w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
+        self.store = EventStore(store) if isinstance(store, str) else store
+        self.confirmations = confirmations
         self.curve_address = CONTRACTS["tokenManager2"]
         
         # Pre-calculate topic hashes for all event types
@@ -37,27 +68,15 @@ class CurveIndexer:
         }
 
     
-    async def fetch_events(
+    def _build_filter(
         self,
-        from_block: int,
-        to_block: int,
         event_types: Optional[List[EventType]] = None,
         token_filter: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Fetch historical curve events
-        
-        Args:
-            from_block: Starting block number
-            to_block: Ending block number
-            event_types: List of EventType to fetch (default: all)
-            token_filter: Filter by token address (optional)
-            
-        Returns:
-            List of parsed events
-        """
-        # Default to all event types if not specified
+    ) -> Dict[str, Any]:
+        """Build the get_logs filter (without block range) for a query"""
+        # Default to the curve create/buy/sell events if not specified
         if event_types is None:
-            event_types = list(EventType)
+            event_types = list(CURVE_EVENT_TYPES)
         
         # Build event topics from EventType enum
         event_topic_hashes = []
@@ -78,113 +97,217 @@ class CurveIndexer:
             padded_token = "0x" + token_address[2:].lower().rjust(64, '0')
             topics.append(None)  # Skip trader (first indexed)
             topics.append(padded_token)
+
+        return {
+            "address": self.curve_address,
+            "topics": topics
+        }
+
+    async def iter_events(
+        self,
+        from_block: int,
+        to_block: int,
+        event_types: Optional[List[EventType]] = None,
+        token_filter: Optional[str] = None,
+        concurrency: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        min_chunk_size: int = MIN_CHUNK_SIZE,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+        batch: bool = False,
+        decode_workers: int = 0
+    ) -> AsyncIterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Stream historical curve events as each block window arrives
+
+        Only the windows in flight are held in memory. Breaking out of the
+        loop (or closing the generator) cancels outstanding fetches. With a
+        store configured, stored ranges are served from disk and only the
+        missing ranges are fetched; every finished window is checkpointed.
         
-        # Scan in chunks to avoid API limits
-        chunk_size = 1000
-        all_events = []
-        current_block = from_block
-        
-        while current_block <= to_block:
-            chunk_end = min(current_block + chunk_size - 1, to_block)
+        Args:
+            from_block: Starting block number
+            to_block: Ending block number
+            event_types: List of EventType to fetch (default: CURVE_EVENT_TYPES)
+            token_filter: Filter by token address (optional)
+            concurrency: Number of block windows fetched at once
+            chunk_size: Initial block window size, adapted to the log density
+            min_chunk_size: Lower bound for the adapted window size (1 or
+                more); rejected windows are split down to a single block
+            max_chunk_size: Upper bound for the block window size
+            batch: Yield one list of events per block window instead of single events
+            decode_workers: Decode logs in this many worker processes (0 = in
+                the event loop); fetching stays on the loop and results keep
+                their order
             
-            try:
-                # Create filter parameters
-                filter_params = {
-                    "address": self.curve_address,
-                    "topics": topics,
-                    "fromBlock": current_block,
-                    "toBlock": chunk_end
-                }
-                
-                # Get logs
-                logs = await self.w3.eth.get_logs(filter_params)
-                
-                
+        Yields:
+            Parsed events (or per-window lists) ordered by block number and log index
+        """
+        filter_params = self._build_filter(event_types, token_filter)
+        scanner = LogScanner(
+            self.w3,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+            min_chunk_size=min_chunk_size,
+            max_chunk_size=max_chunk_size
+        )
+
+        # Without a store the whole range is scanned, with one only the
+        # segments that are not stored yet
+        if self.store is None:
+            segments = [(False, from_block, to_block)]
+        else:
+            scope = EventStore.scope_key(filter_params)
+            segments = self.store.plan(scope, from_block, to_block)
+            if not all(stored for stored, _, _ in segments):
+                safe_block = await self.w3.eth.get_block_number() - self.confirmations
+
+        executor = ProcessPoolExecutor(max_workers=decode_workers) if decode_workers > 0 else None
+        try:
+            for stored, start, end in segments:
+                if stored:
+                    for events in self.store.load(scope, start, end):
+                        if batch:
+                            yield events
+                        else:
+                            for event in events:
+                                yield event
+                    continue
+
+                windows = scanner.scan(filter_params, start, end)
+                decoded = self._decode_windows(windows, executor, decode_workers)
+                try:
+                    async for window_start, window_end, events, positioned in decoded:
+                        # Checkpoint the final part of the window before handing it out
+                        if self.store is not None and window_start <= safe_block:
+                            last_block = min(window_end, safe_block)
+                            self.store.save(
+                                scope,
+                                window_start,
+                                last_block,
+                                [item for item in positioned if item[0] <= last_block]
+                            )
+
+                        if batch:
+                            if events:
+                                yield events
+                        else:
+                            for event in events:
+                                yield event
+                finally:
+                    await decoded.aclose()
+                    await windows.aclose()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _decode_windows(
+        self,
+        windows: AsyncIterator[Tuple[int, int, List[Dict[str, Any]]]],
+        executor: Optional[ProcessPoolExecutor],
+        decode_workers: int
+    ) -> AsyncIterator[Tuple[int, int, List[Dict[str, Any]], List[Tuple[int, int, Dict[str, Any]]]]]:
+        """Parse scanned windows, in worker processes when an executor is given
+
+        Yields (window start, window end, events, (block, logIndex, event)
+        items) in window order. With an executor several windows are decoded
+        while the next ones are fetched.
+        """
+        if executor is None:
+            async for window_start, window_end, logs in windows:
                 # Parse events
+                events = []
+                positioned = []
                 for log in logs:
-                    event = await self._parse_event(log)
+                    event = parse_log(log)
                     if event:
-                        all_events.append(event)
-                
-                current_block = chunk_end + 1
-                
-            except Exception as e:
-                # Reduce chunk size on error
-                if chunk_size > 100:
-                    chunk_size = chunk_size // 2
-                    continue
-                else:
-                    raise e
+                        events.append(event)
+                        if self.store is not None:
+                            positioned.append((*log_position(log), event))
+                yield window_start, window_end, events, positioned
+            return
+
+        loop = asyncio.get_running_loop()
+        pending: Deque[Tuple[int, int, List[Tuple[int, int]], List[asyncio.Future]]] = deque()
+
+        async def _collect(window_start, window_end, positions, futures):
+            events = []
+            positioned = []
+            decoded = [event for chunk in await asyncio.gather(*futures) for event in chunk]
+            for position, event in zip(positions, decoded):
+                if event:
+                    events.append(event)
+                    if self.store is not None:
+                        positioned.append((*position, event))
+            return window_start, window_end, events, positioned
+
+        try:
+            async for window_start, window_end, logs in windows:
+                rows = [log_row(log) for log in logs]
+                futures = [
+                    loop.run_in_executor(executor, decode_rows, rows[i:i + DECODE_CHUNK_SIZE])
+                    for i in range(0, len(rows), DECODE_CHUNK_SIZE)
+                ]
+                pending.append((window_start, window_end, [log_position(log) for log in logs], futures))
+                # Keep the workers busy while the next windows are fetched
+                while len(pending) > decode_workers:
+                    yield await _collect(*pending.popleft())
+            while pending:
+                yield await _collect(*pending.popleft())
+        finally:
+            for *_, futures in pending:
+                for future in futures:
+                    future.cancel()
+
+    async def fetch_events(
+        self,
+        from_block: int,
+        to_block: int,
+        event_types: Optional[List[EventType]] = None,
+        token_filter: Optional[str] = None,
+        concurrency: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        min_chunk_size: int = MIN_CHUNK_SIZE,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+        decode_workers: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Fetch historical curve events
+        
+        Args:
+            from_block: Starting block number
+            to_block: Ending block number
+            event_types: List of EventType to fetch (default: CURVE_EVENT_TYPES)
+            token_filter: Filter by token address (optional)
+            concurrency: Number of block windows fetched at once
+            chunk_size: Initial block window size, adapted to the log density
+            min_chunk_size: Lower bound for the adapted window size (1 or
+                more); rejected windows are split down to a single block
+            max_chunk_size: Upper bound for the block window size
+            decode_workers: Decode logs in this many worker processes (0 = in
+                the event loop)
+            
+        Returns:
+            List of parsed events ordered by block number and log index
+        """
+        all_events = []
+        async for events in self.iter_events(
+            from_block,
+            to_block,
+            event_types,
+            token_filter,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+            min_chunk_size=min_chunk_size,
+            max_chunk_size=max_chunk_size,
+            batch=True,
+            decode_workers=decode_workers
+        ):
+            all_events.extend(events)
         
         return all_events
     
     
     async def _parse_event(self, log: Dict) -> Optional[Dict[str, Any]]:
-        """Parse a log entry into an event"""
-        try:
-            # Get event type from topic
-            topic0 = log['topics'][0]
-            if isinstance(topic0, bytes):
-                topic0_hex = topic0.hex()
-            else:
-                topic0_hex = topic0
-            
-            # Find matching event type
-            event_name = None
-            for event_type, topic_hash in self.event_topics.items():
-                if topic0_hex == topic_hash.hex():
-                    event_name = event_type.name
-                    break
-            
-            if not event_name:
-                return None
-            
-            
-            # Fetch data hex that contain created token Info
-            data_hex =  log['data'].hex() if hasattr(log['data'],'hex') else log['data']
-            if data_hex.startswith('0x'):
-                data_hex = data_hex[2:]
-
-
-            # Parse This data to get each items
-            # 0 = creator
-            # 1 = token
-            # 2 = requestId
-            # 3 = name
-            # 4 = symbol
-            # 5 = totalSupply
-            # 6 = launchTime
-            # 7 = launchFee
-            datas = [data_hex[i:i+64] for i in range(0, len(data_hex), 64)]
-            
-            creator = "0x" + datas[0][24:]
-            token = "0x" + datas[1][24:]
-            requestId = datas[2][24:]
-            name = bytes.fromhex(datas[3]).decode('utf-8')
-            symbol = bytes.fromhex(datas[4]).decode('utf-8')
-            totalSupply = int("0x"+ datas[5],16)
-            launchTime =int("0x"+ datas[6],16)
-            launchFee = int("0x"+ datas[7],16)
-
-            return {
-                "eventName": event_name,
-                "creator": log['blockNumber'],
-                "transactionHash": (
-                    log['transactionHash'].hex() 
-                    if hasattr(log['transactionHash'], 'hex') 
-                    else log['transactionHash']
-                ),
-                "creator": self.w3.to_checksum_address(creator),
-                "token": self.w3.to_checksum_address(token),
-                # "name": name,
-                # "symbol": symbol,
-                "totalSupply": totalSupply,
-                'launchTime':launchTime,
-                'launchFee':launchFee
-            }
-            
-        except Exception as e:
-            return None
+        """Parse a log entry into an event (dispatched on topic0)"""
+        return parse_log(log)
 
     async def get_block_number(self) -> int:
         return await self.w3.eth.get_block_number()
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Persistent SQLite store for indexed curve events
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class EventStore:
+    """Checkpointed local store for decoded events
+
+    Events and completed block ranges are kept per scope. A scope identifies
+    one query: contract address, topic filter and token filter. Ranges are
+    only recorded after all their events are written, in the same
+    transaction, so an interrupted run resumes at the last finished window.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) a store
+
+        Args:
+            path: SQLite database file path (":memory:" for a temporary store)
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                scope TEXT NOT NULL,
+                block_number INTEGER NOT NULL,
+                log_index INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (scope, block_number, log_index)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS ranges (
+                scope TEXT NOT NULL,
+                from_block INTEGER NOT NULL,
+                to_block INTEGER NOT NULL,
+                PRIMARY KEY (scope, from_block)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def scope_key(filter_params: Dict[str, Any]) -> str:
+        """Build the scope key for a get_logs filter"""
+        address = filter_params.get("address")
+        if isinstance(address, (list, tuple)):
+            address = sorted(addr.lower() for addr in address)
+        elif address:
+            address = address.lower()
+
+        topics = []
+        for topic in filter_params.get("topics", []):
+            if isinstance(topic, (list, tuple)):
+                topic = sorted(str(t).lower() for t in topic)
+            elif topic is not None:
+                topic = str(topic).lower()
+            topics.append(topic)
+        return json.dumps([address, topics], separators=(",", ":"))
+
+    def completed_ranges(self, scope: str) -> List[Tuple[int, int]]:
+        """Completed (from_block, to_block) ranges for a scope, in block order"""
+        rows = self._db.execute(
+            "SELECT from_block, to_block FROM ranges WHERE scope = ? ORDER BY from_block",
+            (scope,)
+        )
+        return [(int(start), int(end)) for start, end in rows]
+
+    def highest_block(self, scope: str) -> Optional[int]:
+        """Highest completed block for a scope, None if nothing is stored"""
+        row = self._db.execute(
+            "SELECT MAX(to_block) FROM ranges WHERE scope = ?",
+            (scope,)
+        ).fetchone()
+        return None if row[0] is None else int(row[0])
+
+    def plan(self, scope: str, from_block: int, to_block: int) -> List[Tuple[bool, int, int]]:
+        """Split a block range into stored and missing segments
+
+        Returns:
+            List of (is_stored, start, end) covering the range in block order
+        """
+        rows = self._db.execute(
+            "SELECT from_block, to_block FROM ranges "
+            "WHERE scope = ? AND to_block >= ? AND from_block <= ? ORDER BY from_block",
+            (scope, from_block, to_block)
+        )
+        segments = []
+        cursor = from_block
+        for start, end in rows:
+            start = max(int(start), from_block)
+            end = min(int(end), to_block)
+            if start > cursor:
+                segments.append((False, cursor, start - 1))
+            segments.append((True, start, end))
+            cursor = end + 1
+        if cursor <= to_block:
+            segments.append((False, cursor, to_block))
+        return segments
+
+    def save(
+        self,
+        scope: str,
+        from_block: int,
+        to_block: int,
+        events: Sequence[Tuple[int, int, Dict[str, Any]]]
+    ):
+        """Write events of a fully scanned range and mark the range completed
+
+        Args:
+            scope: Scope key
+            from_block: First scanned block
+            to_block: Last scanned block (inclusive)
+            events: (block_number, log_index, event) for every event in the range
+        """
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?)",
+                [
+                    (scope, block_number, log_index, json.dumps(event))
+                    for block_number, log_index, event in events
+                ]
+            )
+
+            # Merge with overlapping or adjacent ranges
+            rows = self._db.execute(
+                "SELECT from_block, to_block FROM ranges "
+                "WHERE scope = ? AND to_block >= ? AND from_block <= ?",
+                (scope, from_block - 1, to_block + 1)
+            ).fetchall()
+            for start, end in rows:
+                from_block = min(from_block, int(start))
+                to_block = max(to_block, int(end))
+            self._db.executemany(
+                "DELETE FROM ranges WHERE scope = ? AND from_block = ?",
+                [(scope, start) for start, _ in rows]
+            )
+            self._db.execute(
+                "INSERT INTO ranges VALUES (?, ?, ?)",
+                (scope, from_block, to_block)
+            )
+
+    def load(
+        self,
+        scope: str,
+        from_block: int,
+        to_block: int,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Read stored events in block order, `batch_size` events at a time"""
+        cursor = self._db.execute(
+            "SELECT payload FROM events "
+            "WHERE scope = ? AND block_number BETWEEN ? AND ? "
+            "ORDER BY block_number, log_index",
+            (scope, from_block, to_block)
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [json.loads(payload) for (payload,) in rows]
+
+    def clear(self, scope: Optional[str] = None):
+        """Delete stored events and ranges (for one scope, or everything)"""
+        with self._db:
+            if scope is None:
+                self._db.execute("DELETE FROM events")
+                self._db.execute("DELETE FROM ranges")
+            else:
+                self._db.execute("DELETE FROM events WHERE scope = ?", (scope,))
+                self._db.execute("DELETE FROM ranges WHERE scope = ?", (scope,))
+
+    def close(self):
+        self._db.close()
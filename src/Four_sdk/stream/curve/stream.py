@@ -1,16 +1,39 @@
 
-from typing import List, AsyncIterator, Optional, Dict, Any
+import logging
+from typing import List, AsyncIterator, Optional, Dict, Any, Set, Union, Callable, Hashable
 from web3 import AsyncWeb3, WebSocketProvider, Web3
 from ...constants import CONTRACTS
 from ..types import EventType
+from ..decoder import topic0, parse_log, parse_log_record
+from ..subscription import LogSubscription
+from ..hub import StreamHub
+from ..resilient import ResilientLogStream
+from ..buffer import EventBuffer, OverflowPolicy
 from .parser import parse_curve_event,parse_create_event
 
+logger = logging.getLogger(__name__)
+
 class CurveStream:
-    def __init__(self, ws_url: str):
+    """Live tokenManager2 events over WebSocket
+
+    TokenPurchase/TokenSale carry the token in the log data rather than in an
+    indexed topic, so the node can only filter them by contract and event
+    type. Token filtering happens client-side with a set lookup; changing the
+    watched tokens therefore never needs a resubscribe, while changing the
+    event types resubscribes in place on the open socket.
+
+    With a StreamHub the stream shares the hub's WebSocket (and decoded
+    events) with every other stream on the same endpoint.
+    """
+
+    def __init__(self, ws_url: str, hub: Optional[StreamHub] = None):
         self.ws_url = ws_url
+        self.hub = hub
         self.event_types: List[EventType] = []
         self.token_addresses: List[str] = []
-        self._subscription_id: Optional[str] = None
+        self._token_set: Set[str] = set()  # lowercase token addresses
+        self._subscription: Optional[LogSubscription] = None
+        self.resilient_stream: Optional[ResilientLogStream] = None
         self._w3: Optional[AsyncWeb3] = None
         self._topic_map: Dict[bytes, str] = {}  # topic -> event name mapping
 
@@ -22,77 +45,157 @@ class CurveStream:
         self.event_types = event_types
 
         if token_addresses is not None:
-            if isinstance(token_addresses, str):
-                token_addresses = [token_addresses]
-            # Filter out None and empty strings
-            valid_addresses = [addr for addr in token_addresses if addr and addr.strip()]
-            self.token_addresses = [Web3.to_checksum_address(addr) for addr in valid_addresses]
-           
-
-        
-    async def events(self,creat_event:bool=False) -> AsyncIterator[Dict[str, Any]]:
-        """Async iterator that yields parsed events"""
-        # Create topics and mapping
+            self.token_addresses = []
+            self._token_set = set()
+            self.add_tokens(token_addresses)
+
+    def add_tokens(self, token_addresses: List[str]):
+        """Watch more tokens; applies to the next event of a live stream"""
+        if isinstance(token_addresses, str):
+            token_addresses = [token_addresses]
+        # Filter out None and empty strings
+        for addr in token_addresses:
+            if not addr or not addr.strip():
+                continue
+            key = addr.strip().lower()
+            if key not in self._token_set:
+                self._token_set.add(key)
+                self.token_addresses.append(Web3.to_checksum_address(addr.strip()))
+
+    def remove_tokens(self, token_addresses: List[str]):
+        """Stop watching tokens; with no tokens left every token is streamed"""
+        if isinstance(token_addresses, str):
+            token_addresses = [token_addresses]
+        removed = {addr.strip().lower() for addr in token_addresses if addr and addr.strip()}
+        self._token_set -= removed
+        self.token_addresses = [addr for addr in self.token_addresses if addr.lower() not in removed]
+
+    async def set_event_types(self, event_types: List[EventType]):
+        """Change the streamed event types, resubscribing in place when live"""
+        self.event_types = event_types
+        if self._subscription is not None:
+            await self._subscription.update(self._build_filter())
+
+    def _match_token(self, event, as_record: bool) -> bool:
+        """Filter by token address if specified"""
+        if not self._token_set:
+            return True
+        event_token = event.token if as_record else event.get('token', '')
+        return event_token.lower() in self._token_set
+
+    def _build_filter(self) -> Optional[Dict[str, Any]]:
+        """Build the logs filter and topic -> event name mapping"""
         topics = []
+        topic_map = {}
         for event_type in self.event_types:
             topic = AsyncWeb3.keccak(text=event_type.value)
             topics.append(topic)
-            self._topic_map[topic] = event_type.name
-        
-        
+            topic_map[topic] = event_type.name
+        self._topic_map = topic_map
         if not topics:
+            return None
+        return {
+            "address": CONTRACTS["tokenManager2"],
+            "topics": [topics]  # [[buy, sell]] for OR filter
+        }
+
+    def _parse(self, log: Dict[str, Any], creat_event: bool, as_record: bool):
+        """Parse a raw log, None if it is not wanted"""
+        # Get event name from topic0 (bytes lookup, no hex conversion)
+        event_name = self._topic_map.get(topic0(log))
+        if not event_name:
+            return None
+        if creat_event:
+            return parse_create_event(log,event_name,as_record)
+        event = parse_curve_event(log, event_name, as_record)
+        if event and self._match_token(event, as_record):
+            return event
+        return None
+
+    def buffered(
+        self,
+        maxsize: int = 1024,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        key: Optional[Callable[[Any], Hashable]] = None,
+        **events_kwargs
+    ) -> EventBuffer:
+        """Read `events(**events_kwargs)` into a bounded EventBuffer
+
+        The socket is read by a background task while the caller consumes
+        the buffer. `policy` decides what happens when it is full: "block",
+        "drop_oldest" or "coalesce" (newest event per token). Close it with
+        `await buffer.aclose()`.
+        """
+        return EventBuffer(maxsize, policy, key).feed(self.events(**events_kwargs))
+
+    async def events(
+        self,
+        creat_event:bool=False,
+        as_record: bool = False,
+        resilient: bool = False,
+        **resilient_options
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async iterator that yields parsed events (slotted records with `as_record`)
+
+        With `resilient` the stream reconnects after a drop and backfills the
+        missed blocks, delivering every event exactly once. The keyword
+        arguments of ResilientLogStream (backoff, max_retries,
+        start_position, ...) can be passed through.
+        """
+        filter_params = self._build_filter()
+        if filter_params is None:
+            return
+
+        if self.hub is not None:
+            if resilient:
+                raise ValueError("resilient mode is not supported on a StreamHub")
+            consumer = await self.hub.subscribe(filter_params, parse_log_record if as_record else parse_log)
+            self._subscription = consumer
+            try:
+                async for event in consumer:
+                    if not creat_event and not self._match_token(event, as_record):
+                        continue
+                    yield event
+            finally:
+                self._subscription = None
+                await consumer.close()
+            return
+
+        if resilient:
+            live = ResilientLogStream(self.ws_url, self._build_filter, **resilient_options)
+            self.resilient_stream = live
+            self._subscription = live
+            logs = live.logs()
+            try:
+                async for log in logs:
+                    event = self._parse(log, creat_event, as_record)
+                    if event:
+                        yield event
+            finally:
+                self._subscription = None
+                await logs.aclose()
             return
             
         # Connect and subscribe
         async with AsyncWeb3(WebSocketProvider(self.ws_url)) as w3:
             self._w3 = w3
+            subscription = LogSubscription(w3)
             
-            # Create filter
-            filter_params = {
-                "address": CONTRACTS["tokenManager2"],
-                "topics": [topics]  # [[buy, sell]] for OR filter
-            }
             # Subscribe
-            print('Subscribed')
-            self._subscription_id = await w3.eth.subscribe("logs", filter_params)
+            await subscription.update(filter_params)
+            self._subscription = subscription
+            logger.info(f"Subscribed to {self.ws_url}")
             
-            # Process events
-            async for payload in w3.socket.process_subscriptions():
-                if payload.get("subscription") != self._subscription_id:
-                    continue
-                    
-                log = payload.get("result")
-                if not log:
-                    continue
-                
-                # Determine event type from topic0
-                topic0 = log.get("topics", [])[0] if log.get("topics") else None
-                if not topic0:
-                    continue
+            try:
+                # Process events
+                async for payload in w3.socket.process_subscriptions():
+                    log = subscription.accept(payload)
+                    if log is None:
+                        continue
                     
-                # Convert to bytes if needed
-                if hasattr(topic0, 'hex'):
-                    topic0_bytes = topic0
-                else:
-                    topic0_bytes = bytes.fromhex(topic0.replace('0x', ''))
-                
-                # Get event name from topic
-                event_name = self._topic_map.get(topic0_bytes)
-                if not event_name:
-                    continue
-                # Parse and yield event
-                if not creat_event:
-                    event = parse_curve_event(log, event_name)
+                    # Parse and yield event
+                    event = self._parse(log, creat_event, as_record)
                     if event:
-                        # Filter by token address if specified
-                        if self.token_addresses:
-                            event_token = event.get('token', '').lower()
-                            if not any(addr.lower() == event_token for addr in self.token_addresses):
-                                continue
                         yield event
-                else:
-                    event = parse_create_event(log,event_name)
-                    if event:
-                        yield event
-            
-       
+            finally:
+                self._subscription = None
@@ -0,0 +1,414 @@
+"""
+Bytes-level decoding core for curve and swap logs
+
+Single-log parsers with O(1) topic dispatch, shared by CurveIndexer,
+CurveStream and DexStream, plus batch columnar decoders.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from eth_utils import keccak
+from web3 import Web3
+
+from .types import EventType, CurveTradeEvent, TokenCreateEvent, SwapEvent, LiquidityAddedEvent
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+
+# Columns holding small integers; everything else stays Python ints/str
+_SMALL_INT_COLUMNS = {"blockNumber", "logIndex", "launchTime"}
+
+
+def _as_bytes(value) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return bytes(value)
+
+
+def _as_int(value) -> int:
+    if isinstance(value, str):
+        return int(value, 16)
+    return int(value) if value is not None else 0
+
+
+@lru_cache(maxsize=65536)
+def _checksum(address_bytes: bytes) -> str:
+    return Web3.to_checksum_address(address_bytes)
+
+
+def _address(word: bytes, checksum: bool) -> str:
+    """Address from the last 20 bytes of a 32-byte word"""
+    address = word[-20:]
+    return _checksum(address) if checksum else "0x" + address.hex()
+
+
+def _word(data: memoryview, index: int) -> int:
+    return int.from_bytes(data[index * 32:(index + 1) * 32], "big")
+
+
+# ─────────────────────────────────────
+# Topic dispatch
+# ─────────────────────────────────────
+TOPIC_EVENTS: Dict[bytes, EventType] = {
+    keccak(text=event_type.value): event_type for event_type in EventType
+}
+
+
+def topic0(log: Dict[str, Any]) -> Optional[bytes]:
+    """First topic of a log as bytes (HexBytes is used as-is)"""
+    topics = log.get("topics")
+    if not topics:
+        return None
+    topic = topics[0]
+    return topic if isinstance(topic, bytes) else _as_bytes(topic)
+
+
+def event_type_of(log: Dict[str, Any]) -> Optional[EventType]:
+    return TOPIC_EVENTS.get(topic0(log))
+
+
+# ─────────────────────────────────────
+# Single-log parsers
+# ─────────────────────────────────────
+def parse_curve_log(log: Dict[str, Any], event_name: str, as_record: bool = False):
+    """Parse a TokenPurchase/TokenSale log (same output as parse_curve_event)"""
+    data = log.get("data")
+    if not data:
+        return None
+    data = memoryview(data if isinstance(data, bytes) else _as_bytes(data))
+    if len(data) < 256:
+        return None
+
+    if as_record:
+        return CurveTradeEvent(
+            event_name,
+            "0x" + data[44:64].hex(),
+            "0x" + _as_bytes(log.get("transactionHash")).hex(),
+            _word(data, 2),
+            _checksum(bytes(data[12:32])),
+            _word(data, 3),
+            _word(data, 4),
+            _word(data, 5),
+            _word(data, 6),
+            _word(data, 7)
+        )
+    return {
+        "eventName": event_name,
+        "trader": "0x" + data[44:64].hex(),
+        "transactionHash": "0x" + _as_bytes(log.get("transactionHash")).hex(),
+        "price": _word(data, 2),
+        "token": _checksum(bytes(data[12:32])),
+        "amount": _word(data, 3),
+        "cost": _word(data, 4),
+        "fee": _word(data, 5),
+        "offers": _word(data, 6),
+        "funds": _word(data, 7)
+    }
+
+
+def parse_create_log(log: Dict[str, Any], event_name: str, as_record: bool = False):
+    """Parse a TokenCreate log (same output as parse_create_event)"""
+    data = log.get("data")
+    if not data:
+        return None
+    data = memoryview(data if isinstance(data, bytes) else _as_bytes(data))
+    if len(data) < 256:
+        return None
+
+    tx_hash = log["transactionHash"]
+    tx_hash = tx_hash.hex() if hasattr(tx_hash, "hex") else tx_hash
+    if as_record:
+        return TokenCreateEvent(
+            event_name,
+            _checksum(bytes(data[12:32])),
+            tx_hash,
+            _checksum(bytes(data[44:64])),
+            _word(data, 5),
+            _word(data, 6),
+            _word(data, 7)
+        )
+    return {
+        "eventName": event_name,
+        "creator": _checksum(bytes(data[12:32])),
+        "transactionHash": tx_hash,
+        "token": _checksum(bytes(data[44:64])),
+        "totalSupply": _word(data, 5),
+        "launchTime": _word(data, 6),
+        "launchFee": _word(data, 7)
+    }
+
+
+def parse_swap_log(log: Dict[str, Any], event_name: str = "Swap", as_record: bool = False):
+    """Parse a PancakeSwap V2 Swap log (same output as parse_swap_event)"""
+    topics = log.get("topics") or []
+    data = log.get("data")
+    if len(topics) < 3 or not data:
+        return None
+    data = memoryview(data if isinstance(data, bytes) else _as_bytes(data))
+    if len(data) < 128:
+        return None
+
+    amount0_in, amount1_in = _word(data, 0), _word(data, 1)
+    amount0_out, amount1_out = _word(data, 2), _word(data, 3)
+    if amount1_in and amount0_out:
+        price = amount1_in / amount0_out
+    elif amount0_in and not amount1_in:
+        price = amount1_out / amount0_in
+    else:
+        return None
+
+    tx_hash = "0x" + _as_bytes(log.get("transactionHash")).hex()
+    pool = _checksum(_as_bytes(log.get("address")))
+    sender = _checksum(_as_bytes(topics[1])[12:32])
+    if as_record:
+        return SwapEvent(tx_hash, pool, sender, amount0_in, amount1_in, amount0_out, amount1_out, price)
+    return {
+        "eventName": "Swap",
+        "transactionHash": tx_hash,
+        "pool": pool,
+        "sender": sender,
+        "amount0In": amount0_in,
+        "amount1In": amount1_in,
+        "amount0Out": amount0_out,
+        "amount1Out": amount1_out,
+        "price": price
+    }
+
+
+def parse_liquidity_log(log: Dict[str, Any], event_name: str, as_record: bool = False):
+    """Parse a LiquidityAdded(base, offers, quote, funds) log"""
+    data = log.get("data")
+    if not data:
+        return None
+    data = memoryview(data if isinstance(data, bytes) else _as_bytes(data))
+    if len(data) < 128:
+        return None
+
+    tx_hash = "0x" + _as_bytes(log.get("transactionHash")).hex()
+    token = _checksum(bytes(data[12:32]))
+    quote = _checksum(bytes(data[76:96]))
+    if as_record:
+        return LiquidityAddedEvent(event_name, tx_hash, token, _word(data, 1), quote, _word(data, 3))
+    return {
+        "eventName": event_name,
+        "transactionHash": tx_hash,
+        "token": token,
+        "offers": _word(data, 1),
+        "quote": quote,
+        "funds": _word(data, 3)
+    }
+
+
+LogHandler = Callable[..., Any]
+
+_EVENT_HANDLERS: Dict[EventType, LogHandler] = {
+    EventType.MANAGER_1_CREATE: parse_create_log,
+    EventType.MANAGER_2_CREATE: parse_create_log,
+    EventType.MANAGER_2_BUY: parse_curve_log,
+    EventType.MANAGER_2_SELL: parse_curve_log,
+    EventType.MANAGER_2_LIQUIDITY_ADDED: parse_liquidity_log,
+    EventType.v2_SWAP: parse_swap_log,
+}
+
+# topic0 bytes -> (event name, handler)
+LOG_HANDLERS: Dict[bytes, Tuple[str, LogHandler]] = {
+    topic: (event_type.name, _EVENT_HANDLERS[event_type])
+    for topic, event_type in TOPIC_EVENTS.items()
+    if event_type in _EVENT_HANDLERS
+}
+
+
+def _topics_of(handler: LogHandler) -> Dict[bytes, str]:
+    """topic0 bytes -> event name of every event parsed by `handler`"""
+    return {topic: event_name for topic, (event_name, parser) in LOG_HANDLERS.items() if parser is handler}
+
+
+CURVE_TOPICS = _topics_of(parse_curve_log)
+CREATE_TOPICS = _topics_of(parse_create_log)
+SWAP_TOPICS = _topics_of(parse_swap_log)
+
+
+def parse_log(log: Dict[str, Any], as_record: bool = False):
+    """Parse any supported log, dispatching on topic0
+
+    Returns a dict, or a CurveTradeEvent/TokenCreateEvent/SwapEvent record
+    with `as_record`; None for unsupported or malformed logs.
+    """
+    entry = LOG_HANDLERS.get(topic0(log))
+    if entry is None:
+        return None
+    event_name, handler = entry
+    try:
+        return handler(log, event_name, as_record)
+    except Exception:
+        return None
+
+
+def parse_log_record(log: Dict[str, Any]):
+    """parse_log returning slotted records"""
+    return parse_log(log, True)
+
+
+# ─────────────────────────────────────
+# Worker-process decoding
+# ─────────────────────────────────────
+LogRow = Tuple[Tuple[bytes, ...], bytes, bytes, bytes]
+
+
+def log_row(log: Dict[str, Any]) -> LogRow:
+    """Minimal picklable form of a log: (topics, data, transactionHash, address)"""
+    return (
+        tuple(_as_bytes(topic) for topic in log.get("topics") or ()),
+        _as_bytes(log.get("data") or b""),
+        _as_bytes(log.get("transactionHash") or b""),
+        _as_bytes(log.get("address") or b"")
+    )
+
+
+def decode_rows(rows: Sequence[LogRow], as_record: bool = False) -> List[Any]:
+    """parse_log over log rows; runs in worker processes (results align with rows)"""
+    return [
+        parse_log({"topics": topics, "data": data, "transactionHash": tx_hash, "address": address}, as_record)
+        for topics, data, tx_hash, address in rows
+    ]
+
+
+# ─────────────────────────────────────
+# Batch columnar decoders
+# ─────────────────────────────────────
+def _columns(names: Sequence[str]) -> Dict[str, List[Any]]:
+    return {name: [] for name in names}
+
+
+def _finish(columns: Dict[str, List[Any]], as_numpy: bool) -> Dict[str, Any]:
+    if not as_numpy:
+        return columns
+    if np is None:
+        raise ImportError("as_numpy=True requires numpy to be installed")
+    return {
+        # uint256 values do not fit any fixed-width dtype
+        name: np.array(values, dtype=np.uint64 if name in _SMALL_INT_COLUMNS else object)
+        for name, values in columns.items()
+    }
+
+
+def _log_meta(log: Dict[str, Any], columns: Dict[str, List[Any]]):
+    columns["transactionHash"].append("0x" + _as_bytes(log["transactionHash"]).hex())
+    columns["blockNumber"].append(_as_int(log.get("blockNumber")))
+    columns["logIndex"].append(_as_int(log.get("logIndex")))
+
+
+CURVE_COLUMNS = (
+    "transactionHash", "blockNumber", "logIndex", "eventName",
+    "token", "trader", "price", "amount", "cost", "fee", "offers", "funds"
+)
+
+CREATE_COLUMNS = (
+    "transactionHash", "blockNumber", "logIndex",
+    "creator", "token", "totalSupply", "launchTime", "launchFee"
+)
+
+SWAP_COLUMNS = (
+    "transactionHash", "blockNumber", "logIndex",
+    "pool", "sender", "to", "amount0In", "amount1In", "amount0Out", "amount1Out"
+)
+
+
+def decode_curve_logs(
+    logs: Sequence[Dict[str, Any]],
+    as_numpy: bool = False,
+    checksum: bool = True
+) -> Dict[str, Any]:
+    """Decode TokenPurchase/TokenSale logs into columns
+
+    Logs of other events are skipped; `eventName` tells buys
+    (MANAGER_2_BUY) from sells (MANAGER_2_SELL).
+
+    Args:
+        logs: Raw logs from get_logs or a subscription
+        as_numpy: Return NumPy arrays instead of lists (requires numpy)
+        checksum: Checksum addresses (cached per address)
+
+    Returns:
+        Dict of column name -> values, one entry per decodable log
+    """
+    columns = _columns(CURVE_COLUMNS)
+    event_names = columns["eventName"]
+    token, trader = columns["token"], columns["trader"]
+    price, amount, cost = columns["price"], columns["amount"], columns["cost"]
+    fee, offers, funds = columns["fee"], columns["offers"], columns["funds"]
+
+    for log in logs:
+        event_name = CURVE_TOPICS.get(topic0(log))
+        if event_name is None:
+            continue
+        data = _as_bytes(log.get("data") or b"")
+        if len(data) < 256:
+            continue
+        _log_meta(log, columns)
+        event_names.append(event_name)
+        token.append(_address(data[0:32], checksum))
+        trader.append(_address(data[32:64], checksum))
+        price.append(int.from_bytes(data[64:96], "big"))
+        amount.append(int.from_bytes(data[96:128], "big"))
+        cost.append(int.from_bytes(data[128:160], "big"))
+        fee.append(int.from_bytes(data[160:192], "big"))
+        offers.append(int.from_bytes(data[192:224], "big"))
+        funds.append(int.from_bytes(data[224:256], "big"))
+    return _finish(columns, as_numpy)
+
+
+def decode_create_logs(
+    logs: Sequence[Dict[str, Any]],
+    as_numpy: bool = False,
+    checksum: bool = True
+) -> Dict[str, Any]:
+    """Decode TokenCreate logs into columns (same fields as parse_create_event)"""
+    columns = _columns(CREATE_COLUMNS)
+    creator, token = columns["creator"], columns["token"]
+    total_supply, launch_time, launch_fee = columns["totalSupply"], columns["launchTime"], columns["launchFee"]
+
+    for log in logs:
+        if topic0(log) not in CREATE_TOPICS:
+            continue
+        data = _as_bytes(log.get("data") or b"")
+        if len(data) < 256:
+            continue
+        _log_meta(log, columns)
+        creator.append(_address(data[0:32], checksum))
+        token.append(_address(data[32:64], checksum))
+        total_supply.append(int.from_bytes(data[160:192], "big"))
+        launch_time.append(int.from_bytes(data[192:224], "big"))
+        launch_fee.append(int.from_bytes(data[224:256], "big"))
+    return _finish(columns, as_numpy)
+
+
+def decode_swap_logs(
+    logs: Sequence[Dict[str, Any]],
+    as_numpy: bool = False,
+    checksum: bool = True
+) -> Dict[str, Any]:
+    """Decode PancakeSwap V2 Swap logs into columns"""
+    columns = _columns(SWAP_COLUMNS)
+    pool, sender, to = columns["pool"], columns["sender"], columns["to"]
+    amount0_in, amount1_in = columns["amount0In"], columns["amount1In"]
+    amount0_out, amount1_out = columns["amount0Out"], columns["amount1Out"]
+
+    for log in logs:
+        topics = log.get("topics") or []
+        data = _as_bytes(log.get("data") or b"")
+        if len(topics) < 3 or len(data) < 128 or topic0(log) not in SWAP_TOPICS:
+            continue
+        _log_meta(log, columns)
+        pool.append(_address(_as_bytes(log["address"]), checksum))
+        sender.append(_address(_as_bytes(topics[1]), checksum))
+        to.append(_address(_as_bytes(topics[2]), checksum))
+        amount0_in.append(int.from_bytes(data[0:32], "big"))
+        amount1_in.append(int.from_bytes(data[32:64], "big"))
+        amount0_out.append(int.from_bytes(data[64:96], "big"))
+        amount1_out.append(int.from_bytes(data[96:128], "big"))
+    return _finish(columns, as_numpy)
@@ -1,24 +1,54 @@
 import asyncio
 import json
 import os
-from typing import List, AsyncIterator, Optional, Dict, Any
+from typing import List, AsyncIterator, Optional, Dict, Any, Set, Union, Callable, Hashable
 from web3 import AsyncWeb3,AsyncHTTPProvider, WebSocketProvider, Web3
 
 from .parser import parse_swap_event
 from ..types import EventType
-from ...Utils import load_abis
+from ..subscription import LogSubscription
+from ..hub import StreamHub
+from ..resilient import ResilientLogStream
+from ..buffer import EventBuffer, OverflowPolicy
+from ..decoder import parse_log, parse_log_record, parse_liquidity_log, topic0
+from ...Utils import find_pairs, get_pair_address, PairCache
 from ...constants import CONTRACTS,WBNB
+from ...quoter import PairReserveMirror
+
+LIQUIDITY_ADDED_TOPIC = Web3.keccak(text=EventType.MANAGER_2_LIQUIDITY_ADDED.value)
 
 
 
 class DexStream:
-    def __init__(self,http_url:str, ws_url: str):
+    def __init__(
+        self,
+        http_url:str,
+        ws_url: str,
+        reserve_mirror: Optional[PairReserveMirror] = None,
+        hub: Optional[StreamHub] = None,
+        pair_cache: Optional[Union[PairCache, str]] = None
+    ):
         self.ws_url = ws_url
+        # token -> pair cache on disk (JSON path or PairCache)
+        self.pair_cache = PairCache(pair_cache) if isinstance(pair_cache, str) else pair_cache
+        self.hub = hub  # optional shared WebSocket
         self.w3 = AsyncWeb3(AsyncHTTPProvider(http_url))
         self.token_addresses: List[str] = []
         self.pool_addresses: List[str] = []
-        self._subscription_id: Optional[str] = None
+        self._pools: Dict[str, str] = {}  # lowercase token -> pool
+        self._subscription: Optional[LogSubscription] = None
+        self.resilient_stream: Optional[ResilientLogStream] = None
         self.event_types: List[EventType] = []
+
+        # Optional local reserve cache, kept current from Sync logs
+        self.reserve_mirror = reserve_mirror
+
+        # Migration watching (see watch_migrations)
+        self._migrations = False
+        self._enroll_all = False
+        self._pending: Set[str] = set()  # lowercase curve tokens without a pool yet
+        self.poll_interval: Optional[float] = None
+        self._tasks: Set[asyncio.Task] = set()
         
     def subscribe_tokens(self, token_addresses, event_types: List[EventType] = None):
         """Set which tokens to monitor (will find pools automatically)"""
@@ -26,82 +56,337 @@ class DexStream:
         if isinstance(token_addresses, str):
             token_addresses = [token_addresses]
         self.token_addresses = [Web3.to_checksum_address(addr) for addr in token_addresses]
+        self._pools = {}
         if event_types is None:
             event_types = [EventType.v2_SWAP]
         self.event_types = event_types
+
+    def watch_migrations(self, tokens: Optional[List[str]] = None, poll_interval: Optional[float] = None):
+        """Enroll pools of tokens as they migrate off the bonding curve
+
+        The stream also listens to tokenManager2 `LiquidityAdded` and, when a
+        watched token migrates, adds its pair to the live subscription in
+        place. Subscribed tokens that have no pool yet are watched too.
+
+        Args:
+            tokens: Curve tokens to enroll once they migrate (None = every
+                token that migrates)
+            poll_interval: Also check the pairs of pending tokens every N
+                seconds with one multicall (covers missed events)
+        """
+        self._migrations = True
+        self._enroll_all = tokens is None
+        if isinstance(tokens, str):
+            tokens = [tokens]
+        for token in tokens or []:
+            if token.lower() not in self._pools:
+                self._pending.add(token.lower())
+        self.poll_interval = poll_interval
+
+    @property
+    def pending_tokens(self) -> List[str]:
+        """Watched curve tokens that have not migrated yet"""
+        return [Web3.to_checksum_address(token) for token in self._pending]
+
+    async def add_tokens(self, token_addresses):
+        """Watch more tokens; a live stream resubscribes in place with their pools"""
+        if isinstance(token_addresses, str):
+            token_addresses = [token_addresses]
+        known = {addr.lower() for addr in self.token_addresses}
+        new_tokens = []
+        for addr in token_addresses:
+            if addr.lower() not in known:
+                known.add(addr.lower())
+                new_tokens.append(Web3.to_checksum_address(addr))
+        self.token_addresses.extend(new_tokens)
+
+        if self._subscription is not None and new_tokens:
+            await self._discover_pools(self.w3, new_tokens)
+            await self._resubscribe()
+
+    async def remove_tokens(self, token_addresses):
+        """Stop watching tokens; a live stream resubscribes in place without their pools"""
+        if isinstance(token_addresses, str):
+            token_addresses = [token_addresses]
+        removed = {addr.lower() for addr in token_addresses}
+        self.token_addresses = [addr for addr in self.token_addresses if addr.lower() not in removed]
+        for token in removed:
+            self._pools.pop(token, None)
+            self._pending.discard(token)
+
+        if self._subscription is not None:
+            await self._resubscribe()
         
-    async def _discover_pools(self, w3: AsyncWeb3) -> List[str]:
-        """Discover V3 pools for configured tokens"""
-        if not self.token_addresses:
+    async def _discover_pools(self, w3: AsyncWeb3, tokens: Optional[List[str]] = None) -> List[str]:
+        """Discover V2 pools for configured tokens
+
+        Pair addresses are derived offline (CREATE2). Cached pairs are used
+        as-is, the rest are checked for existence in one multicall and
+        existing ones are added to the pair cache.
+        """
+        tokens = self.token_addresses if tokens is None else tokens
+        wbnb = WBNB.lower()
+        tokens = [token for token in tokens if token.lower() != wbnb]
+        if not tokens:
             return []
-        
-        abis = load_abis()
-        # Loading Factory contract
-        factory = w3.eth.contract(
-            address=Web3.to_checksum_address(CONTRACTS["v2_factory"]),
-            abi=abis['v2_factory']
-        )
-        
-        wbnb = Web3.to_checksum_address(WBNB)
-        pools = []
-        
-        for token in self.token_addresses:
-            if token.lower() == wbnb.lower():
-                continue
-            
+
+        found: Dict[str, str] = {}
+        unknown = []
+        for token in tokens:
+            cached = self.pair_cache.get(token) if self.pair_cache is not None else None
+            if cached:
+                found[token] = cached
+            else:
+                unknown.append(token)
+
+        if unknown:
             try:
-                # Sort tokens for pool address calculation
-                token0, token1 = (token, wbnb) if token.lower() < wbnb.lower() else (wbnb, token)
-                
-                # Get pool address 
-                pool_address = await factory.functions.getPair(
-                    token0,
-                    token1
-                ).call()
-                
-                if pool_address and pool_address != "0x0000000000000000000000000000000000000000":
-                    pools.append(pool_address)
-                    pass
+                checked = await find_pairs(w3, unknown)
             except Exception as e:
-                pass
+                checked = {}
+            new_pairs = {token: pair for token, pair in checked.items() if pair}
+            found.update(new_pairs)
+            if self._migrations:
+                self._pending.update(token.lower() for token, pair in checked.items() if not pair)
+            if self.pair_cache is not None and new_pairs:
+                self.pair_cache.update(new_pairs)
+
+        pools = []
+        for token, pool_address in found.items():
+            pools.append(pool_address)
+            self._pools[token.lower()] = pool_address
+            self._pending.discard(token.lower())
+        await self._mirror_pairs(w3, found)
         
+        self.pool_addresses = list(dict.fromkeys(self._pools.values()))
         return pools
-    
 
+    def _build_filter(self) -> Optional[Dict[str, Any]]:
+        """Logs filter for the current pools, None when there is nothing to watch"""
+        # Swap event signature
+        swap_topic = Web3.keccak(text=EventType.v2_SWAP.value)
+        sync_topic = Web3.keccak(text=EventType.v2_SYNC.value)
+
+        addresses = list(self.pool_addresses)  # Multiple pool addresses
+        topics = [swap_topic]  # Just swap events
+        # Sync logs only feed the reserve mirror, they are not yielded
+        if self.reserve_mirror is not None:
+            topics.append(sync_topic)
+        # LiquidityAdded only comes from tokenManager2, swaps only from pools
+        if self._migrations:
+            addresses.append(CONTRACTS["tokenManager2"])
+            topics.append(LIQUIDITY_ADDED_TOPIC)
+        if not addresses:
+            return None
+        
+        # Create filter
+        return {
+            "address": addresses,
+            "topics": [topics]
+        }
+
+    async def _mirror_pairs(self, w3: AsyncWeb3, pairs: Dict[str, str]):
+        """Track new WBNB pairs in the reserve mirror, seeding them in one multicall"""
+        mirror = self.reserve_mirror
+        if mirror is None:
+            return
+        new_pairs = {token: pair for token, pair in pairs.items() if mirror.pair_of(token) is None}
+        if not new_pairs:
+            return
+        try:
+            await mirror.load(w3, list(new_pairs))
+        except Exception:
+            pass  # seeded by their next Sync log instead
+        for token, pair in new_pairs.items():
+            if mirror.pair_of(token) is None:
+                mirror.add_pair(token, pair)
+
+    async def _resubscribe(self):
+        self.pool_addresses = list(dict.fromkeys(self._pools.values()))
+        if self._subscription is not None:
+            await self._subscription.update(self._build_filter())
+
+    # ─────────────────────────────────────
+    # Migration enrollment
+    # ─────────────────────────────────────
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _on_liquidity_added(self, log: Dict[str, Any]):
+        event = parse_liquidity_log(log, EventType.MANAGER_2_LIQUIDITY_ADDED.name)
+        if event is None:
+            return
+        token = event["token"]
+        if token.lower() in self._pools:
+            return
+        if not self._enroll_all and token.lower() not in self._pending:
+            return
+        quote = event["quote"] if int(event["quote"], 16) else WBNB
+        self._spawn(self._enroll({token: get_pair_address(token, quote)}, quote))
+
+    async def _enroll(self, pairs: Dict[str, str], quote: str = WBNB):
+        """Add migrated tokens and their pairs, then resubscribe in place"""
+        is_wbnb = quote.lower() == WBNB.lower()
+        known = {addr.lower() for addr in self.token_addresses}
+        for token, pool_address in pairs.items():
+            key = token.lower()
+            self._pending.discard(key)
+            if key not in known:
+                known.add(key)
+                self.token_addresses.append(Web3.to_checksum_address(token))
+            self._pools[key] = pool_address
+        if is_wbnb:
+            await self._mirror_pairs(self.w3, pairs)
+            if self.pair_cache is not None:
+                self.pair_cache.update(pairs)
+        await self._resubscribe()
+
+    async def _poll_migrations(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._pending:
+                continue
+            try:
+                found = await find_pairs(self.w3, list(self._pending))
+            except Exception:
+                continue
+            migrated = {token: pair for token, pair in found.items() if pair}
+            if migrated:
+                await self._enroll(migrated)
+
+    # ─────────────────────────────────────
+    # Event sources
+    # ─────────────────────────────────────
+    def _handle_log(self, log: Dict[str, Any], as_record: bool):
+        """Sync -> reserve mirror, LiquidityAdded -> enrollment, Swap -> event"""
+        if self.reserve_mirror is not None and self.reserve_mirror.apply_log(log):
+            return None
+        if self._migrations and topic0(log) == LIQUIDITY_ADDED_TOPIC:
+            self._on_liquidity_added(log)
+            return None
+        return parse_swap_event(log, as_record)
+
+    def _decode_log(self, log: Dict[str, Any]):
+        """Hub decoder for streams with a reserve mirror or migration watching"""
+        return self._handle_log(log, False)
+
+    def _decode_record(self, log: Dict[str, Any]):
+        return self._handle_log(log, True)
+
+    async def _hub_events(self, as_record: bool) -> AsyncIterator[Dict[str, Any]]:
+        await self._discover_pools(self.w3)
+        filter_params = self._build_filter()
+        if filter_params is None:
+            return
+
+        if self.reserve_mirror is not None or self._migrations:
+            decoder = self._decode_record if as_record else self._decode_log
+        else:
+            decoder = parse_log_record if as_record else parse_log
+        consumer = await self.hub.subscribe(filter_params, decoder)
+        self._subscription = consumer
+        try:
+            async for event in consumer:
+                yield event
+        finally:
+            self._subscription = None
+            await consumer.close()
 
-    async def events(self) -> AsyncIterator[Dict[str, Any]]:
-        """Async iterator that yields parsed swap events"""
+    async def _on_connect(self, w3: AsyncWeb3):
+        self.w3 = w3
+        # Pools are discovered once, reconnects keep the current set
+        if not self._pools:
+            await self._discover_pools(w3)
+
+    async def _resilient_events(self, as_record: bool, **options) -> AsyncIterator[Dict[str, Any]]:
+        live = ResilientLogStream(self.ws_url, self._build_filter, on_connect=self._on_connect, **options)
+        self.resilient_stream = live
+        self._subscription = live
+        logs = live.logs()
+        try:
+            async for log in logs:
+                event = self._handle_log(log, as_record)
+                if event:
+                    yield event
+        finally:
+            self._subscription = None
+            await logs.aclose()
+
+    async def _direct_events(self, as_record: bool) -> AsyncIterator[Dict[str, Any]]:
         # Connect
         async with AsyncWeb3(WebSocketProvider(self.ws_url)) as w3:
             self.w3 = w3
             # Discover pools
-            self.pool_addresses = await self._discover_pools(self.w3)
+            await self._discover_pools(self.w3)
             
-            if not self.pool_addresses:
+            filter_params = self._build_filter()
+            if filter_params is None:
                 return 
             
-            # Swap event signature
-            swap_topic = Web3.keccak(text=EventType.v2_SWAP.value)
-            
-            # Create filter
-            filter_params = {
-                "address": self.pool_addresses,  # Multiple pool addresses
-                "topics": [[swap_topic]]  # Just swap events
-            }
-            
             # Subscribe
-            self._subscription_id = await self.w3.eth.subscribe("logs", filter_params)
+            subscription = LogSubscription(w3)
+            await subscription.update(filter_params)
+            self._subscription = subscription
             
-            # Process events
-            async for payload in self.w3.socket.process_subscriptions():
-                if payload.get("subscription") != self._subscription_id:
-                    continue
+            try:
+                # Process events
+                async for payload in self.w3.socket.process_subscriptions():
+                    log = subscription.accept(payload)
+                    if log is None:
+                        continue
                     
-                log = payload.get("result")
-                if not log:
-                    continue
-                
-                # Parse and yield event
-                event = parse_swap_event(log)
-                if event:
-                    yield event
+                    # Parse and yield event
+                    event = self._handle_log(log, as_record)
+                    if event:
+                        yield event
+            finally:
+                self._subscription = None
+
+    def buffered(
+        self,
+        maxsize: int = 1024,
+        policy: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        key: Optional[Callable[[Any], Hashable]] = None,
+        **events_kwargs
+    ) -> EventBuffer:
+        """Read `events(**events_kwargs)` into a bounded EventBuffer
+
+        The socket is read by a background task while the caller consumes
+        the buffer. `policy` decides what happens when it is full: "block",
+        "drop_oldest" or "coalesce" (newest event per token). Close it with
+        `await buffer.aclose()`.
+        """
+        return EventBuffer(maxsize, policy, key).feed(self.events(**events_kwargs))
+
+    async def events(
+        self,
+        as_record: bool = False,
+        resilient: bool = False,
+        **resilient_options
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async iterator that yields parsed swap events (SwapEvent records with `as_record`)
+
+        With `resilient` the stream reconnects after a drop and backfills the
+        missed blocks; see CurveStream.events.
+        """
+        if self.hub is not None:
+            if resilient:
+                raise ValueError("resilient mode is not supported on a StreamHub")
+            source = self._hub_events(as_record)
+        elif resilient:
+            source = self._resilient_events(as_record, **resilient_options)
+        else:
+            source = self._direct_events(as_record)
+
+        poller = None
+        if self._migrations and self.poll_interval:
+            poller = asyncio.create_task(self._poll_migrations())
+        try:
+            async for event in source:
+                yield event
+        finally:
+            if poller is not None:
+                poller.cancel()
+            await source.aclose()
@@ -0,0 +1,341 @@
+"""
+One WebSocket per endpoint shared by many stream consumers
+"""
+import asyncio
+import weakref
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from web3 import AsyncWeb3, WebSocketProvider
+
+from .decoder import parse_log
+from .subscription import RecentLogs, log_key
+
+Decoder = Callable[[Dict[str, Any]], Any]
+
+_CLOSED = object()
+
+# Events a consumer may fall behind by before its oldest are dropped
+DEFAULT_QUEUE_SIZE = 10_000
+
+
+def _topic_hex(topic) -> str:
+    if isinstance(topic, (bytes, bytearray)):
+        return "0x" + bytes(topic).hex()
+    topic = topic.lower()
+    return topic if topic.startswith("0x") else "0x" + topic
+
+
+def normalize_filter(filter_params: Dict[str, Any]) -> Hashable:
+    """Hashable form of a logs filter; equivalent filters give equal keys"""
+    address = filter_params.get("address")
+    if address is None:
+        addresses = None
+    elif isinstance(address, str):
+        addresses = (address.lower(),)
+    else:
+        addresses = tuple(sorted({addr.lower() for addr in address}))
+
+    topics = []
+    for topic in filter_params.get("topics") or []:
+        if topic is None:
+            topics.append(None)
+        elif isinstance(topic, (list, tuple)):
+            topics.append(tuple(sorted({_topic_hex(t) for t in topic})))
+        else:
+            topics.append((_topic_hex(topic),))
+    while topics and topics[-1] is None:
+        topics.pop()
+    return addresses, tuple(topics)
+
+
+class _Route:
+    """One node subscription and the consumers fed from it"""
+
+    def __init__(self, key: Hashable, subscription_id: str):
+        self.key = key
+        self.subscription_id = subscription_id
+        self.groups: Dict[Decoder, List["HubConsumer"]] = {}
+
+
+class HubConsumer:
+    """Async iterator over the decoded events of one hub subscription
+
+    The hub never waits for a consumer: events queue up to `queue_size`
+    and then the oldest is dropped (counted in `dropped`). Wrap the stream
+    in an EventBuffer (`stream.buffered()`) for other overflow policies.
+    """
+
+    def __init__(self, hub: "StreamHub", decoder: Decoder, queue_size: int = DEFAULT_QUEUE_SIZE):
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        self.hub = hub
+        self.decoder = decoder
+        self._queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._route: Optional[_Route] = None
+        self._recent: Optional[RecentLogs] = None
+        self.closed = False
+        self.dropped = 0
+
+    def _put(self, item: Any):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(item)
+
+    def _deliver(self, item: Tuple[Tuple[bytes, int], Any]):
+        self._put(item)
+
+    def _end(self):
+        self.closed = True
+        self._put(_CLOSED)
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        while True:
+            item = await self._queue.get()
+            if item is _CLOSED:
+                return
+            key, event = item
+            # Only after a filter switch can the same log arrive twice
+            if self._recent is not None and not self._recent.add(key):
+                continue
+            yield event
+
+    async def update(self, filter_params: Optional[Dict[str, Any]]):
+        """Move to another filter without closing the iterator (None pauses)"""
+        await self.hub._move(self, filter_params)
+
+    async def close(self):
+        """Leave the hub and end the iterator"""
+        if not self.closed:
+            await self.hub._detach(self)
+            self._end()
+
+
+class StreamHub:
+    """Shares one WebSocket between many CurveStream/DexStream consumers
+
+    Every distinct filter is subscribed once on the node. Each log is decoded
+    once per decoder and handed to every consumer of that (filter, decoder)
+    pair, so connections, bandwidth and decoding scale with the number of
+    distinct filters rather than with the number of consumers.
+
+    Only equal filters share a node subscription (same addresses and topics,
+    in any order). Overlapping filters, e.g. one pool and a set of pools
+    containing it, are subscribed separately and the shared logs are sent
+    twice.
+    """
+
+    def __init__(self, ws_url: str, pending_size: int = 1024, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """Initialize hub
+
+        Args:
+            ws_url: WebSocket RPC endpoint URL
+            pending_size: Payloads kept for subscriptions whose id is not
+                registered yet (notifications can beat the subscribe reply)
+            queue_size: Default number of events a consumer may fall behind
+                by before its oldest events are dropped
+        """
+        self.ws_url = ws_url
+        self.queue_size = queue_size
+        self.w3: Optional[AsyncWeb3] = None
+        self._routes: Dict[Hashable, _Route] = {}
+        self._by_id: Dict[str, _Route] = {}
+        self._pending: Deque[Dict[str, Any]] = deque(maxlen=pending_size)
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "StreamHub":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def connected(self) -> bool:
+        return self._reader is not None and not self._reader.done()
+
+    async def connect(self):
+        """Open the WebSocket (no-op while connected)"""
+        async with self._lock:
+            if self.connected:
+                return
+            w3 = AsyncWeb3(WebSocketProvider(self.ws_url))
+            await w3.provider.connect()
+            self.w3 = w3
+            self._routes.clear()
+            self._by_id.clear()
+            self._pending.clear()
+            self._reader = asyncio.create_task(self._read())
+
+    async def close(self):
+        """Close the WebSocket and end every consumer"""
+        reader, self._reader = self._reader, None
+        if reader is not None:
+            reader.cancel()
+            try:
+                await reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self.w3 is not None:
+            try:
+                await self.w3.provider.disconnect()
+            except Exception:
+                pass
+        self._end_all()
+
+    async def subscribe(
+        self,
+        filter_params: Dict[str, Any],
+        decoder: Decoder = parse_log,
+        queue_size: Optional[int] = None
+    ) -> HubConsumer:
+        """Add a consumer for a logs filter
+
+        Args:
+            filter_params: eth_subscribe logs filter ({address, topics})
+            decoder: Function turning a raw log into an event (None skips the
+                log); consumers sharing a filter and decoder share the result
+            queue_size: Events the consumer may fall behind by before the
+                oldest are dropped (default: the hub's queue_size)
+
+        Returns:
+            HubConsumer to iterate with `async for`
+        """
+        await self.connect()
+        consumer = HubConsumer(self, decoder, queue_size or self.queue_size)
+        await self._attach(consumer, filter_params)
+        return consumer
+
+    @property
+    def subscription_count(self) -> int:
+        """Number of node subscriptions currently open"""
+        return len(self._routes)
+
+    # ─────────────────────────────────────
+    # Routing
+    # ─────────────────────────────────────
+    async def _attach(self, consumer: HubConsumer, filter_params: Dict[str, Any]):
+        key = normalize_filter(filter_params)
+        async with self._lock:
+            route = self._routes.get(key)
+            if route is None:
+                subscription_id = await self.w3.eth.subscribe("logs", filter_params)
+                route = _Route(key, subscription_id)
+                self._routes[key] = route
+                self._by_id[subscription_id] = route
+            route.groups.setdefault(consumer.decoder, []).append(consumer)
+            consumer._route = route
+            self._flush_pending(route)
+
+    async def _detach(self, consumer: HubConsumer):
+        route, consumer._route = consumer._route, None
+        if route is not None:
+            await self._leave(consumer, route)
+
+    async def _leave(self, consumer: HubConsumer, route: _Route):
+        async with self._lock:
+            group = route.groups.get(consumer.decoder, [])
+            if consumer in group:
+                group.remove(consumer)
+            if not group:
+                route.groups.pop(consumer.decoder, None)
+            if route.groups or self._routes.get(route.key) is not route:
+                return
+
+            # Last consumer left, drop the node subscription
+            del self._routes[route.key]
+            self._by_id.pop(route.subscription_id, None)
+            if self.connected:
+                try:
+                    await self.w3.eth.unsubscribe(route.subscription_id)
+                except Exception:
+                    pass
+
+    async def _move(self, consumer: HubConsumer, filter_params: Optional[Dict[str, Any]]):
+        old_route = consumer._route
+        if filter_params is None:
+            await self._detach(consumer)
+            return
+        if old_route is not None and old_route.key == normalize_filter(filter_params):
+            return
+        if old_route is not None and consumer._recent is None:
+            consumer._recent = RecentLogs()
+
+        # Join the new route before leaving the old one so nothing is missed
+        await self._attach(consumer, filter_params)
+        if old_route is not None:
+            await self._leave(consumer, old_route)
+
+    def _flush_pending(self, route: _Route):
+        if not self._pending:
+            return
+        waiting = [payload for payload in self._pending if payload.get("subscription") == route.subscription_id]
+        if not waiting:
+            return
+        self._pending = deque(
+            (payload for payload in self._pending if payload.get("subscription") != route.subscription_id),
+            maxlen=self._pending.maxlen
+        )
+        for payload in waiting:
+            self._dispatch(route, payload.get("result"))
+
+    def _dispatch(self, route: _Route, log: Optional[Dict[str, Any]]):
+        if not log:
+            return
+        key = log_key(log)
+        for decoder, consumers in list(route.groups.items()):
+            try:
+                event = decoder(log)
+            except Exception:
+                event = None
+            if event is None:
+                continue
+            item = (key, event)
+            for consumer in consumers:
+                consumer._deliver(item)
+
+    async def _read(self):
+        try:
+            async for payload in self.w3.socket.process_subscriptions():
+                route = self._by_id.get(payload.get("subscription"))
+                if route is None:
+                    self._pending.append(payload)
+                    continue
+                self._dispatch(route, payload.get("result"))
+        finally:
+            self._end_all()
+
+    def _end_all(self):
+        consumers = {
+            id(consumer): consumer
+            for route in self._routes.values()
+            for group in route.groups.values()
+            for consumer in group
+        }
+        self._routes.clear()
+        self._by_id.clear()
+        for consumer in consumers.values():
+            consumer._route = None
+            if not consumer.closed:
+                consumer._end()
+
+
+# One hub per endpoint per event loop
+_HUBS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, StreamHub]]" = weakref.WeakKeyDictionary()
+
+
+def get_stream_hub(ws_url: str) -> StreamHub:
+    """Shared StreamHub for a WebSocket endpoint on the running event loop"""
+    loop = asyncio.get_running_loop()
+    hubs = _HUBS.get(loop)
+    if hubs is None:
+        hubs = _HUBS[loop] = {}
+    hub = hubs.get(ws_url)
+    if hub is None:
+        hub = hubs[ws_url] = StreamHub(ws_url)
+    return hub
@@ -0,0 +1,140 @@
+"""
+Reconnecting log subscription with gap backfill
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from web3 import AsyncWeb3, WebSocketProvider
+
+from .scanner import LogScanner, log_position
+from .subscription import LogSubscription, RecentLogs, log_key
+
+logger = logging.getLogger(__name__)
+
+
+class ResilientLogStream:
+    """Live logs that survive WebSocket drops
+
+    The position (block, logIndex) of the last delivered log is tracked,
+    starting after the chain head of the first subscribe. After a reconnect the stream resubscribes and then backfills from that block to
+    the chain head with get_logs (through LogScanner, like CurveIndexer), so
+    the logs emitted while disconnected are still delivered. Logs that show
+    up both in the backfill and on the new subscription are delivered once,
+    by (txHash, logIndex).
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        build_filter: Callable[[], Optional[Dict[str, Any]]],
+        on_connect: Optional[Callable[[AsyncWeb3], Awaitable[None]]] = None,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        max_retries: Optional[int] = None,
+        dedupe_size: int = 4096,
+        start_position: Optional[Tuple[int, int]] = None
+    ):
+        """Initialize stream
+
+        Args:
+            ws_url: WebSocket RPC endpoint URL
+            build_filter: Returns the current logs filter ({address, topics}),
+                called on every (re)connect; None ends the stream
+            on_connect: Optional coroutine run with the new AsyncWeb3 before
+                the filter is built (e.g. pool discovery)
+            initial_backoff: Seconds to wait before the first reconnect
+            max_backoff: Upper bound of the exponential reconnect delay
+            max_retries: Consecutive failed connects before giving up (None = forever)
+            dedupe_size: Number of recent (txHash, logIndex) keys remembered
+            start_position: (block, logIndex) already processed; logs after it
+                are backfilled on the first connect
+        """
+        self.ws_url = ws_url
+        self.build_filter = build_filter
+        self.on_connect = on_connect
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self.last_position = start_position
+        self.reconnects = 0
+        self.subscription: Optional[LogSubscription] = None
+        self._recent = RecentLogs(dedupe_size)
+
+    async def update(self, filter_params: Optional[Dict[str, Any]]):
+        """Swap the filter of the live subscription in place"""
+        if self.subscription is not None:
+            await self.subscription.update(filter_params)
+
+    def _accept(self, log: Dict[str, Any]) -> bool:
+        if log.get("removed") or not self._recent.add(log_key(log)):
+            return False
+        position = log_position(log)
+        if self.last_position is None or position > self.last_position:
+            self.last_position = position
+        return True
+
+    async def _backfill(self, w3: AsyncWeb3, filter_params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        head = await w3.eth.get_block_number()
+        from_block = self.last_position[0]
+        if from_block > head:
+            return
+        windows = LogScanner(w3).scan(filter_params, from_block, head)
+        try:
+            async for _, _, logs in windows:
+                for log in logs:
+                    if log_position(log) <= self.last_position:
+                        continue
+                    yield log
+        finally:
+            await windows.aclose()
+
+    async def logs(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield raw logs in delivery order, reconnecting until closed"""
+        failures = 0
+        while True:
+            connected = False
+            try:
+                async with AsyncWeb3(WebSocketProvider(self.ws_url)) as w3:
+                    if self.on_connect is not None:
+                        await self.on_connect(w3)
+                    filter_params = self.build_filter()
+                    if filter_params is None:
+                        return
+
+                    # Subscribe first so nothing falls between backfill and live
+                    subscription = LogSubscription(w3)
+                    await subscription.update(filter_params)
+                    self.subscription = subscription
+                    connected = True
+                    failures = 0
+
+                    if self.last_position is None:
+                        # Fresh stream: blocks up to the head predate it, later
+                        # ones are live or backfilled after the first outage
+                        head = await w3.eth.get_block_number()
+                        self.last_position = (head + 1, -1)
+                    else:
+                        async for log in self._backfill(w3, filter_params):
+                            if self._accept(log):
+                                yield log
+
+                    async for payload in w3.socket.process_subscriptions():
+                        log = subscription.accept(payload)
+                        if log is not None and self._accept(log):
+                            yield log
+            except (asyncio.CancelledError, GeneratorExit):
+                raise
+            except Exception as e:
+                if not connected:
+                    failures += 1
+                    if self.max_retries is not None and failures > self.max_retries:
+                        raise RuntimeError(f"Failed to reconnect to {self.ws_url}: {e}")
+                logger.warning(f"Stream disconnected ({e}), reconnecting")
+            finally:
+                self.subscription = None
+
+            # Connection ended (error or server close), back off and reconnect
+            self.reconnects += 1
+            delay = min(self.max_backoff, self.initial_backoff * 2 ** max(failures - 1, 0))
+            await asyncio.sleep(delay)
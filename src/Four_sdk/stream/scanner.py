@@ -0,0 +1,164 @@
+"""
+Concurrent, adaptively chunked eth_getLogs scanner
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Tuple
+
+from web3 import AsyncWeb3
+
+
+DEFAULT_CHUNK_SIZE = 1000
+MIN_CHUNK_SIZE = 100
+MAX_CHUNK_SIZE = 5000
+
+# Window size is tuned so that one get_logs call returns about this many logs
+TARGET_LOGS_PER_CHUNK = 2000
+
+
+def log_position(log: Dict[str, Any]) -> Tuple[int, int]:
+    """Sort key placing a log by block number and log index"""
+    block_number = log["blockNumber"]
+    log_index = log["logIndex"]
+    if isinstance(block_number, str):
+        block_number = int(block_number, 16)
+    if isinstance(log_index, str):
+        log_index = int(log_index, 16)
+    return block_number, log_index
+
+
+class ChunkSizer:
+    """Block window size that follows the observed log density"""
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        min_chunk_size: int = MIN_CHUNK_SIZE,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+        target_logs: int = TARGET_LOGS_PER_CHUNK
+    ):
+        if not 1 <= min_chunk_size <= max_chunk_size:
+            raise ValueError("chunk size bounds must satisfy 1 <= min <= max")
+        self.min_size = min_chunk_size
+        self.max_size = max_chunk_size
+        self.target_logs = target_logs
+        self.size = self._clamp(chunk_size)
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    def record(self, span: int, log_count: int):
+        """Adjust the size after a window of `span` blocks returned `log_count` logs"""
+        if log_count == 0:
+            self.size = self._clamp(self.size * 2)
+            return
+        ideal = span * self.target_logs // log_count
+        # Grow at most 2x per window, shrink straight to the ideal size
+        self.size = self._clamp(min(ideal, self.size * 2))
+
+    def shrink(self, span: int):
+        """Shrink after a window of `span` blocks was rejected by the provider"""
+        self.size = self._clamp(min(self.size, span // 2))
+
+
+class LogScanner:
+    """Scan a block range with eth_getLogs
+
+    Windows are fetched `concurrency` at a time. The window size starts at
+    `chunk_size` and then follows the log density: it grows on sparse ranges
+    and shrinks when a window returns too many logs, never below
+    `min_chunk_size`. A window the provider rejects (result limit, range
+    limit, ...) is split in half and retried, down to a single block.
+
+    Windows are yielded in block order and the logs in each window are sorted
+    by (blockNumber, logIndex), so output is deterministic however the
+    fetches interleave.
+    """
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        concurrency: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        min_chunk_size: int = MIN_CHUNK_SIZE,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+        target_logs: int = TARGET_LOGS_PER_CHUNK
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.w3 = w3
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_logs = target_logs
+
+    async def _fetch_window(
+        self,
+        filter_params: Dict[str, Any],
+        start: int,
+        end: int,
+        sizer: ChunkSizer
+    ) -> List[Dict[str, Any]]:
+        try:
+            logs = await self.w3.eth.get_logs({
+                **filter_params,
+                "fromBlock": start,
+                "toBlock": end
+            })
+        except Exception:
+            span = end - start + 1
+            if span <= 1:
+                raise
+            sizer.shrink(span)
+            middle = start + span // 2 - 1
+            left = await self._fetch_window(filter_params, start, middle, sizer)
+            right = await self._fetch_window(filter_params, middle + 1, end, sizer)
+            return left + right
+
+        sizer.record(end - start + 1, len(logs))
+        return sorted(logs, key=log_position)
+
+    async def scan(
+        self,
+        filter_params: Dict[str, Any],
+        from_block: int,
+        to_block: int
+    ) -> AsyncIterator[Tuple[int, int, List[Dict[str, Any]]]]:
+        """Yield (window start, window end, logs) for every window in block order
+
+        Args:
+            filter_params: get_logs filter without fromBlock/toBlock
+            from_block: First block to scan
+            to_block: Last block to scan (inclusive)
+        """
+        sizer = ChunkSizer(
+            self.chunk_size,
+            self.min_chunk_size,
+            self.max_chunk_size,
+            self.target_logs
+        )
+        pending: Deque[Tuple[int, int, asyncio.Task]] = deque()
+        cursor = from_block
+
+        try:
+            while cursor <= to_block or pending:
+                while cursor <= to_block and len(pending) < self.concurrency:
+                    end = min(cursor + sizer.size - 1, to_block)
+                    task = asyncio.ensure_future(
+                        self._fetch_window(filter_params, cursor, end, sizer)
+                    )
+                    pending.append((cursor, end, task))
+                    cursor = end + 1
+
+                start, end, task = pending.popleft()
+                logs = await task
+                yield start, end, logs
+        finally:
+            for _, _, task in pending:
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()
+                else:
+                    task.cancel()
@@ -0,0 +1,114 @@
+"""
+Live log subscription that can change its filter without reconnecting
+"""
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from web3 import AsyncWeb3
+
+
+def log_key(log: Dict[str, Any]) -> Tuple[bytes, int]:
+    """(transactionHash, logIndex) identifying a log across subscriptions"""
+    tx_hash = log.get("transactionHash") or b""
+    if isinstance(tx_hash, str):
+        tx_hash = bytes.fromhex(tx_hash[2:] if tx_hash.startswith("0x") else tx_hash)
+    log_index = log.get("logIndex") or 0
+    if isinstance(log_index, str):
+        log_index = int(log_index, 16)
+    return bytes(tx_hash), int(log_index)
+
+
+class RecentLogs:
+    """Bounded set of recently delivered log keys"""
+
+    def __init__(self, max_size: int = 4096):
+        self._order: Deque[Tuple[bytes, int]] = deque()
+        self._keys: Set[Tuple[bytes, int]] = set()
+        self.max_size = max_size
+
+    def add(self, key: Tuple[bytes, int]) -> bool:
+        """Remember a key, False if it was already seen"""
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        self._order.append(key)
+        if len(self._order) > self.max_size:
+            self._keys.discard(self._order.popleft())
+        return True
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class LogSubscription:
+    """`eth_subscribe("logs")` whose filter can be swapped on a live socket
+
+    `update` subscribes with the new filter before unsubscribing the old one,
+    so no log is missed while switching. Removed subscriptions are retired
+    rather than forgotten: their payloads that were already received but not
+    yet processed are still accepted. Logs delivered by both subscriptions
+    during the switch are dropped by (txHash, logIndex).
+    """
+
+    def __init__(self, w3: AsyncWeb3, dedupe_size: int = 4096, retired_size: int = 16):
+        """Initialize subscription
+
+        Args:
+            w3: AsyncWeb3 instance with a persistent (WebSocket) provider
+            dedupe_size: Number of recent log keys kept after a filter switch
+            retired_size: Number of removed subscription ids whose queued
+                payloads are still accepted
+        """
+        self.w3 = w3
+        self.filter_params: Optional[Dict[str, Any]] = None
+        self.ids: Set[str] = set()
+        self.retired: Deque[str] = deque(maxlen=retired_size)
+        self._lock = asyncio.Lock()
+        self._dedupe_size = dedupe_size
+        self._recent: Optional[RecentLogs] = None
+
+    async def update(self, filter_params: Optional[Dict[str, Any]]):
+        """Subscribe with a new filter in place (None unsubscribes)
+
+        Args:
+            filter_params: eth_subscribe logs filter ({address, topics})
+        """
+        async with self._lock:
+            old_ids = set(self.ids)
+            if filter_params is not None:
+                new_id = await self.w3.eth.subscribe("logs", filter_params)
+                self.ids.add(new_id)
+            self.filter_params = filter_params
+
+            if old_ids and self._recent is None:
+                # Old and new subscription overlap from here on
+                self._recent = RecentLogs(self._dedupe_size)
+            for sub_id in old_ids:
+                # Stop it on the node only: web3's subscription manager skips
+                # queued payloads of ids it no longer tracks
+                try:
+                    await self.w3.provider.make_request("eth_unsubscribe", [sub_id])
+                except Exception:
+                    pass
+                self.ids.discard(sub_id)
+                self.retired.append(sub_id)
+
+    async def close(self):
+        """Remove every active subscription"""
+        await self.update(None)
+
+    def accept(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Log of a subscription payload, None if it is foreign or a duplicate"""
+        sub_id = payload.get("subscription")
+        if sub_id not in self.ids and sub_id not in self.retired:
+            return None
+        log = payload.get("result")
+        if not log:
+            return None
+        if self._recent is not None and not self._recent.add(log_key(log)):
+            return None
+        return log
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from enum import Enum
 from typing import List,Dict,Optional,Any
 
@@ -14,5 +15,115 @@ class EventType(Enum):
     MANAGER_1_SELL = "TokenSale(address,address,uint256,uint256)"
     MANAGER_2_SELL = "TokenSale(address,address,uint256,uint256,uint256,uint256,uint256,uint256)"
 
+    # Token migrated off the curve into its PancakeSwap pair
+    MANAGER_2_LIQUIDITY_ADDED = "LiquidityAdded(address,uint256,address,uint256)"
+
     v2_SWAP = "Swap(address,uint256,uint256,uint256,uint256,address)"
-    v3_SWAP = "Swap(address,address,int256,int256,uint160,uint128,int24,uint128,uint128"
\ No newline at end of file
+    v2_SYNC = "Sync(uint112,uint112)"
+    v3_SWAP = "Swap(address,address,int256,int256,uint160,uint128,int24,uint128,uint128"
+
+
+# ─────────────────────────────────────
+# Compact event records (opt-in parser output)
+# ─────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class CurveTradeEvent:
+    """TokenPurchase/TokenSale event"""
+    event_name: str
+    trader: str
+    transaction_hash: str
+    price: int
+    token: str
+    amount: int
+    cost: int
+    fee: int
+    offers: int
+    funds: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same dict as parse_curve_event returns"""
+        return {
+            "eventName": self.event_name,
+            "trader": self.trader,
+            "transactionHash": self.transaction_hash,
+            "price": self.price,
+            "token": self.token,
+            "amount": self.amount,
+            "cost": self.cost,
+            "fee": self.fee,
+            "offers": self.offers,
+            "funds": self.funds
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class TokenCreateEvent:
+    """TokenCreate event"""
+    event_name: str
+    creator: str
+    transaction_hash: str
+    token: str
+    total_supply: int
+    launch_time: int
+    launch_fee: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same dict as parse_create_event returns"""
+        return {
+            "eventName": self.event_name,
+            "creator": self.creator,
+            "transactionHash": self.transaction_hash,
+            "token": self.token,
+            "totalSupply": self.total_supply,
+            "launchTime": self.launch_time,
+            "launchFee": self.launch_fee
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class LiquidityAddedEvent:
+    """LiquidityAdded event (token migrated to PancakeSwap)"""
+    event_name: str
+    transaction_hash: str
+    token: str
+    offers: int
+    quote: str
+    funds: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "eventName": self.event_name,
+            "transactionHash": self.transaction_hash,
+            "token": self.token,
+            "offers": self.offers,
+            "quote": self.quote,
+            "funds": self.funds
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class SwapEvent:
+    """PancakeSwap V2 Swap event"""
+    transaction_hash: str
+    pool: str
+    sender: str
+    amount0_in: int
+    amount1_in: int
+    amount0_out: int
+    amount1_out: int
+    price: float
+    event_name: str = "Swap"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same dict as parse_swap_event returns"""
+        return {
+            "eventName": self.event_name,
+            "transactionHash": self.transaction_hash,
+            "pool": self.pool,
+            "sender": self.sender,
+            "amount0In": self.amount0_in,
+            "amount1In": self.amount1_in,
+            "amount0Out": self.amount0_out,
+            "amount1Out": self.amount1_out,
+            "price": self.price
+        }
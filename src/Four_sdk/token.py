@@ -6,11 +6,12 @@ import asyncio
 from typing import Optional, Tuple, Dict, Any
 from eth_abi import encode
 from eth_account import Account
-from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address, to_hex
 from web3 import AsyncWeb3, AsyncHTTPProvider
 from web3.types import TxParams, Wei
 
-from .Utils import load_abis
+from .Utils import load_abi, get_contract
+from .nonce import NonceManager, get_nonce_manager, send_signed
 from .constants import CHAIN_ID
 from .types import TokenMetadata
 
@@ -22,21 +23,23 @@ def _cs(addr: str) -> str:
 class Token:
     """Token helper class for ERC20 operations."""
     
-    def __init__(self, rpc_url: str, private_key: str):
+    def __init__(self, rpc_url: str, private_key: str, nonce_manager: Optional[NonceManager] = None):
         """Initialize Token helper.
         
         Args:
             rpc_url: RPC endpoint URL
             private_key: Private key for signing transactions
+            nonce_manager: Nonce manager to use (defaults to the one shared
+                by every Trade/Token for this account and endpoint)
         """
         self.w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
         self.account = Account.from_key(private_key)
         self.address: str = self.account.address
         self.chain_id = CHAIN_ID
+        self.nonce_manager = nonce_manager or get_nonce_manager(self.w3, self.address)
         
         # Load ERC20 ABI
-        abis = load_abis()
-        self.erc20_abi = abis["erc20Abi"]
+        self.erc20_abi = load_abi("erc20Abi")
         
         # Pre-compute function selectors for efficiency
         self.approve_sel = function_signature_to_4byte_selector("approve(address,uint256)")
@@ -58,7 +61,7 @@ class Token:
         """
         try:
             addr = _cs(address) if address else self.address
-            contract = self.w3.eth.contract(address=_cs(token), abi=self.erc20_abi)
+            contract = get_contract(self.w3, token, "erc20Abi")
             balance = await contract.functions.balanceOf(addr).call()
             return int(balance)
         except Exception as e:
@@ -77,7 +80,7 @@ class Token:
         """
         try:
             owner_addr = _cs(owner) if owner else self.address
-            contract = self.w3.eth.contract(address=_cs(token), abi=self.erc20_abi)
+            contract = get_contract(self.w3, token, "erc20Abi")
             allowance = await contract.functions.allowance(owner_addr, _cs(spender)).call()
             return int(allowance)
         except Exception as e:
@@ -93,7 +96,7 @@ class Token:
             TokenMetadata object
         """
         try:
-            contract = self.w3.eth.contract(address=_cs(token), abi=self.erc20_abi)
+            contract = get_contract(self.w3, token, "erc20Abi")
             
             # Fetch all metadata in parallel for efficiency
             name, symbol, decimals, total_supply = await asyncio.gather(
@@ -172,33 +175,33 @@ class Token:
         Returns:
             Transaction hash
         """
-        # Get current gas price and nonce
+        # Get current gas price
         # gas_price = int(await self.w3.eth.gas_price)
         base_gas_price = 100_000_000
         gas_price = base_gas_price * 1
 
-        nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
-        
-        # Build transaction
-        tx: TxParams = {
-            "from": self.address,
-            "to": to,
-            "data": "0x" + calldata.hex(),
-            "value": Wei(value),
-            "chainId": self.chain_id,
-            "nonce": nonce,
-            "gasPrice": Wei(gas_price),
-        }
-        
-        # Estimate gas with buffer
-        estimated_gas = await self.w3.eth.estimate_gas(tx)
-        tx["gas"] = int(estimated_gas * 1.2)  # 20% buffer
-        
-        # Sign and send
-        signed = self.account.sign_transaction(tx)
-        raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
-        tx_hash = await self.w3.eth.send_raw_transaction(raw)
-        return tx_hash.hex()
+        async def _send(nonce: int) -> str:
+            # Build transaction
+            tx: TxParams = {
+                "from": self.address,
+                "to": to,
+                "data": "0x" + calldata.hex(),
+                "value": Wei(value),
+                "chainId": self.chain_id,
+                "nonce": nonce,
+                "gasPrice": Wei(gas_price),
+            }
+            
+            # Estimate gas with buffer
+            estimated_gas = await self.w3.eth.estimate_gas(tx)
+            tx["gas"] = int(estimated_gas * 1.2)  # 20% buffer
+            
+            # Sign and send
+            signed = self.account.sign_transaction(tx)
+            tx_hash = await send_signed(self.w3, signed)
+            return to_hex(tx_hash)
+
+        return await self.nonce_manager.submit(_send)
     
     # ─────────────────────────────────────
     # Utility methods
@@ -247,7 +250,7 @@ class Token:
         balance = await self.get_balance(token, address)
         
         # Get decimals for formatting
-        contract = self.w3.eth.contract(address=_cs(token), abi=self.erc20_abi)
+        contract = get_contract(self.w3, token, "erc20Abi")
         decimals = await contract.functions.decimals().call()
         
         # Format with proper decimal places
@@ -1,37 +1,68 @@
 import time
-from typing import Dict,List,Optional,Any
+from collections import OrderedDict
+from typing import Dict,List,Optional,Any,Sequence,Tuple
 
 from web3 import AsyncWeb3,Web3,AsyncHTTPProvider
-from eth_utils import function_signature_to_4byte_selector,to_checksum_address
+from eth_utils import function_signature_to_4byte_selector,to_checksum_address,to_hex
 from eth_account import Account
-from eth_abi import encode
+from eth_abi import encode,decode
 from web3.types import TxParams, Wei
 
 from .types import CurveData,BuyParams,SellParams,QuoteResult
-from .constants import CONTRACTS,CHAIN_ID,WBNB,DEFAULT_DEADLINE_SECONDS 
-from .Utils import load_abis
+from .constants import CONTRACTS,CHAIN_ID,WBNB,DEFAULT_DEADLINE_SECONDS,DEFAULT_MULTICALL_CHUNK_SIZE,DEFAULT_GAS_PRICE
+from .Utils import get_contract,aggregate3
+from .nonce import NonceManager,get_nonce_manager,send_signed
+from .gas import GasProfileCache,GAS_PROFILES
+from .calldata import (
+    checksum,
+    buy_token_amap,
+    sell_token,
+    swap_exact_eth_for_tokens,
+    swap_exact_tokens_for_eth
+)
 
 def _cs(addr:str)-> str:
     return to_checksum_address(addr)
 
+# Output layout of tokenManagerHelper.getTokenInfo
+TOKEN_INFO_TYPES = [
+    "uint256","address","address","uint256","uint256","uint256",
+    "uint256","uint256","uint256","uint256","uint256","bool"
+]
+
+def _curve_from_info(data) -> CurveData:
+    return CurveData(
+        token_manager=_cs(data[1]),
+        quote=_cs(data[2]),
+        reserve=int(data[9]),
+        max_reserve=int(data[10]),
+        liquidity_added=data[11],
+        offers=int(data[7]),
+        max_offers=int(data[8]),
+        last_price=int(data[3]),
+        trading_fee_rate=int(data[4]),
+        min_trading_fee=int(data[5])
+    )
+
 class Trade:
 
-    def __init__(self,rpc_url:str, private_key:str|None=None):
+    def __init__(self,rpc_url:str, private_key:str|None=None, nonce_manager:NonceManager|None=None, gas_cache:GasProfileCache|None=None):
         self.w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
         self.account = Account.from_key(private_key)
         self.address: str = self.account.address
         self.chain_id = CHAIN_ID
 
-        abis = load_abis()
-        self.tokenManagerHelper = self.w3.eth.contract(
-            address=_cs(CONTRACTS['tokenManagerHelper']),
-            abi=abis['tokenManagerHelper']
-        )
+        # Shared with Token (and other Trade objects) for the same account and endpoint
+        self.nonce_manager = nonce_manager or get_nonce_manager(self.w3, self.address)
+
+        # Learned gas limits, fed back from receipts in wait_for_transaction
+        self.gas_cache = gas_cache or GAS_PROFILES
+        self._gas_keys: OrderedDict[str, tuple] = OrderedDict()
+
+        self.tokenManagerHelper = get_contract(self.w3, CONTRACTS['tokenManagerHelper'], 'tokenManagerHelper')
         self.pancakeRouter_address = CONTRACTS['pancakeRouter']
-        self.pancakeRouter = self.w3.eth.contract(
-            address=_cs(self.pancakeRouter_address),
-            abi=abis['pancakeRouter']
-        )
+        self.pancakeRouter = get_contract(self.w3, self.pancakeRouter_address, 'pancakeRouter')
+        self._dex_routers: Dict[str, bool] = {}  # router address as passed -> is PancakeSwap router
 
         self.buy_sel =  function_signature_to_4byte_selector(
             "buyTokenAMAP(address,uint256,uint256)"
@@ -48,52 +79,99 @@ class Trade:
             "swapExactTokensForETH(uint256,uint256,address[],address,uint256)"
         )
 
+        # Selectors for multicall batched reads
+        self.token_info_sel = function_signature_to_4byte_selector("getTokenInfo(address)")
+        self.try_buy_sel = function_signature_to_4byte_selector("tryBuy(address,uint256,uint256)")
+        self.try_sell_sel = function_signature_to_4byte_selector("trySell(address,uint256)")
+        self.amounts_out_sel = function_signature_to_4byte_selector("getAmountsOut(uint256,address[])")
+
     async def get_curves(self, token: str) -> CurveData:
         
         try:
             data = await self.tokenManagerHelper.functions.getTokenInfo(_cs(token)).call()
-            return CurveData(
-                token_manager=data[1],
-                quote=data[2],
-                reserve=int(data[9]),
-                max_reserve=int(data[10]),
-                liquidity_added=data[11]
-            )
+            return _curve_from_info(data)
         except Exception as e:
             raise RuntimeError(f"Failed to get curve data: {e}")
+
+    async def _get_token_infos(self, tokens: Sequence[str], chunk_size: int) -> Dict[str, Optional[tuple]]:
+        """Batch getTokenInfo through multicall, None for tokens that failed"""
+        unique = list(dict.fromkeys(_cs(token) for token in tokens))
+        helper = self.tokenManagerHelper.address
+        results = await aggregate3(
+            self.w3,
+            [(helper, self.token_info_sel + encode(["address"], [token])) for token in unique],
+            chunk_size
+        )
+        infos = {}
+        for token, (success, data) in zip(unique, results):
+            try:
+                infos[token] = tuple(decode(TOKEN_INFO_TYPES, data)) if success else None
+            except Exception:
+                infos[token] = None
+        return infos
+
+    async def get_curves_many(
+        self,
+        tokens: Sequence[str],
+        chunk_size: int = DEFAULT_MULTICALL_CHUNK_SIZE
+    ) -> Dict[str, Optional[CurveData]]:
+        """Fetch curve data for many tokens in multicall batches
+
+        Args:
+            tokens: Token addresses
+            chunk_size: Maximum number of calls per multicall request
+
+        Returns:
+            Dict of checksum token address -> CurveData (None if the read failed)
+        """
+        infos = await self._get_token_infos(tokens, chunk_size)
+        return {
+            token: _curve_from_info(info) if info is not None else None
+            for token, info in infos.items()
+        }
     
 
-    async def _send_transaction(self, to: str, calldata: bytes, *, value: int = 0, nonce: int = None, gas: int = None, gas_price: int = None) -> str:
+    async def _send_transaction(self, to: str, calldata: bytes, *, value: int = 0, nonce: int = None, gas: int = None, gas_price: int = None, gas_key: tuple = None) -> str:
         try:
-            # Get current gas price and nonce
+            # Get current gas price
             if gas_price is None:
                 # gas_price = int(await self.w3.eth.gas_price)
-                base_gas_price = 100_000_000
-                gas_price = base_gas_price * 1
+                gas_price = DEFAULT_GAS_PRICE
 
+            async def _send(nonce: int) -> str:
+                # Build transaction
+                tx: TxParams = {
+                    "from": self.address,
+                    "to": checksum(to),
+                    "data": "0x" + calldata.hex(),
+                    "value": Wei(value),
+                    "chainId": self.chain_id,
+                    "nonce": nonce,
+                    "gasPrice": Wei(gas_price),
+                }
+                if gas is not None:
+                    tx["gas"] = int(gas)
+                else:
+                    cached_gas = self.gas_cache.get(gas_key) if gas_key else None
+                    if cached_gas is not None:
+                        tx["gas"] = cached_gas
+                    else:
+                        estimated_gas = await self.w3.eth.estimate_gas(tx)
+                        if gas_key:
+                            self.gas_cache.record(gas_key, estimated_gas)
+                        tx["gas"] = int(estimated_gas * 1.2)  # 20% buffer
+                
+                # Sign and send transaction
+                signed = self.account.sign_transaction(tx)
+                tx_hash = to_hex(await send_signed(self.w3, signed))
+                if gas_key:
+                    self._track_gas_key(tx_hash, gas_key)
+                return tx_hash
 
-            if nonce is None:
-                nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
-            
-            # Build transaction
-            tx: TxParams = {
-                "from": self.address,
-                "to": _cs(to),
-                "data": "0x" + calldata.hex(),
-                "value": Wei(value),
-                "chainId": self.chain_id,
-                "nonce": nonce,
-                "gasPrice": Wei(gas_price),
-            }
-            if gas is None:
-                estimated_gas = await self.w3.eth.estimate_gas(tx)
-                tx["gas"] = int(estimated_gas * 1.2)  # 20% buffer
-            
-            # Sign and send transaction
-            signed = self.account.sign_transaction(tx)
-            raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
-            tx_hash = await self.w3.eth.send_raw_transaction(raw)
-            return tx_hash.hex()
+            # Explicit nonces bypass the nonce manager
+            if nonce is not None:
+                return await _send(nonce)
+            return await self.nonce_manager.submit(_send)
             
         except Exception as e:
             raise RuntimeError(f"Transaction failed: {e}")
@@ -143,110 +221,195 @@ class Trade:
         except Exception as e:
             raise RuntimeError(f"Failed to get amount out: {e}")
 
+    async def get_amounts_out_many(
+        self,
+        tokens: Sequence[str],
+        amount_in: int | Sequence[int],
+        is_buy: bool,
+        chunk_size: int = DEFAULT_MULTICALL_CHUNK_SIZE
+    ) -> List[Optional[QuoteResult]]:
+        """Quote many tokens with two multicall round trips in total
 
-    async def buy(self, params: SellParams, router_addr: str) -> str:
-        nonce = params.nonce
-        gas = params.gas
-        gas_price = params.gas_price
-        
-       
-        
-        # Encode buy parameters
-        if _cs(router_addr) != _cs(self.pancakeRouter_address):
-            encoded_params = encode(
-                ["address","uint256","uint256"],
-                [
-                    _cs(params.token),
-                    int(params.amount_in),
-                    int(params.amount_out_min)
-                ],
+        The first batch reads getTokenInfo for every token, the second one
+        runs tryBuy/trySell for curve tokens and getAmountsOut for migrated
+        tokens.
+
+        Args:
+            tokens: Token addresses
+            amount_in: Input amount for every token, or one amount per token
+            is_buy: True to quote a buy, False to quote a sell
+            chunk_size: Maximum number of calls per multicall request
+
+        Returns:
+            List of QuoteResult aligned with `tokens` (None where quoting failed)
+        """
+        if isinstance(amount_in, int):
+            amounts = [amount_in] * len(tokens)
+        else:
+            amounts = [int(amount) for amount in amount_in]
+            if len(amounts) != len(tokens):
+                raise ValueError("amount_in must have one amount per token")
+
+        infos = await self._get_token_infos(tokens, chunk_size)
+        helper = self.tokenManagerHelper.address
+        router = _cs(self.pancakeRouter_address)
+        wbnb = _cs(WBNB)
+
+        calls = []
+        pending = []  # (index into tokens, is_dex)
+        for index, (token, amount) in enumerate(zip(tokens, amounts)):
+            info = infos.get(_cs(token))
+            if info is None:
+                continue
+            token = _cs(token)
+            if not info[11]:
+                if is_buy:
+                    calldata = self.try_buy_sel + encode(
+                        ["address","uint256","uint256"], [token, 0, amount]
+                    )
+                else:
+                    calldata = self.try_sell_sel + encode(
+                        ["address","uint256"], [token, amount]
+                    )
+                calls.append((helper, calldata))
+                pending.append((index, False))
+            else:
+                path = [wbnb, token] if is_buy else [token, wbnb]
+                calls.append((router, self.amounts_out_sel + encode(
+                    ["uint256","address[]"], [amount, path]
+                )))
+                pending.append((index, True))
+
+        quotes: List[Optional[QuoteResult]] = [None] * len(tokens)
+        results = await aggregate3(self.w3, calls, chunk_size)
+        for (index, is_dex), (success, data) in zip(pending, results):
+            if not success:
+                continue
+            try:
+                if is_dex:
+                    amounts_out = decode(["uint256[]"], data)[0]
+                    quotes[index] = QuoteResult(router=router, amount=int(amounts_out[-1]))
+                elif is_buy:
+                    result = decode(["address","address"] + ["uint256"] * 6, data)
+                    quotes[index] = QuoteResult(router=_cs(result[0]), amount=int(result[2]))
+                else:
+                    result = decode(["address","address","uint256","uint256"], data)
+                    quotes[index] = QuoteResult(router=_cs(result[0]), amount=int(result[2]))
+            except Exception:
+                continue
+        return quotes
+
+
+    def _is_dex_router(self, router_addr: str) -> bool:
+        """Whether `router_addr` is the PancakeSwap router (memoized per address string)"""
+        is_dex = self._dex_routers.get(router_addr)
+        if is_dex is None:
+            is_dex = self._dex_routers[router_addr] = router_addr.lower() == self.pancakeRouter_address.lower()
+        return is_dex
+
+    def _deadline(self, params) -> int:
+        # Set deadline if not provided
+        return (
+            int(time.time()) + DEFAULT_DEADLINE_SECONDS
+            if params.deadline is None
+            else int(params.deadline)
+        )
+
+    def _buy_calldata(self, params: BuyParams, router_addr: str) -> Tuple[bytes, bool]:
+        """Calldata of a buy through `router_addr` and whether it is a DEX swap"""
+        is_dex = self._is_dex_router(router_addr)
+        if not is_dex:
+            call_data = buy_token_amap(
+                params.token,
+                int(params.amount_in),
+                int(params.amount_out_min)
             )
-            call_data = self.buy_sel + encoded_params
         else:
-             # Set deadline if not provided
-            deadline = (
-                int(time.time()) + DEFAULT_DEADLINE_SECONDS 
-                if params.deadline is None 
-                else int(params.deadline)
+            call_data = swap_exact_eth_for_tokens(
+                int(params.amount_out_min),
+                (WBNB, params.token),
+                params.to,
+                self._deadline(params)
             )
-            encoded_params = encode(
-                ["uint256","address[]","address","uint256"],
-                [
-                    int(params.amount_out_min),
-                    [_cs(WBNB), _cs(params.token)],
-                    _cs(params.to),
-                    deadline
-                ]
+        return call_data, is_dex
+
+    def _sell_calldata(self, params: SellParams, router_addr: str) -> Tuple[bytes, bool]:
+        """Calldata of a sell through `router_addr` and whether it is a DEX swap"""
+        is_dex = self._is_dex_router(router_addr)
+        if not is_dex:
+            call_data = sell_token(params.token, int(params.amount_in))
+        else:
+            call_data = swap_exact_tokens_for_eth(
+                int(params.amount_in),
+                # int(params.amount_out_min),
+                0,
+                (params.token, WBNB),
+                params.to,
+                self._deadline(params)
             )
-            call_data = self.pancake_buy_sel + encoded_params
+        return call_data, is_dex
+
+    async def buy(self, params: SellParams, router_addr: str) -> str:
+        # Encode buy parameters
+        call_data, is_dex = self._buy_calldata(params, router_addr)
 
-        
         # Send transaction
         return await self._send_transaction(
             router_addr, 
-            # self.buy_sel + encoded_params,
             call_data,
             value=int(params.amount_in),
-            nonce=nonce,
-            gas=gas,
-            gas_price=gas_price
+            nonce=params.nonce,
+            gas=params.gas,
+            gas_price=params.gas_price,
+            gas_key=GasProfileCache.key(router_addr, call_data[:4], is_dex)
         )
     
 
     async def sell(self, params: BuyParams, router_addr: str) -> str:
-        nonce = params.nonce
-        gas = params.gas
-        gas_price = params.gas_price
-        
-       
-        
-        # Encode buy parameters
-        if _cs(router_addr) != _cs(self.pancakeRouter_address):
-            encoded_params = encode(
-                ["address","uint256"],
-                [
-                    _cs(params.token),
-                    int(params.amount_in)
-                ]
-            )
-            call_data = self.sell_sel + encoded_params
-        else:
-             # Set deadline if not provided
-            deadline = (
-                int(time.time()) + DEFAULT_DEADLINE_SECONDS 
-                if params.deadline is None 
-                else int(params.deadline)
-            )
-            encoded_params = encode(
-                ["uint256","uint256","address[]","address","uint256"],
-                [
-                    int(params.amount_in),
-                    # int(params.amount_out_min),
-                    0,
-                    [_cs(params.token),_cs(WBNB)],
-                    _cs(params.to),
-                    deadline
-                ]
-            )
-            call_data = self.pancake_sell_sel + encoded_params
+        # Encode sell parameters
+        call_data, is_dex = self._sell_calldata(params, router_addr)
 
-        
         # Send transaction
         return await self._send_transaction(
             router_addr, 
-            # self.buy_sel + encoded_params,
             call_data,
-            nonce=nonce,
-            gas=gas,
-            gas_price=gas_price
+            nonce=params.nonce,
+            gas=params.gas,
+            gas_price=params.gas_price,
+            gas_key=GasProfileCache.key(router_addr, call_data[:4], is_dex)
         )
     
+    @staticmethod
+    def _hash_key(tx_hash) -> str:
+        if not isinstance(tx_hash, str):
+            tx_hash = tx_hash.hex()
+        return tx_hash.lower().removeprefix("0x")
+
+    def _track_gas_key(self, tx_hash: str, gas_key: tuple):
+        self._gas_keys[self._hash_key(tx_hash)] = gas_key
+        # Keep the map bounded when receipts are never awaited
+        while len(self._gas_keys) > 1024:
+            self._gas_keys.popitem(last=False)
+
+    def _learn_gas(self, tx_hash: str, receipt: Dict[str, Any]):
+        """Feed a receipt's gasUsed back into the gas cache"""
+        gas_key = self._gas_keys.pop(self._hash_key(tx_hash), None)
+        if gas_key is None:
+            return
+        if receipt.get("status") == 0:
+            # Reverted, possibly out of gas: estimate again next time
+            self.gas_cache.invalidate(gas_key)
+        elif receipt.get("gasUsed"):
+            self.gas_cache.record(gas_key, receipt["gasUsed"])
+
     async def wait_for_transaction(self, tx_hash: str, timeout: int = 60) -> Dict[str, Any]:
         try:
             receipt = await self.w3.eth.wait_for_transaction_receipt(
                 tx_hash, 
                 timeout=timeout
             )
-            return dict(receipt)
+            receipt = dict(receipt)
+            self._learn_gas(tx_hash, receipt)
+            return receipt
         except Exception as e:
             raise RuntimeError(f"Failed to get transaction receipt: {e}")
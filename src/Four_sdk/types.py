@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
 @dataclass
 class CurveData:
@@ -8,6 +8,11 @@ class CurveData:
     reserve:int
     max_reserve:int
     liquidity_added:bool
+    offers:int = 0
+    max_offers:int = 0
+    last_price:int = 0
+    trading_fee_rate:int = 0
+    min_trading_fee:int = 0
 
 
 @dataclass
@@ -52,3 +57,34 @@ class TokenMetadata:
     address: str
 
 
+@dataclass
+class BasketOrder:
+    """One buy or sell of a basket sent by BasketExecutor."""
+    params: Union[BuyParams, SellParams]
+    router: str
+    is_buy: bool = True
+
+
+@dataclass
+class OrderResult:
+    """Outcome of one basket order."""
+    index: int
+    tx_hash: Optional[str] = None
+    nonce: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.tx_hash is not None
+
+
+@dataclass
+class PendingTx:
+    """A WalletPool transaction and its receipt status."""
+    wallet: str
+    tx_hash: str
+    token: str
+    is_buy: bool
+    submitted_at: float
+    status: str = "pending"  # pending, confirmed, reverted or dropped
+    receipt: Optional[Dict[str, Any]] = None
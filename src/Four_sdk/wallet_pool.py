@@ -0,0 +1,291 @@
+"""
+Trade submission spread over many wallets
+"""
+import asyncio
+import itertools
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Union
+
+from web3.exceptions import TransactionNotFound
+
+from .gas import GasProfileCache, GAS_PROFILES
+from .trade import Trade
+from .types import BuyParams, SellParams, PendingTx
+
+
+class PoolWallet:
+    """One account of a WalletPool: its Trade (and nonce manager) and in-flight slots"""
+
+    def __init__(self, trade: Trade, max_in_flight: int):
+        self.trade = trade
+        self.address = trade.address
+        self.max_in_flight = max_in_flight
+        self.pending: Dict[str, PendingTx] = {}
+        self.load = 0  # orders sent or waiting for a slot, not yet settled
+        self.submitted = 0
+        self.confirmed = 0
+        self.failed = 0
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "load": self.load,
+            "submitted": self.submitted,
+            "confirmed": self.confirmed,
+            "failed": self.failed
+        }
+
+
+# ─────────────────────────────────────
+# Routing policies
+# ─────────────────────────────────────
+class WalletPolicy(ABC):
+    """Chooses the wallet for an order; subclasses implement `select`"""
+
+    @abstractmethod
+    def select(self, wallets: Sequence[PoolWallet], token: str, is_buy: bool) -> PoolWallet:
+        """Wallet to send an order for `token` from"""
+
+
+class RoundRobinPolicy(WalletPolicy):
+    """Each order goes to the next wallet in turn"""
+
+    def __init__(self):
+        self._counter = itertools.count()
+
+    def select(self, wallets: Sequence[PoolWallet], token: str, is_buy: bool) -> PoolWallet:
+        return wallets[next(self._counter) % len(wallets)]
+
+
+class LeastLoadedPolicy(WalletPolicy):
+    """The wallet with the fewest unsettled orders (first one on a tie)"""
+
+    def select(self, wallets: Sequence[PoolWallet], token: str, is_buy: bool) -> PoolWallet:
+        return min(wallets, key=lambda wallet: wallet.load)
+
+
+class StickyPerTokenPolicy(WalletPolicy):
+    """Every order for a token uses the wallet that traded it first
+
+    Sells then come from the wallet that holds the tokens. New tokens are
+    assigned by `fallback` (least loaded by default).
+    """
+
+    def __init__(self, fallback: Optional[WalletPolicy] = None):
+        self.fallback = fallback or LeastLoadedPolicy()
+        self._assigned: Dict[str, str] = {}  # lowercase token -> lowercase wallet address
+
+    def assign(self, token: str, wallet_address: str):
+        """Pin a token to a wallet (e.g. tokens bought before the pool existed)"""
+        self._assigned[token.lower()] = wallet_address.lower()
+
+    def forget(self, token: str):
+        self._assigned.pop(token.lower(), None)
+
+    def select(self, wallets: Sequence[PoolWallet], token: str, is_buy: bool) -> PoolWallet:
+        address = self._assigned.get(token.lower())
+        if address is not None:
+            for wallet in wallets:
+                if wallet.address.lower() == address:
+                    return wallet
+        wallet = self.fallback.select(wallets, token, is_buy)
+        self._assigned[token.lower()] = wallet.address.lower()
+        return wallet
+
+
+POLICIES = {
+    "round_robin": RoundRobinPolicy,
+    "least_loaded": LeastLoadedPolicy,
+    "sticky": StickyPerTokenPolicy,
+}
+
+
+class WalletPool:
+    """Submit trades from many accounts in one process
+
+    Transactions of one account serialize on its nonce, so the pool spreads
+    orders over several wallets. Each wallet has its own Trade and nonce
+    manager and at most `max_in_flight` unconfirmed transactions; an order
+    for a full wallet waits for a slot. A background task waits for each
+    receipt (feeding the gas cache shared by all wallets) and frees the slot.
+    A transaction without a receipt keeps its slot while the node still
+    knows it; once it is gone it is reported as dropped and the wallet's
+    nonce manager resyncs.
+
+    Example:
+        pool = WalletPool(rpc_url, private_keys, max_in_flight=4, policy="sticky")
+        pending = await pool.buy(BuyParams(token, amount_in, 0, to=None), router)
+        await pool.wait_for_transaction(pending.tx_hash)
+        pool.pending()   # every unconfirmed transaction across wallets
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        private_keys: Sequence[str],
+        max_in_flight: int = 4,
+        policy: Union[WalletPolicy, str] = "round_robin",
+        gas_cache: Optional[GasProfileCache] = None,
+        receipt_timeout: int = 120
+    ):
+        """Initialize pool
+
+        Args:
+            rpc_url: RPC endpoint URL
+            private_keys: One private key per wallet
+            max_in_flight: Maximum unconfirmed transactions per wallet
+            policy: WalletPolicy, or "round_robin", "least_loaded" or "sticky"
+            gas_cache: Gas limit cache shared by every wallet
+            receipt_timeout: Seconds to wait for a receipt before checking
+                whether the node still has the transaction
+        """
+        if not private_keys:
+            raise ValueError("WalletPool needs at least one private key")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if isinstance(policy, str):
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown policy {policy}, expected one of {', '.join(POLICIES)}")
+            policy = POLICIES[policy]()
+        self.policy = policy
+        self.receipt_timeout = receipt_timeout
+        gas_cache = gas_cache or GAS_PROFILES
+        self.wallets: List[PoolWallet] = [
+            PoolWallet(Trade(rpc_url, private_key, gas_cache=gas_cache), max_in_flight)
+            for private_key in private_keys
+        ]
+        self._waiters: Dict[str, asyncio.Task] = {}
+        self._settled: "OrderedDict[str, PendingTx]" = OrderedDict()  # recent, for late waiters
+
+    def wallet(self, address: str) -> PoolWallet:
+        """Wallet of the pool by address"""
+        for wallet in self.wallets:
+            if wallet.address.lower() == address.lower():
+                return wallet
+        raise KeyError(f"No wallet {address} in the pool")
+
+    async def _submit(
+        self,
+        params: Union[BuyParams, SellParams],
+        router_addr: str,
+        is_buy: bool,
+        wallet: Optional[str]
+    ) -> PendingTx:
+        chosen = self.wallet(wallet) if wallet else self.policy.select(self.wallets, params.token, is_buy)
+        chosen.load += 1
+        try:
+            await chosen._slots.acquire()
+        except BaseException:
+            chosen.load -= 1
+            raise
+
+        try:
+            # Tokens and BNB go to the sending wallet unless told otherwise
+            if not params.to:
+                params = replace(params, to=chosen.address)
+            send = chosen.trade.buy if is_buy else chosen.trade.sell
+            tx_hash = await send(params, router_addr)
+        except BaseException:
+            chosen.failed += 1
+            chosen.load -= 1
+            chosen._slots.release()
+            raise
+
+        pending = PendingTx(chosen.address, tx_hash, params.token, is_buy, time.time())
+        chosen.pending[tx_hash] = pending
+        chosen.submitted += 1
+        self._waiters[tx_hash] = asyncio.create_task(self._settle(chosen, pending))
+        return pending
+
+    async def _is_known(self, wallet: PoolWallet, tx_hash: str) -> bool:
+        """Whether the node still has a transaction (True when it cannot tell)"""
+        try:
+            await wallet.trade.w3.eth.get_transaction(tx_hash)
+            return True
+        except TransactionNotFound:
+            return False
+        except Exception:
+            await asyncio.sleep(1)
+            return True
+
+    async def _settle(self, wallet: PoolWallet, pending: PendingTx) -> PendingTx:
+        """Wait for the receipt, then free the wallet's slot"""
+        try:
+            while True:
+                try:
+                    receipt = await wallet.trade.wait_for_transaction(pending.tx_hash, timeout=self.receipt_timeout)
+                except RuntimeError:
+                    if await self._is_known(wallet, pending.tx_hash):
+                        continue  # still pending: keep the slot
+                    pending.status = "dropped"
+                    # The nonce is free again (or was taken by another transaction)
+                    await wallet.trade.nonce_manager.resync()
+                    break
+                pending.receipt = receipt
+                pending.status = "confirmed" if receipt.get("status") != 0 else "reverted"
+                break
+        finally:
+            if pending.status == "confirmed":
+                wallet.confirmed += 1
+            elif pending.status != "pending":  # not cancelled by close()
+                wallet.failed += 1
+            wallet.pending.pop(pending.tx_hash, None)
+            wallet.load -= 1
+            wallet._slots.release()
+
+        self._waiters.pop(pending.tx_hash, None)
+        self._settled[pending.tx_hash] = pending
+        while len(self._settled) > 1024:
+            self._settled.popitem(last=False)
+        return pending
+
+    async def buy(self, params: BuyParams, router_addr: str, wallet: Optional[str] = None) -> PendingTx:
+        """Buy from the wallet chosen by the policy (or `wallet`)
+
+        `params.to` defaults to the sending wallet when it is empty.
+        """
+        return await self._submit(params, router_addr, True, wallet)
+
+    async def sell(self, params: SellParams, router_addr: str, wallet: Optional[str] = None) -> PendingTx:
+        """Sell from the wallet chosen by the policy (or `wallet`)
+
+        Use the "sticky" policy (or pass `wallet`) so the sell comes from the
+        wallet holding the tokens.
+        """
+        return await self._submit(params, router_addr, False, wallet)
+
+    async def wait_for_transaction(self, tx_hash: str) -> PendingTx:
+        """Wait until a pool transaction is confirmed, reverted or dropped"""
+        waiter = self._waiters.get(tx_hash)
+        if waiter is not None:
+            return await asyncio.shield(waiter)
+        if tx_hash in self._settled:
+            return self._settled[tx_hash]
+        raise KeyError(f"Unknown transaction {tx_hash}")
+
+    def pending(self) -> List[PendingTx]:
+        """Unconfirmed transactions of every wallet, oldest first"""
+        return sorted(
+            (pending for wallet in self.wallets for pending in wallet.pending.values()),
+            key=lambda pending: pending.submitted_at
+        )
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-wallet counters keyed by address"""
+        return {wallet.address: wallet.stats() for wallet in self.wallets}
+
+    async def close(self):
+        """Stop waiting for receipts"""
+        waiters = list(self._waiters.values())
+        self._waiters.clear()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
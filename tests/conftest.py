@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.cases import BENCH_PRIVATE_KEY
+from benchmarks.mock_rpc import MockRPC
+
+
+@pytest.fixture
+async def rpc():
+    async with MockRPC([], mempool=True) as server:
+        yield server
+
+
+@pytest.fixture
+def private_key() -> str:
+    return BENCH_PRIVATE_KEY
@@ -0,0 +1,34 @@
+from dataclasses import replace
+
+from Four_sdk import BasketExecutor, BasketOrder, GasProfileCache, Trade
+from Four_sdk.constants import CONTRACTS
+from Four_sdk.types import BuyParams
+
+ROUTER = CONTRACTS["tokenManager2"]
+
+
+def _orders(trade: Trade, count: int):
+    return [
+        BasketOrder(BuyParams("0x" + f"{i + 1:040x}", 10 ** 16, 0, trade.address, gas=250_000, deadline=1_900_000_000), ROUTER)
+        for i in range(count)
+    ]
+
+
+async def test_basket_hashes_match_trade_format(rpc, private_key):
+    trade = Trade(rpc.url, private_key, gas_cache=GasProfileCache())
+    executor = BasketExecutor(trade)
+    orders = _orders(trade, 3)
+    results = await executor.execute(orders)
+    single = await trade.buy(replace(orders[0].params, token="0x" + "ff" * 20), ROUTER)
+
+    assert all(result.ok for result in results)
+    assert [result.nonce for result in results] == [0, 1, 2]
+    assert sorted(rpc.transactions) == sorted([result.tx_hash for result in results] + [single])
+
+    # Resending the same signed transactions: "already known" counts as sent
+    resent = await executor.execute([
+        replace(order, params=replace(order.params, nonce=result.nonce))
+        for order, result in zip(orders, results)
+    ])
+    assert [result.tx_hash for result in resent] == [result.tx_hash for result in results]
+    executor.close()
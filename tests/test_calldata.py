@@ -0,0 +1,74 @@
+import pytest
+from eth_abi import encode
+
+from Four_sdk import calldata
+from Four_sdk.calldata import checksum
+from Four_sdk.constants import WBNB
+
+TOKEN = "0x" + "ab" * 20
+USDT = "0x55d398326f99059fF775485246999027B3197955"
+TO = "0x" + "0c" * 20
+MAX = 2 ** 256 - 1
+PATHS = [[WBNB, TOKEN], [TOKEN, WBNB], [WBNB, USDT, TOKEN]]
+
+
+def _expected(selector: bytes, types, values) -> bytes:
+    return selector + encode(types, values)
+
+
+@pytest.mark.parametrize("funds, min_amount", [(0, 0), (MAX, MAX), (10 ** 18, 1)])
+def test_buy_token_amap(funds, min_amount):
+    assert calldata.buy_token_amap(TOKEN, funds, min_amount) == _expected(
+        calldata.BUY_TOKEN_AMAP_SEL, ["address", "uint256", "uint256"], [checksum(TOKEN), funds, min_amount]
+    )
+
+
+@pytest.mark.parametrize("amount", [0, MAX, 12345])
+def test_sell_token(amount):
+    assert calldata.sell_token(TOKEN, amount) == _expected(
+        calldata.SELL_TOKEN_SEL, ["address", "uint256"], [checksum(TOKEN), amount]
+    )
+
+
+@pytest.mark.parametrize("path", PATHS)
+@pytest.mark.parametrize("amount_out_min, deadline", [(0, 0), (MAX, MAX)])
+def test_swap_exact_eth_for_tokens(path, amount_out_min, deadline):
+    assert calldata.swap_exact_eth_for_tokens(amount_out_min, path, TO, deadline) == _expected(
+        calldata.SWAP_EXACT_ETH_FOR_TOKENS_SEL,
+        ["uint256", "address[]", "address", "uint256"],
+        [amount_out_min, [checksum(address) for address in path], checksum(TO), deadline]
+    )
+
+
+@pytest.mark.parametrize("path", PATHS)
+@pytest.mark.parametrize("amount_in, amount_out_min, deadline", [(0, 0, 0), (MAX, MAX, MAX)])
+def test_swap_exact_tokens_for_eth(path, amount_in, amount_out_min, deadline):
+    assert calldata.swap_exact_tokens_for_eth(amount_in, amount_out_min, path, TO, deadline) == _expected(
+        calldata.SWAP_EXACT_TOKENS_FOR_ETH_SEL,
+        ["uint256", "uint256", "address[]", "address", "uint256"],
+        [amount_in, amount_out_min, [checksum(address) for address in path], checksum(TO), deadline]
+    )
+
+
+def test_selectors_match_signatures():
+    assert calldata.BUY_TOKEN_AMAP_SEL.hex() == "87f27655"
+    assert calldata.SELL_TOKEN_SEL.hex() == "f464e7db"
+    assert calldata.SWAP_EXACT_ETH_FOR_TOKENS_SEL.hex() == "7ff36ab5"
+    assert calldata.SWAP_EXACT_TOKENS_FOR_ETH_SEL.hex() == "18cbafe5"
+
+
+@pytest.mark.parametrize("amount", [-1, MAX + 1])
+def test_out_of_range_amounts_raise(amount):
+    with pytest.raises(OverflowError):
+        calldata.buy_token_amap(TOKEN, amount, 0)
+    with pytest.raises(OverflowError):
+        calldata.sell_token(TOKEN, amount)
+    with pytest.raises(OverflowError):
+        calldata.swap_exact_eth_for_tokens(amount, [WBNB, TOKEN], TO, 0)
+    with pytest.raises(OverflowError):
+        calldata.swap_exact_tokens_for_eth(amount, 0, [TOKEN, WBNB], TO, 0)
+
+
+def test_invalid_address_raises():
+    with pytest.raises(ValueError):
+        calldata.sell_token("0x1234", 1)
@@ -0,0 +1,18 @@
+from benchmarks import fixtures
+from Four_sdk.stream import decode_create_logs, decode_curve_logs, decode_swap_logs
+
+
+def test_columnar_decoders_filter_on_topic0():
+    data = fixtures.generate(blocks=200)
+    logs = data["curve"] + data["swap"]
+    buys = sum(log["topics"][0] == fixtures.BUY_TOPIC for log in logs)
+    sells = sum(log["topics"][0] == fixtures.SELL_TOPIC for log in logs)
+    creates = sum(log["topics"][0] == fixtures.CREATE_TOPIC for log in logs)
+    assert creates
+
+    curve = decode_curve_logs(logs)
+    assert curve["eventName"].count("MANAGER_2_BUY") == buys
+    assert curve["eventName"].count("MANAGER_2_SELL") == sells
+    assert len(curve["token"]) == buys + sells
+    assert len(decode_create_logs(logs)["token"]) == creates
+    assert len(decode_swap_logs(logs)["pool"]) == len(data["swap"])
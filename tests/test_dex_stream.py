@@ -0,0 +1,22 @@
+from Four_sdk import DexStream, PairReserveMirror
+from Four_sdk.Utils import get_pair_address
+
+LISTED = "0x" + "11" * 20
+NOT_LISTED = "0x" + "22" * 20
+
+
+async def test_discovered_pairs_are_seeded_in_the_mirror(rpc):
+    rpc.reserves[get_pair_address(LISTED).lower()] = (10 ** 24, 10 ** 24)
+    mirror = PairReserveMirror()
+    stream = DexStream(rpc.url, "ws://127.0.0.1:1", reserve_mirror=mirror)
+    stream.subscribe_tokens([LISTED, NOT_LISTED])
+    stream.watch_migrations([NOT_LISTED])
+
+    await stream._discover_pools(stream.w3)
+    reserves = mirror.reserves(get_pair_address(LISTED))
+    assert (reserves.reserve0, reserves.reserve1) == (10 ** 24, 10 ** 24)
+    assert mirror.get_amount_out(LISTED, 10 ** 18, True).amount > 0
+    assert stream.pending_tokens == [stream.w3.to_checksum_address(NOT_LISTED)]
+
+    await stream.remove_tokens([NOT_LISTED])
+    assert stream.pending_tokens == []
@@ -0,0 +1,17 @@
+from Four_sdk.stream.hub import HubConsumer, normalize_filter
+
+
+async def test_slow_consumer_drops_oldest_events():
+    consumer = HubConsumer(None, None, queue_size=3)
+    for i in range(5):
+        consumer._deliver(((b"", i), i))
+    consumer._end()
+
+    assert [event async for event in consumer] == [3, 4]
+    assert consumer.dropped == 3
+
+
+def test_only_equal_filters_share_a_key():
+    pool_a, pool_b = "0x" + "aa" * 20, "0x" + "bb" * 20
+    assert normalize_filter({"address": [pool_a, pool_b]}) == normalize_filter({"address": [pool_b.upper(), pool_a]})
+    assert normalize_filter({"address": [pool_a]}) != normalize_filter({"address": [pool_a, pool_b]})
@@ -0,0 +1,68 @@
+import pytest
+from eth_abi import encode
+from eth_utils import keccak
+
+from benchmarks import fixtures
+from benchmarks.mock_rpc import MockRPC
+from Four_sdk.constants import WBNB
+from Four_sdk.stream import CurveIndexer, EventType
+
+
+@pytest.fixture(scope="module")
+def curve_logs():
+    return fixtures.generate(blocks=300)
+
+
+async def test_rejected_windows_split_below_min_chunk_size(curve_logs):
+    # ~4 logs per block: even a 100-block window is over the provider limit
+    async with MockRPC(curve_logs["curve"], max_logs=150) as rpc:
+        indexer = CurveIndexer(rpc.url)
+        events = await indexer.fetch_events(curve_logs["from_block"], curve_logs["to_block"])
+    assert len(events) == len(curve_logs["curve"])
+
+
+async def test_store_resumes_an_interrupted_scan(curve_logs, tmp_path):
+    from_block, to_block = curve_logs["from_block"], curve_logs["to_block"]
+    path = str(tmp_path / "events.db")
+    async with MockRPC(curve_logs["curve"]) as rpc:
+        expected = await CurveIndexer(rpc.url).fetch_events(from_block, to_block)
+
+        # Stop half way: the windows handed out so far are checkpointed
+        indexer = CurveIndexer(rpc.url, store=path, confirmations=0)
+        events = indexer.iter_events(from_block, to_block, chunk_size=50, min_chunk_size=50, max_chunk_size=50)
+        seen = 0
+        async for _ in events:
+            seen += 1
+            if seen == len(expected) // 2:
+                break
+        await events.aclose()
+        indexer.store.close()
+
+        # A new process picks up from the store and only fetches the rest
+        rpc.calls.clear()
+        indexer = CurveIndexer(rpc.url, store=path, confirmations=0)
+        assert await indexer.fetch_events(from_block, to_block) == expected
+        resumed_calls = rpc.calls["eth_getLogs"]
+        assert 0 < resumed_calls < 300 // 50
+
+        rpc.calls.clear()
+        assert await indexer.fetch_events(from_block, to_block) == expected
+        assert "eth_getLogs" not in rpc.calls
+
+
+async def test_default_event_types_exclude_liquidity_added(curve_logs):
+    liquidity = dict(curve_logs["curve"][0])
+    liquidity["topics"] = ["0x" + keccak(text=EventType.MANAGER_2_LIQUIDITY_ADDED.value).hex()]
+    liquidity["data"] = "0x" + encode(
+        ["address", "uint256", "address", "uint256"], ["0x" + "11" * 20, 10 ** 18, WBNB, 10 ** 20]
+    ).hex()
+    liquidity["logIndex"] = "0xfff"
+
+    async with MockRPC([*curve_logs["curve"], liquidity]) as rpc:
+        indexer = CurveIndexer(rpc.url)
+        events = await indexer.fetch_events(curve_logs["from_block"], curve_logs["to_block"])
+        migrations = await indexer.fetch_events(
+            curve_logs["from_block"], curve_logs["to_block"], event_types=[EventType.MANAGER_2_LIQUIDITY_ADDED]
+        )
+    assert len(events) == len(curve_logs["curve"])
+    assert len(migrations) == 1
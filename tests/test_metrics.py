@@ -0,0 +1,65 @@
+import pytest
+from web3 import AsyncWeb3, WebSocketProvider
+
+from Four_sdk import RpcMetrics, Trade, get_rpc_metrics, install_rpc_metrics, uninstall_rpc_metrics
+from Four_sdk.metrics import _HOOKS
+
+TOKEN = "0x" + "11" * 20
+
+
+@pytest.fixture
+def metrics():
+    originals = {(cls, name): cls.__dict__[name] for cls, name, _ in _HOOKS}
+    metrics = install_rpc_metrics(RpcMetrics(buckets=(10.0, 0.0)))
+    yield metrics
+    uninstall_rpc_metrics()
+    assert get_rpc_metrics() is None
+    # Every hooked provider method is the original web3 one again
+    assert {(cls, name): cls.__dict__[name] for cls, name, _ in _HOOKS} == originals
+
+
+async def test_records_trade_requests(rpc, private_key, metrics):
+    samples = []
+    metrics.add_callback(samples.append)
+    trade = Trade(rpc.url, private_key)
+
+    assert await trade.get_curves_many([TOKEN]) == {trade.w3.to_checksum_address(TOKEN): None}
+    with pytest.raises(RuntimeError):
+        await trade.get_curves(TOKEN)  # the mock reverts getTokenInfo
+    http_chain_id = metrics.snapshot()["eth_chainId"]["calls"]
+    async with AsyncWeb3(WebSocketProvider(rpc.ws_url)) as w3:
+        assert await w3.eth.get_block_number() == rpc.head
+        assert (await w3.provider.make_request("eth_chainId", []))["result"] == hex(trade.chain_id)
+        async with w3.batch_requests() as batch:
+            batch.add(w3.eth.get_block_number())
+            batch.add(w3.eth.chain_id)
+            assert len(await batch.async_execute()) == 2
+
+    snapshot = metrics.snapshot()
+    aggregate = snapshot["eth_call:aggregate3"]
+    assert (aggregate["calls"], aggregate["errors"]) == (1, 0)
+    assert aggregate["bytes_sent"] > 0 and aggregate["bytes_received"] > 0
+    assert aggregate["buckets"] == {"0.0": 0, "10.0": 1, "+Inf": 0}
+    token_info = snapshot["eth_call:getTokenInfo"]
+    assert token_info["calls"] >= 1 and token_info["errors"] == token_info["calls"]
+    assert snapshot["eth_blockNumber"]["calls"] == 1
+    assert snapshot["eth_chainId"]["calls"] == http_chain_id + 1
+    assert snapshot["batch:eth_blockNumber+eth_chainId"]["calls"] == 1
+    assert rpc.calls["eth_call"] == aggregate["calls"] + token_info["calls"]
+    assert sum(sample.method == "eth_call:aggregate3" for sample in samples) == 1
+
+    text = metrics.to_prometheus()
+    assert 'four_sdk_rpc_requests_total{method="eth_call:aggregate3"} 1\n' in text
+    assert 'four_sdk_rpc_errors_total{method="eth_call:getTokenInfo"} ' in text
+    assert 'four_sdk_rpc_request_duration_seconds_bucket{method="eth_call:aggregate3",le="10.0"} 1\n' in text
+    assert 'four_sdk_rpc_request_duration_seconds_bucket{method="eth_call:aggregate3",le="+Inf"} 1\n' in text
+    assert 'four_sdk_rpc_request_duration_seconds_count{method="eth_blockNumber"} 1\n' in text
+
+
+async def test_nothing_is_recorded_after_uninstall(rpc, private_key):
+    metrics = install_rpc_metrics(RpcMetrics())
+    uninstall_rpc_metrics()
+    assert all(cls.__dict__[name].__module__.startswith("web3") for cls, name, _ in _HOOKS)
+
+    await Trade(rpc.url, private_key).get_curves_many([TOKEN])
+    assert metrics.snapshot() == {}
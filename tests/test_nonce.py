@@ -0,0 +1,78 @@
+import pytest
+
+from Four_sdk import GasProfileCache, Trade
+from Four_sdk.constants import CONTRACTS
+from Four_sdk.types import BuyParams
+
+ROUTER = CONTRACTS["tokenManager2"]
+TOKEN = "0x" + "11" * 20
+
+
+def _trade(rpc, private_key) -> Trade:
+    return Trade(rpc.url, private_key, gas_cache=GasProfileCache())
+
+
+def _params(trade: Trade, amount_in: int = 10 ** 16) -> BuyParams:
+    return BuyParams(TOKEN, amount_in, 0, trade.address, deadline=1_900_000_000)
+
+
+async def test_sequential_nonces(rpc, private_key):
+    trade = _trade(rpc, private_key)
+    for i in range(3):
+        await trade.buy(_params(trade, 10 ** 16 + i), ROUTER)
+    assert sorted(int(tx["nonce"], 16) for tx in rpc.transactions.values()) == [0, 1, 2]
+    assert await trade.nonce_manager.next_nonce() == 3
+
+
+async def test_already_known_is_not_resent(rpc, private_key):
+    trade = _trade(rpc, private_key)
+    rpc.fail_next("eth_sendRawTransaction", "already known")
+    tx_hash = await trade.buy(_params(trade), ROUTER)
+
+    assert rpc.calls["eth_sendRawTransaction"] == 1
+    assert len(tx_hash.removeprefix("0x")) == 64
+    # The nonce stays used: the node has the transaction
+    assert await trade.nonce_manager.next_nonce() == 1
+
+
+async def test_lost_response_is_retried_as_known(rpc, private_key):
+    trade = _trade(rpc, private_key)
+    rpc.lose_next("eth_sendRawTransaction")
+    tx_hash = await trade.buy(_params(trade), ROUTER)
+
+    # web3 resends the same raw transaction, the node reports it as known
+    assert list(rpc.transactions) == ["0x" + tx_hash.removeprefix("0x")]
+    assert await trade.nonce_manager.next_nonce() == 1
+
+
+async def test_failed_broadcast_resyncs_instead_of_releasing(rpc, private_key):
+    trade = _trade(rpc, private_key)
+    rpc.lose_next("eth_sendRawTransaction")
+    rpc.fail_next("eth_sendRawTransaction", "internal error")
+    with pytest.raises(RuntimeError):
+        await trade.buy(_params(trade), ROUTER)
+
+    # The node took nonce 0 even though the request failed
+    assert len(rpc.transactions) == 1
+    assert await trade.nonce_manager.next_nonce() == 1
+
+
+async def test_failure_before_broadcast_releases_nonce(rpc, private_key):
+    trade = _trade(rpc, private_key)
+    rpc.fail_next("eth_estimateGas", "execution reverted")
+    with pytest.raises(RuntimeError):
+        await trade.buy(_params(trade), ROUTER)
+
+    assert "eth_sendRawTransaction" not in rpc.calls
+    await trade.buy(_params(trade), ROUTER)
+    assert [int(tx["nonce"], 16) for tx in rpc.transactions.values()] == [0]
+
+
+async def test_nonce_too_low_resyncs_and_retries(rpc, private_key):
+    trade = _trade(rpc, private_key)
+    await trade.buy(_params(trade), ROUTER)
+    # Transactions sent from elsewhere moved the account on
+    rpc._nonces[trade.address.lower()] = 5
+
+    await trade.buy(_params(trade, 2 * 10 ** 16), ROUTER)
+    assert sorted(int(tx["nonce"], 16) for tx in rpc.transactions.values()) == [0, 5]
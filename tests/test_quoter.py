@@ -0,0 +1,18 @@
+from Four_sdk import PairReserveMirror
+from Four_sdk.constants import WBNB
+
+TOKEN = "0x" + "11" * 20
+PAIR = "0x" + "22" * 20
+
+
+def test_mirror_quotes_none_without_reserves():
+    mirror = PairReserveMirror()
+    assert mirror.get_amount_out(TOKEN, 10 ** 18, True) is None
+
+    mirror.add_pair(TOKEN, PAIR)
+    assert mirror.get_amount_out(TOKEN, 10 ** 18, True) is None
+
+    token_is_0 = TOKEN.lower() < WBNB.lower()
+    mirror.add_pair(TOKEN, PAIR, *((10 ** 24, 10 ** 20) if token_is_0 else (10 ** 20, 10 ** 24)))
+    quote = mirror.get_amount_out(TOKEN, 10 ** 18, True)
+    assert quote is not None and 0 < quote.amount < 10 ** 22
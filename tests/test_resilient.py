@@ -0,0 +1,85 @@
+import asyncio
+
+from benchmarks import fixtures
+from benchmarks.mock_rpc import MockRPC
+from Four_sdk.constants import CONTRACTS
+from Four_sdk.stream.resilient import ResilientLogStream
+from Four_sdk.stream.subscription import log_key
+
+FILTER = {
+    "address": CONTRACTS["tokenManager2"],
+    "topics": [[fixtures.BUY_TOPIC, fixtures.SELL_TOPIC, fixtures.CREATE_TOPIC]]
+}
+
+
+async def _until(condition, timeout: float = 5.0):
+    async def wait():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(wait(), timeout)
+
+
+async def test_reconnect_backfills_the_gap_once():
+    logs = fixtures.generate(blocks=40)["curve"]
+    live, missed, after = logs[:10], logs[10:30], logs[30:]
+
+    async with MockRPC([]) as rpc:
+        stream = ResilientLogStream(rpc.ws_url, lambda: FILTER, initial_backoff=0.05)
+        received = []
+
+        async def consume():
+            async for log in stream.logs():
+                received.append(log)
+
+        consumer = asyncio.create_task(consume())
+        try:
+            await _until(lambda: rpc.subscription_count == 1)
+            await rpc.emit(live)
+            await _until(lambda: len(received) == len(live))
+
+            # Logs emitted while the socket is down come from the backfill
+            await rpc.disconnect()
+            rpc.add_logs(missed)
+            await _until(lambda: stream.reconnects == 1 and rpc.subscription_count == 1)
+
+            # The node also pushes the last backfilled log on the new subscription
+            await rpc.emit(missed[-1:], store=False)
+            await rpc.emit(after)
+            await _until(lambda: len(received) >= len(logs))
+            await asyncio.sleep(0.1)
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+
+    assert rpc.calls["eth_getLogs"] >= 1
+    assert [log_key(log) for log in received] == [log_key(log) for log in logs]
+    assert stream.last_position == (int(logs[-1]["blockNumber"], 16), int(logs[-1]["logIndex"], 16))
+
+
+async def test_outage_before_the_first_log_is_backfilled():
+    logs = fixtures.generate(blocks=40)["curve"]
+    head = int(logs[9]["blockNumber"], 16)
+    old = [log for log in logs if int(log["blockNumber"], 16) <= head]
+    missed = [log for log in logs if int(log["blockNumber"], 16) > head]
+
+    async with MockRPC(old) as rpc:
+        stream = ResilientLogStream(rpc.ws_url, lambda: FILTER, initial_backoff=0.05)
+        received = []
+
+        async def consume():
+            async for log in stream.logs():
+                received.append(log)
+
+        consumer = asyncio.create_task(consume())
+        try:
+            await _until(lambda: stream.last_position is not None)
+            await rpc.disconnect()
+            rpc.add_logs(missed)
+            await _until(lambda: len(received) >= len(missed))
+            await asyncio.sleep(0.1)
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+
+    # Only the logs of the outage, not the ones from before the stream started
+    assert [log_key(log) for log in received] == [log_key(log) for log in missed]
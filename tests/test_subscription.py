@@ -0,0 +1,46 @@
+import asyncio
+
+from web3 import AsyncWeb3, WebSocketProvider
+
+from benchmarks import fixtures
+from benchmarks.mock_rpc import MockRPC
+from Four_sdk.constants import CONTRACTS
+from Four_sdk.stream.subscription import LogSubscription, log_key
+
+ADDRESS = CONTRACTS["tokenManager2"]
+
+
+async def test_filter_switch_keeps_queued_payloads():
+    logs = fixtures.generate(blocks=20)["curve"]
+    before, after = logs[:10], logs[10:]
+
+    async with MockRPC([]) as rpc:
+        async with AsyncWeb3(WebSocketProvider(rpc.ws_url)) as w3:
+            subscription = LogSubscription(w3)
+            await subscription.update({"address": ADDRESS, "topics": [[fixtures.BUY_TOPIC]]})
+            await rpc.emit(before)
+            await asyncio.sleep(0.1)  # received, not processed yet
+
+            wide = [[fixtures.BUY_TOPIC, fixtures.SELL_TOPIC, fixtures.CREATE_TOPIC]]
+            await subscription.update({"address": ADDRESS, "topics": wide})
+            assert rpc.subscription_count == 1
+            # A buy already queued on the old subscription, pushed again by the new one
+            buys = [log for log in before if log["topics"][0] == fixtures.BUY_TOPIC]
+            await rpc.emit(buys[-1:], store=False)
+            await rpc.emit(after)
+
+            expected = buys + after
+            received = []
+
+            async def consume():
+                async for payload in w3.socket.process_subscriptions():
+                    log = subscription.accept(payload)
+                    if log is not None:
+                        received.append(log)
+                    if len(received) == len(expected):
+                        return
+
+            await asyncio.wait_for(consume(), 5)
+            await asyncio.sleep(0.1)
+
+    assert [log_key(log) for log in received] == [log_key(log) for log in expected]
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from eth_account import Account
+
+from Four_sdk import GasProfileCache, WalletPool
+from Four_sdk.wallet_pool import WalletPolicy
+from Four_sdk.constants import CONTRACTS
+from Four_sdk.types import BuyParams
+
+ROUTER = CONTRACTS["tokenManager2"]
+KEYS = ["0x" + f"{i:064x}" for i in range(1, 4)]
+
+
+def _pool(rpc, **kwargs) -> WalletPool:
+    return WalletPool(rpc.url, KEYS, gas_cache=GasProfileCache(), **kwargs)
+
+
+def _params(i: int) -> BuyParams:
+    return BuyParams("0x" + f"{i + 1:040x}", 10 ** 16 + i, 0, None, deadline=1_900_000_000)
+
+
+async def test_round_robin_confirms_every_order(rpc):
+    pool = _pool(rpc)
+    pending = [await pool.buy(_params(i), ROUTER) for i in range(6)]
+    assert [p.wallet for p in pending] == [Account.from_key(key).address for key in KEYS] * 2
+
+    settled = await asyncio.gather(*(pool.wait_for_transaction(p.tx_hash) for p in pending))
+    assert {p.status for p in settled} == {"confirmed"}
+    assert all(stats == {"in_flight": 0, "load": 0, "submitted": 2, "confirmed": 2, "failed": 0}
+               for stats in pool.stats().values())
+    await pool.close()
+
+
+async def test_unmined_transaction_keeps_its_slot(rpc):
+    rpc.mine = False
+    pool = _pool(rpc, max_in_flight=1, receipt_timeout=0.2)
+    wallet = pool.wallets[0].address
+    first = await pool.buy(_params(0), ROUTER, wallet=wallet)
+    second = asyncio.create_task(pool.buy(_params(1), ROUTER, wallet=wallet))
+
+    # Past several receipt timeouts the node still has the transaction
+    await asyncio.sleep(0.7)
+    assert not second.done()
+    assert [p.tx_hash for p in pool.pending()] == [first.tx_hash]
+
+    rpc.mine = True
+    assert (await pool.wait_for_transaction(first.tx_hash)).status == "confirmed"
+    await pool.wait_for_transaction((await second).tx_hash)
+    await pool.close()
+
+
+async def test_dropped_transaction_resyncs_nonce(rpc):
+    rpc.mine = False
+    pool = _pool(rpc, receipt_timeout=0.2)
+    wallet = pool.wallets[0]
+    pending = await pool.buy(_params(0), ROUTER, wallet=wallet.address)
+    rpc.drop(pending.tx_hash)
+
+    settled = await pool.wait_for_transaction(pending.tx_hash)
+    assert settled.status == "dropped"
+    assert wallet.stats()["failed"] == 1 and wallet.in_flight == 0
+    # The dropped nonce is handed out again
+    assert await wallet.trade.nonce_manager.next_nonce() == 0
+    await pool.close()
+
+
+def test_policy_must_implement_select():
+    class Incomplete(WalletPolicy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_sticky_pin_ignores_address_case(rpc):
+    pool = _pool(rpc, policy="sticky")
+    held_by = pool.wallets[2].address
+    token = _params(0).token
+    pool.policy.assign(token.upper().replace("0X", "0x"), held_by.lower())
+
+    pending = [await pool.buy(_params(0), ROUTER) for _ in range(3)]
+    assert {p.wallet for p in pending} == {held_by}
+    await pool.close()